@@ -17,8 +17,11 @@ def save_object_properties(folder_name, obj) -> None:
     :type obj: class:`object`
     """
 
-    # Iterate over each attribute in the object
+    # Iterate over each attribute in the object (except the attributes which the object excludes from the export)
+    non_exported_attributes = getattr(obj, 'NON_EXPORTED_ATTRIBUTES', ())
     for attr_name in obj.__dict__:
+        if attr_name in non_exported_attributes:
+            continue
         values = getattr(obj, attr_name)
         file_path = os.path.join(folder_name, f"{attr_name}.csv")
 
@@ -30,9 +33,12 @@ def save_object_properties(folder_name, obj) -> None:
                 # Wrap the value in a list
                 writer.writerow([values])
             elif isinstance(values, dict):
-                # Write each dictionary key-value pair on a new row
+                # Write each dictionary key-value pair on a new row (arrays are written after the key)
                 for key, val in values.items():
-                    writer.writerow([key, val])
+                    if isinstance(val, np.ndarray):
+                        writer.writerow([key, *val])
+                    else:
+                        writer.writerow([key, val])
             elif isinstance(values, list):
                 # Write the list as rows in the CSV file
                 writer.writerow(values)
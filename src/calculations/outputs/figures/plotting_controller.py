@@ -70,7 +70,11 @@ def plot_all_figures(structure: Structure, results: Results, mesh_space: MeshSpa
                            'Evolutions of minimal/maximal stresses in the structure',
                            results, mesh_time)
 
-    create_gif_animation(mesh_space, mesh_time, results, structure)
+    # The animation needs all time steps, which are not stored in summary-only mode
+    if results.summary_only:
+        double_print('GIF animation skipped (only the summary of the results is stored).')
+    else:
+        create_gif_animation(mesh_space, mesh_time, results, structure)
 
     # TODO: Plot more figures and
 
@@ -3,6 +3,7 @@ from pathlib import Path
 from src.general_functions import double_print
 import matplotlib.pyplot as plt
 from src.calculations.stresses.general_functions import split_array_concrete_and_steel
+from src.calculations.outputs.result_processing import get_result_row
 import datetime
 from src.general_functions import num_to_str_1_dec
 import numpy as np
@@ -124,9 +125,9 @@ def plot_stress_distributions(folder_path, file_name, figure_title,
         ax3 = fig.add_subplot(1, 3, 3)
 
         # Declare the y-axis and its limits
-        y_stress_fixed = results.stress_total_fixed[step_fixed]
-        y_stress_clamped = results.stress_total_clamped[step_clamped]
-        y_stress_free = results.stress_total_free[step_free]
+        y_stress_fixed = get_result_row(results, 'stress_total_fixed', step_fixed)
+        y_stress_clamped = get_result_row(results, 'stress_total_clamped', step_clamped)
+        y_stress_free = get_result_row(results, 'stress_total_free', step_free)
         y_min = int((min(min(y_stress_fixed) ,min(y_stress_clamped) ,min(y_stress_free) ) /1 ) - 1)
         y_max = int((max(max(y_stress_fixed) ,max(y_stress_clamped) ,max(y_stress_free) ) /1 ) + 1)
 
@@ -1,8 +1,21 @@
-from src.calculations.stresses.general_functions import split_matrix_concrete_and_steel
-from src.models import Structure, MeshSpace, Results
+from src.calculations.stresses.general_functions import split_array_concrete_and_steel, split_matrix_concrete_and_steel
+from src.models import Structure, MeshSpace, Results, StressBlock
 import numpy.typing as npt
 import numpy as np
 
+# Extreme steps tracked in summary-only mode: the field whose row is kept in the extreme step, and the index of the layer (0 inner steel liner; 1 concrete)
+# (the min_stress steps are the same as the max_stress steps, see find_extreme_steps)
+SUMMARY_EXTREME_STEPS = {
+    'max_temp_concrete': ('temp_matrix', 1),
+    'max_temp_steel': ('temp_matrix', 0),
+    'max_stress_fixed_concrete': ('stress_total_fixed', 1),
+    'max_stress_fixed_steel_inner': ('stress_total_fixed', 0),
+    'max_stress_clamped_concrete': ('stress_total_clamped', 1),
+    'max_stress_clamped_steel_inner': ('stress_total_clamped', 0),
+    'max_stress_free_concrete': ('stress_total_free', 1),
+    'max_stress_free_steel_inner': ('stress_total_free', 0),
+}
+
 
 def row_with_max_value(matrix: npt.NDArray[np.float64]) -> int:
     """
@@ -79,6 +92,9 @@ def find_extreme_steps(results: Results) -> None:
     """
     This function finds the steps in which the extreme values of
     temperatures and stresses and strains are reached.
+    The steps of the stresses are found from the stress evolutions (see create_stress_evolutions),
+    i.e., the row with the maximum value of the stress matrix is the step with the maximum of the evolution of the maximal stress.
+    In summary-only mode, the steps of the temperatures are found during the analysis (see update_summary_with_block).
 
     :param results: A handle to the :class:`models.Results` object containing the results.
     :type results: class:`Results`
@@ -87,76 +103,149 @@ def find_extreme_steps(results: Results) -> None:
     results.extreme_steps['max_internal_pressure'] = np.argmax(results.pres_air_int_vect)
     results.extreme_steps['max_temp_air'] = np.argmax(results.temp_air_int_vect)
 
-    results.extreme_steps['max_temp_concrete'] = row_with_max_value(results.temp_matrix_concrete)
-    results.extreme_steps['max_temp_steel'] = row_with_max_value(results.temp_matrix_steel_inner)
-
-    results.extreme_steps['max_stress_fixed_concrete'] = row_with_max_value(results.stress_fixed_concrete)
-    results.extreme_steps['max_stress_fixed_steel_inner'] = row_with_max_value(results.stress_fixed_steel_inner)
-    results.extreme_steps['max_stress_clamped_concrete'] = row_with_max_value(results.stress_clamped_concrete)
-    results.extreme_steps['max_stress_clamped_steel_inner'] = row_with_max_value(results.stress_clamped_steel_inner)
-    results.extreme_steps['max_stress_free_concrete'] = row_with_max_value(results.stress_free_concrete)
-    results.extreme_steps['max_stress_free_steel_inner'] = row_with_max_value(results.stress_free_steel_inner)
-
-    results.extreme_steps['min_stress_fixed_concrete'] = row_with_max_value(results.stress_fixed_concrete)
-    results.extreme_steps['min_stress_fixed_steel_inner'] = row_with_max_value(results.stress_fixed_steel_inner)
-    results.extreme_steps['min_stress_clamped_concrete'] = row_with_max_value(results.stress_clamped_concrete)
-    results.extreme_steps['min_stress_clamped_steel_inner'] = row_with_max_value(results.stress_clamped_steel_inner)
-    results.extreme_steps['min_stress_free_concrete'] = row_with_max_value(results.stress_free_concrete)
-    results.extreme_steps['min_stress_free_steel_inner'] = row_with_max_value(results.stress_free_steel_inner)
+    if not results.summary_only:
+        results.extreme_steps['max_temp_concrete'] = row_with_max_value(results.temp_matrix_concrete)
+        if len(results.temp_matrix_steel_inner) > 0:
+            results.extreme_steps['max_temp_steel'] = row_with_max_value(results.temp_matrix_steel_inner)
+
+    results.extreme_steps['max_stress_fixed_concrete'] = np.argmax(results.stress_evolution_concrete_tension_fixed)
+    results.extreme_steps['max_stress_fixed_steel_inner'] = np.argmax(results.stress_evolution_steel_tension_fixed)
+    results.extreme_steps['max_stress_clamped_concrete'] = np.argmax(results.stress_evolution_concrete_tension_clamped)
+    results.extreme_steps['max_stress_clamped_steel_inner'] = np.argmax(results.stress_evolution_steel_tension_clamped)
+    results.extreme_steps['max_stress_free_concrete'] = np.argmax(results.stress_evolution_concrete_tension_free)
+    results.extreme_steps['max_stress_free_steel_inner'] = np.argmax(results.stress_evolution_steel_tension_free)
+
+    results.extreme_steps['min_stress_fixed_concrete'] = np.argmax(results.stress_evolution_concrete_tension_fixed)
+    results.extreme_steps['min_stress_fixed_steel_inner'] = np.argmax(results.stress_evolution_steel_tension_fixed)
+    results.extreme_steps['min_stress_clamped_concrete'] = np.argmax(results.stress_evolution_concrete_tension_clamped)
+    results.extreme_steps['min_stress_clamped_steel_inner'] = np.argmax(results.stress_evolution_steel_tension_clamped)
+    results.extreme_steps['min_stress_free_concrete'] = np.argmax(results.stress_evolution_concrete_tension_free)
+    results.extreme_steps['min_stress_free_steel_inner'] = np.argmax(results.stress_evolution_steel_tension_free)
 
     return None
 
 
 def create_stress_evolutions(results: Results) -> None:
     """
-    This function creates arrays with evolutions of minimal and maximal stresses for steel and concrete.
+    This function creates arrays with evolutions of minimal and maximal stresses for steel and concrete
+    (written into the registered fields of the results).
+    Without the inner steel liner, the evolutions of stresses in steel are zero.
 
     :param results: A handle to the :class:`models.Results` object containing the results.
     :type results: class:`Results`
     """
 
     # Evolution of maximal stress (maximal tension) in concrete
-    results.stress_evolution_concrete_tension_fixed = np.amax(results.stress_fixed_concrete, axis=1)
-    results.stress_evolution_concrete_tension_clamped = np.amax(results.stress_clamped_concrete, axis=1)
-    results.stress_evolution_concrete_tension_free = np.amax(results.stress_free_concrete, axis=1)
+    np.amax(results.stress_fixed_concrete, axis=1, out=results.stress_evolution_concrete_tension_fixed)
+    np.amax(results.stress_clamped_concrete, axis=1, out=results.stress_evolution_concrete_tension_clamped)
+    np.amax(results.stress_free_concrete, axis=1, out=results.stress_evolution_concrete_tension_free)
 
     # Evolution of minimal stress (maximal compression) in concrete
-    results.stress_evolution_concrete_compression_fixed = np.amin(results.stress_fixed_concrete, axis=1)
-    results.stress_evolution_concrete_compression_clamped = np.amin(results.stress_clamped_concrete, axis=1)
-    results.stress_evolution_concrete_compression_free = np.amin(results.stress_free_concrete, axis=1)
+    np.amin(results.stress_fixed_concrete, axis=1, out=results.stress_evolution_concrete_compression_fixed)
+    np.amin(results.stress_clamped_concrete, axis=1, out=results.stress_evolution_concrete_compression_clamped)
+    np.amin(results.stress_free_concrete, axis=1, out=results.stress_evolution_concrete_compression_free)
+
+    # The evolutions in steel are kept zero if there is no inner steel liner (as in summary-only mode)
+    if len(results.stress_fixed_steel_inner) > 0:
+        # Evolution of maximal stress (maximal tension) in steel
+        np.amax(results.stress_fixed_steel_inner, axis=1, out=results.stress_evolution_steel_tension_fixed)
+        np.amax(results.stress_clamped_steel_inner, axis=1, out=results.stress_evolution_steel_tension_clamped)
+        np.amax(results.stress_free_steel_inner, axis=1, out=results.stress_evolution_steel_tension_free)
 
-    # Evolution of maximal stress (maximal tension) in steel
-    results.stress_evolution_steel_tension_fixed = np.amax(results.stress_fixed_steel_inner, axis=1)
-    results.stress_evolution_steel_tension_clamped = np.amax(results.stress_clamped_steel_inner, axis=1)
-    results.stress_evolution_steel_tension_free = np.amax(results.stress_free_steel_inner, axis=1)
+        # Evolution of minimal stress (maximal compression) in steel
+        np.amin(results.stress_fixed_steel_inner, axis=1, out=results.stress_evolution_steel_compression_fixed)
+        np.amin(results.stress_clamped_steel_inner, axis=1, out=results.stress_evolution_steel_compression_clamped)
+        np.amin(results.stress_free_steel_inner, axis=1, out=results.stress_evolution_steel_compression_free)
+
+    merge_steel_stress_evolutions(results)
+
+    return None
 
-    # Evolution of minimal stress (maximal compression) in steel
-    results.stress_evolution_steel_compression_fixed = np.amin(results.stress_fixed_steel_inner, axis=1)
-    results.stress_evolution_steel_compression_clamped = np.amin(results.stress_clamped_steel_inner, axis=1)
-    results.stress_evolution_steel_compression_free = np.amin(results.stress_free_steel_inner, axis=1)
+
+def merge_steel_stress_evolutions(results: Results) -> None:
+    """
+    This function creates the evolutions of extreme stress in steel from the evolutions of minimal and maximal stresses.
+
+    :param results: A handle to the :class:`models.Results` object containing the results.
+    :type results: class:`Results`
+    """
 
     # Evolution of extreme stress in steel
-    results.stress_evolution_steel_merged_fixed = merge_tensile_and_compressive_stresses(results.stress_evolution_steel_tension_fixed, results.stress_evolution_steel_compression_fixed)
-    results.stress_evolution_steel_merged_clamped = merge_tensile_and_compressive_stresses(results.stress_evolution_steel_tension_clamped, results.stress_evolution_steel_compression_clamped)
-    results.stress_evolution_steel_merged_free = merge_tensile_and_compressive_stresses(results.stress_evolution_steel_tension_free, results.stress_evolution_steel_compression_free)
+    results.stress_evolution_steel_merged_fixed[:] = merge_tensile_and_compressive_stresses(results.stress_evolution_steel_tension_fixed, results.stress_evolution_steel_compression_fixed)
+    results.stress_evolution_steel_merged_clamped[:] = merge_tensile_and_compressive_stresses(results.stress_evolution_steel_tension_clamped, results.stress_evolution_steel_compression_clamped)
+    results.stress_evolution_steel_merged_free[:] = merge_tensile_and_compressive_stresses(results.stress_evolution_steel_tension_free, results.stress_evolution_steel_compression_free)
 
     return None
 
 
+def update_summary_with_block(structure: Structure, mesh_space: MeshSpace, results: Results, block: StressBlock, steps: slice) -> None:
+    """
+    This function updates the summary of the results (summary-only mode) with a block of calculated time steps:
+    the evolutions of minimal and maximal stresses in the time steps of the block, the extreme steps of the temperatures and stresses
+    reached so far (the first of equal maxima), and the rows of the fields in these extreme steps.
+
+    :param block: A handle to the :class:`models.StressBlock` object containing the rows of the block.
+    :type block: class:`StressBlock`
+    :param steps: The time steps of the block (the rows of the block are numbered from zero).
+    :type steps: slice
+    """
+    rows = slice(0, steps.stop - steps.start)
+
+    # Evolutions of minimal and maximal stresses for steel and concrete
+    for boundary_condition in ('fixed', 'clamped', 'free'):
+        stresses_split = split_matrix_concrete_and_steel(getattr(block, 'stress_total_' + boundary_condition)[rows], mesh_space, structure)
+        for layer_name, stresses_layer in (('steel', stresses_split[0]), ('concrete', stresses_split[1])):
+            if len(stresses_layer) == 0:
+                continue
+            getattr(results, 'stress_evolution_' + layer_name + '_tension_' + boundary_condition)[steps] = np.amax(stresses_layer, axis=1)
+            getattr(results, 'stress_evolution_' + layer_name + '_compression_' + boundary_condition)[steps] = np.amin(stresses_layer, axis=1)
+
+    # Extreme steps reached so far and the rows in these steps
+    for step_name, (field_name, layer_index) in SUMMARY_EXTREME_STEPS.items():
+        field_split = split_matrix_concrete_and_steel(getattr(block, field_name)[rows], mesh_space, structure)
+        if len(field_split[layer_index]) == 0:
+            continue
+        block_maxima = np.amax(field_split[layer_index], axis=1)
+        block_step = int(np.argmax(block_maxima))
+        kept_row = results.extreme_rows.get(step_name)
+        if kept_row is None or block_maxima[block_step] > np.amax(split_array_concrete_and_steel(kept_row, mesh_space, structure)[layer_index]):
+            results.extreme_steps[step_name] = steps.start + block_step
+            results.extreme_rows[step_name] = np.copy(getattr(block, field_name)[block_step])
+
+    return None
+
+
+def get_result_row(results: Results, field_name: str, step: int) -> npt.NDArray[np.float64]:
+    """
+    This function obtains the row of a space-time field (e.g., stress_total_fixed) in a given time step.
+    In summary-only mode, only the rows in the extreme steps are available.
+    """
+    if not results.summary_only:
+        return getattr(results, field_name)[step]
+    for step_name, (kept_field_name, layer_index) in SUMMARY_EXTREME_STEPS.items():
+        if kept_field_name == field_name and step_name in results.extreme_rows and results.extreme_steps[step_name] == step:
+            return results.extreme_rows[step_name]
+    raise KeyError('The row of ' + field_name + ' in the time step ' + str(step) + ' is not stored in summary-only mode.')
+
+
 def process_results(structure: Structure, mesh_space: MeshSpace, results: Results) -> str:
     """
     This function processes the results of the analysis.
+    In summary-only mode, the evolutions of minimal and maximal stresses were created during the analysis (see update_summary_with_block).
     """
     try:
-        # Create separate submatrices for steel and concrete
-        create_submatrices(structure, mesh_space, results)
+        if results.summary_only:
+            merge_steel_stress_evolutions(results)
+        else:
+            # Create separate submatrices for steel and concrete
+            create_submatrices(structure, mesh_space, results)
+
+            # Create arrays with evolutions of minimal and maximal stresses for steel and concrete
+            create_stress_evolutions(results)
 
         # Find the steps with extreme values
         find_extreme_steps(results)
 
-        # Create arrays with evolutions of minimal and maximal stresses for steel and concrete
-        create_stress_evolutions(results)
-
         result_message = "Results processes successfully."
 
     except Exception as exception:
@@ -0,0 +1,107 @@
+'''
+This module contains the fused stress stage.
+
+The thermal, internal-pressure, prestressing, and total stresses are calculated block by block
+(STRESS_BLOCK_STEPS time steps at once) and written into the preallocated result matrices,
+so that the temporaries are of the size of one block instead of the whole analysis.
+If the result matrices are stored in single precision (RESULT_PRECISION = 1), each block is calculated in a float64 StressBlock
+and only the calculated rows are cast into the result matrices, so that the precision affects only the storage.
+'''
+
+from src.models import Structure, MeshSpace, MeshTime, Results, Loads, StressBlock, RESULT_MATRIX_DTYPE
+from src.config import STRESS_BLOCK_STEPS
+import numpy as np
+import numpy.typing as npt
+from typing import Optional, Union
+from src.calculations.stresses.thermal_stresses import calc_thermal_stresses_block
+from src.calculations.stresses.internal_pressure_stresses import calc_pressure_stresses_block
+from src.calculations.stresses.prestressing_stresses import calc_prestressing_stresses_block
+from src.calculations.stresses.total_stresses import sum_stresses_block
+
+
+def calc_stresses_block(
+        gas_pressures: npt.NDArray[np.float64],
+        structure: Structure,
+        mesh_space: MeshSpace,
+        results: Union[Results, StressBlock],
+        steps: slice) -> None:
+    '''
+    This function calculates all stresses in a block of time steps (rows of the result matrices) for the given internal pressures.
+
+    :param steps: The rows of the block.
+    :type steps: slice
+    '''
+    calc_thermal_stresses_block(structure, mesh_space, results, steps)
+    calc_pressure_stresses_block(gas_pressures, structure, mesh_space, results, steps)
+    calc_prestressing_stresses_block(structure, mesh_space, results, steps)
+    sum_stresses_block(results, steps)
+
+
+def create_double_precision_block(mesh_space: MeshSpace, block_steps: int, results: Results) -> Optional[StressBlock]:
+    # The stresses are calculated directly in the result matrices only if they are stored in double precision
+    if RESULT_MATRIX_DTYPE == np.float64:
+        return None
+    return StressBlock(mesh_space, block_steps, results.temp_init)
+
+
+def store_stress_block(block: StressBlock, results: Results, rows: slice, steps: slice) -> None:
+    # The rows of the block are cast to the storage precision of the result matrices
+    for field_name in StressBlock.FIELDS:
+        getattr(results, field_name)[steps] = getattr(block, field_name)[rows]
+
+
+def calc_stresses_of_steps(
+        structure: Structure,
+        mesh_space: MeshSpace,
+        loads: Loads,
+        results: Results,
+        steps: slice,
+        block: Optional[StressBlock] = None,
+        temp_rows: Optional[list[npt.NDArray[np.float64]]] = None) -> None:
+    '''
+    This function calculates all stresses in the given time steps (rows of the result matrices of the whole analysis).
+
+    :param steps: The time steps of the block.
+    :type steps: slice
+    :param block: The double-precision buffer in which the stresses are calculated before they are stored (None to calculate them in the result matrices).
+    :type block: class:`StressBlock`
+    :param temp_rows: The temperature distributions of the time steps (if None, they are taken from the temperature matrix of the results).
+    :type temp_rows: list
+    '''
+    gas_pressures = loads.air_pres_coeff_history[steps]  # During normal operations (first time step), the pressure coefficient is not used.
+    results.pres_air_int_vect[steps] = gas_pressures
+    if block is None:
+        calc_stresses_block(gas_pressures, structure, mesh_space, results, steps)
+    else:
+        rows = slice(0, steps.stop - steps.start)
+        block.temp_matrix[rows] = results.temp_matrix[steps] if temp_rows is None else temp_rows
+        calc_stresses_block(gas_pressures, structure, mesh_space, block, rows)
+        store_stress_block(block, results, rows, steps)
+
+
+def calc_all_stresses(
+        structure: Structure,
+        mesh_space: MeshSpace,
+        mesh_time: MeshTime,
+        loads: Loads,
+        results: Results) -> str:
+    '''
+    This function calculates all stresses in blocks of time steps and saves them in the results object.
+
+    :return: String indicating the successful/unsuccessful calculation of the stresses.
+    :rtype: str
+    '''
+
+    try:
+        steps_count = mesh_time.time_steps_count + 1
+        block_steps = max(1, int(STRESS_BLOCK_STEPS))
+        block = create_double_precision_block(mesh_space, block_steps, results)
+        for block_start in range(0, steps_count, block_steps):
+            calc_stresses_of_steps(structure, mesh_space, loads, results, slice(block_start, min(block_start + block_steps, steps_count)), block)
+
+        result_message = "Stresses calculated successfully."
+
+    except Exception as exception:
+        result_message = "Stresses calculation FAILED: " + str(exception)
+
+    return result_message
@@ -3,6 +3,8 @@ This module contains general functions for stress calculations.
 """
 
 from src.models import Structure, MeshSpace, MeshTime
+from src.config import STRESS_PROFILE_CACHE_SIZE
+from typing import Callable
 import numpy.typing as npt
 import numpy as np
 
@@ -32,18 +34,7 @@ def concrete_stress_distribution(stress_distribution: npt.NDArray[np.float64], m
     """
     This function obtains the stress distribution for concrete.
     """
-    # TODO: Merge with split_concrete_and_steel
-    index_1 = int(1 + mesh_space.slice_index_steel_in)
-    index_2 = int(1 + mesh_space.slice_index_steel_out)
-    if structure.has_inner_steel and structure.has_outer_steel:
-        stress_distribution_concrete = stress_distribution[index_1:index_2]
-    elif structure.has_inner_steel:
-        stress_distribution_concrete = stress_distribution[index_1:]
-    elif structure.has_outer_steel:
-        stress_distribution_concrete = stress_distribution[:index_2]
-    else:
-        stress_distribution_concrete = stress_distribution
-    return stress_distribution_concrete
+    return stress_distribution[mesh_space.material_field.slice_concrete]
 
 
 def split_array_concrete_and_steel(array_total: npt.NDArray[np.float64], mesh_space: MeshSpace, structure: Structure) -> list:
@@ -51,25 +42,9 @@ def split_array_concrete_and_steel(array_total: npt.NDArray[np.float64], mesh_sp
     This function splits the array of values for whole thickness
     into separate arrays for inner steel liner, concrete, and outer steel liner.
     """
-    index_1 = int(1 + mesh_space.slice_index_steel_in)
-    index_2 = int(1 + mesh_space.slice_index_steel_out)
-    if structure.has_inner_steel and structure.has_outer_steel:
-        array_steel_inner = array_total[:index_1]
-        array_concrete = array_total[index_1:index_2]
-        array_steel_outer = array_total[index_2:]
-    elif structure.has_inner_steel:
-        array_steel_inner = array_total[:index_1]
-        array_concrete = array_total[index_1:]
-        array_steel_outer = []
-    elif structure.has_outer_steel:
-        array_steel_inner = []
-        array_concrete = array_total[:index_2]
-        array_steel_outer = array_total[index_2:]
-    else:
-        array_steel_inner = []
-        array_concrete = array_total
-        array_steel_outer = []
-    return [array_steel_inner, array_concrete, array_steel_outer]
+    material_field = mesh_space.material_field
+    layer_slices = (material_field.slice_steel_inner, material_field.slice_concrete, material_field.slice_steel_outer)
+    return [array_total[layer_slice] if layer_slice is not None else [] for layer_slice in layer_slices]
 
 
 def split_matrix_concrete_and_steel(matrix_total: npt.NDArray[np.float64], mesh_space: MeshSpace, structure: Structure) -> list:
@@ -77,35 +52,33 @@ def split_matrix_concrete_and_steel(matrix_total: npt.NDArray[np.float64], mesh_
     This function splits the matrix of values for whole thickness (columns) and duration of LOCA (rows)
     into separate matrices for inner steel liner, concrete, and outer steel liner.
     """
+    material_field = mesh_space.material_field
+    layer_slices = (material_field.slice_steel_inner, material_field.slice_concrete, material_field.slice_steel_outer)
+    return [matrix_total[:, layer_slice] if layer_slice is not None else [] for layer_slice in layer_slices]
 
-    index_1 = int(1 + mesh_space.slice_index_steel_in)
-    index_2 = int(1 + mesh_space.slice_index_steel_out)
-    if structure.has_inner_steel and structure.has_outer_steel:
-        matrix_steel_inner = matrix_total[:, :index_1]
-        matrix_concrete = matrix_total[:, index_1:index_2]
-        matrix_steel_outer = matrix_total[:, index_2:]
-    elif structure.has_inner_steel:
-        matrix_steel_inner = matrix_total[:, :index_1]
-        matrix_concrete = matrix_total[:, index_1:]
-        matrix_steel_outer = []
-    elif structure.has_outer_steel:
-        matrix_steel_inner = []
-        matrix_concrete = matrix_total[:, :index_2]
-        matrix_steel_outer = matrix_total[:, index_2:]
-    else:
-        matrix_steel_inner = []
-        matrix_concrete = matrix_total
-        matrix_steel_outer = []
-    return [matrix_steel_inner, matrix_concrete, matrix_steel_outer]
 
+def calc_stress_from_strain(strain: float, index: int, mesh_space: MeshSpace, structure: Structure) -> float:
+    return strain * mesh_space.material_field.node_moduli[index]
 
 
-def calc_stress_from_strain(strain: float, index: int, mesh_space: MeshSpace, structure: Structure) -> float:
-    if structure.has_inner_steel and (index <= mesh_space.slice_index_steel_in):
-    # TODO: Rollback to: if structure.has_inner_steel and (index < mesh_space.slice_index_steel_in):
-        modulus = structure.modulus_steel
-    elif structure.has_outer_steel and (index >= mesh_space.slice_index_steel_out):
-        modulus = structure.modulus_steel
-    else:
-        modulus = structure.modulus_concrete
-    return strain * modulus
+def get_geometry_key(structure: Structure, mesh_space: MeshSpace) -> tuple:
+    """
+    This function obtains the key identifying the geometry, the materials, and the mesh (for caching of the stress profiles).
+    """
+    return (structure.radius_in, structure.radius_out, structure.poisson, structure.modulus_total, structure.pressure_ext,
+            mesh_space.node_centers_from_zero.tobytes(), mesh_space.material_field.node_moduli.tobytes())
+
+
+def get_cached_profiles(profiles_cache: dict, key: tuple, calc_profiles: Callable[[], tuple]) -> tuple:
+    """
+    This function returns the (read-only) profiles for the given key from the cache; missing profiles are calculated by calc_profiles.
+    The oldest profiles are discarded when more than STRESS_PROFILE_CACHE_SIZE geometries are cached.
+    """
+    if key not in profiles_cache:
+        profiles = calc_profiles()
+        for profile in profiles:
+            profile.flags.writeable = False
+        profiles_cache[key] = profiles
+        if len(profiles_cache) > STRESS_PROFILE_CACHE_SIZE:
+            del profiles_cache[next(iter(profiles_cache))]
+    return profiles_cache[key]
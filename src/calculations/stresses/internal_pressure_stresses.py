@@ -5,12 +5,13 @@ In steps, the module calculates the stresses caused by the internal pressure.
 The stresses are calculated for each node of the spatial mesh and for each time step.
 '''
 
-from src.models import Structure, MeshSpace, MeshTime, Results, Loads
+from src.models import Structure, MeshSpace, MeshTime, Results, Loads, StressBlock
 import numpy as np
 import numpy.typing as npt
-from src.calculations.stresses.thermal_stresses import calc_stress_from_strain
-from src.calculations.stresses.general_functions import concrete_stress_distribution
-from src.calculations.stresses.general_functions import init_empty_space_time_matrix, init_empty_space_array, init_empty_time_array
+from src.calculations.stresses.general_functions import get_geometry_key, get_cached_profiles
+from typing import Union
+
+unit_pressure_profiles_cache: dict = {}  # Profiles of the unit internal pressure for each geometry (see get_unit_pressure_profiles)
 
 
 def get_lame_stress(gas_pressure: float, current_radius: float, structure: Structure) -> float:
@@ -30,6 +31,64 @@ def get_lame_stress(gas_pressure: float, current_radius: float, structure: Struc
     return stress_lame
 
 
+def get_lame_profiles(radii: npt.NDArray[np.float64], structure: Structure) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    '''
+    This function calculates the radial profiles of the Lame stress caused by a unit internal pressure and by a unit external pressure.
+    The Lame stress is linear in the pressures, i.e., it equals gas_pressure * profile_int + pressure_ext * profile_ext.
+    :param radii:
+    :param structure:
+    :return:
+    '''
+    ri2 = structure.radius_in ** 2
+    re2 = structure.radius_out ** 2
+    radii2 = radii * radii
+    profile_int = (ri2 + re2 * ri2 / radii2) / (re2 - ri2)
+    profile_ext = -(re2 + re2 * ri2 / radii2) / (re2 - ri2)
+    return profile_int, profile_ext
+
+
+def calc_unit_pressure_profiles(structure: Structure, mesh_space: MeshSpace) -> tuple[npt.NDArray[np.float64], ...]:
+    '''
+    This function calculates the strains and stresses in the nodes caused by a unit internal pressure
+    and by the external pressure (which is the same in all time steps).
+    :param structure:
+    :param mesh_space:
+    :return: Strain and stress profiles of the unit internal pressure, strain and stress profiles of the external pressure.
+    '''
+    profile_int, profile_ext = get_lame_profiles(mesh_space.node_centers_from_zero, structure)
+    strain_int = profile_int / structure.modulus_total
+    strain_ext = structure.pressure_ext * profile_ext / structure.modulus_total
+    return strain_int, strain_int * mesh_space.material_field.node_moduli, strain_ext, strain_ext * mesh_space.material_field.node_moduli
+
+
+def get_unit_pressure_profiles(structure: Structure, mesh_space: MeshSpace) -> tuple[npt.NDArray[np.float64], ...]:
+    # The profiles are calculated only once for each geometry (see calc_unit_pressure_profiles)
+    return get_cached_profiles(unit_pressure_profiles_cache, get_geometry_key(structure, mesh_space), lambda: calc_unit_pressure_profiles(structure, mesh_space))
+
+
+def calc_pressure_stresses_block(gas_pressures: npt.NDArray[np.float64], structure: Structure, mesh_space: MeshSpace, results: Union[Results, StressBlock], steps: slice) -> None:
+    '''
+    This function calculates the internal pressure stresses for the given internal pressures in a block of time steps (rows of the result matrices)
+    and writes them into the preallocated result matrices.
+    :param gas_pressures:
+    :param structure:
+    :param mesh_space:
+    :param results:
+    :param steps:
+    :return:
+    '''
+    gas_pressures = gas_pressures[:, np.newaxis]
+
+    # Calculate the internal pressure stresses by scaling the profiles of a unit pressure
+    strain_int, stress_int, strain_ext, stress_ext = get_unit_pressure_profiles(structure, mesh_space)
+    matrix_strain_pressure = results.strain_internal_pressure[steps]
+    np.multiply(gas_pressures, strain_int, out=matrix_strain_pressure)
+    np.add(matrix_strain_pressure, strain_ext, out=matrix_strain_pressure)
+    matrix_stress_pressure = results.stress_internal_pressure[steps]
+    np.multiply(gas_pressures, stress_int, out=matrix_stress_pressure)
+    np.add(matrix_stress_pressure, stress_ext, out=matrix_stress_pressure)
+
+
 def calculate_pressure_stresses(
         structure: Structure,
         mesh_space: MeshSpace,
@@ -37,35 +96,11 @@ def calculate_pressure_stresses(
         loads: Loads,
         results: Results) -> str:
 
-    # TODO: Clean it up (use functions and objects more).
     try:
-        # Initialize the matrices for the stresses and strains
-        matrix_strain_pressure = init_empty_space_time_matrix(mesh_space, mesh_time)
-        matrix_stress_pressure = init_empty_space_time_matrix(mesh_space, mesh_time)
-
-        # Initialize the vector for the maximum stresses
-        max_stress_concrete_evol = init_empty_time_array(mesh_time)
-
-        # Calculate the internal pressure stresses
-        node_centers_list = mesh_space.node_centers_from_zero
-        for i in range(int(mesh_time.time_steps_count) + 1):
-            current_time = mesh_time.time_axis[i]
-            if i == 0:
-                gas_pressure = loads.get_current_air_pres(current_time)  # During normal operations (first time step), the pressure coefficient should not be used.
-            else:
-                gas_pressure = structure.pressure_coeff * loads.get_current_air_pres(current_time)
-            results.pres_air_int_vect[i] = gas_pressure
-            for j in mesh_space.nodes_range:
-                current_radius = node_centers_list[j]
-                stress_lame = get_lame_stress(gas_pressure, current_radius, structure)
-                equivalent_strain = stress_lame / structure.modulus_total
-                matrix_strain_pressure[i][j] = equivalent_strain
-                real_stress = calc_stress_from_strain(equivalent_strain, j, mesh_space, structure)
-                matrix_stress_pressure[i][j] = real_stress
-            max_stress_concrete_evol[i] = max(concrete_stress_distribution(matrix_stress_pressure[i], mesh_space, structure))
-
-        results.strain_internal_pressure = matrix_strain_pressure
-        results.stress_internal_pressure = matrix_stress_pressure
+        # All time steps are calculated at once (time steps in rows, nodes in columns)
+        gas_pressures = loads.air_pres_coeff_history[:mesh_time.time_steps_count + 1]  # During normal operations (first time step), the pressure coefficient is not used.
+        results.pres_air_int_vect[:] = gas_pressures
+        calc_pressure_stresses_block(gas_pressures, structure, mesh_space, results, slice(0, mesh_time.time_steps_count + 1))
 
         result_message = "Internal pressure stresses calculated successfully."
 
@@ -73,22 +108,3 @@ def calculate_pressure_stresses(
         result_message = "Internal pressure stresses calculation FAILED: " + str(exception)
 
     return result_message
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
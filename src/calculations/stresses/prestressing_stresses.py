@@ -5,12 +5,13 @@ In steps, the module calculates the stresses caused by the concrete prestressing
 The stresses are calculated for each node of the spatial mesh.
 '''
 
-from src.models import Structure, MeshSpace, MeshTime, Results, Loads
+from src.models import Structure, MeshSpace, MeshTime, Results, Loads, StressBlock
 import numpy as np
 import numpy.typing as npt
-from src.calculations.stresses.thermal_stresses import calc_stress_from_strain
-from src.calculations.stresses.general_functions import concrete_stress_distribution
-from src.calculations.stresses.general_functions import init_empty_space_time_matrix, init_empty_space_array, init_empty_time_array
+from src.calculations.stresses.general_functions import get_geometry_key, get_cached_profiles
+from typing import Union
+
+unit_prestressing_profiles_cache: dict = {}  # Profiles of the unit prestressing for each geometry (see get_unit_prestressing_profiles)
 
 def calc_distr_factor(structure: Structure) -> float:
     '''
@@ -108,6 +109,55 @@ def calc_node_stress(
     return stress
 
 
+def calc_unit_prestressing_profiles(structure: Structure, mesh_space: MeshSpace) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    '''
+    This function calculates the strains and stresses in the nodes caused by a unit prestressing (tendons_stress * tendons_area = 1).
+
+    :param structure: A handle to the :class:`models.Structure` object containing information about the structure.
+    :type structure: class:`Structure`
+    :param mesh_space: A handle to the :class:`models.MeshSpace` object containing information about the space mesh.
+    :type mesh_space: class:`MeshSpace`
+    :return: The strain profile and the stress profile of the unit prestressing.
+    :rtype: tuple
+    '''
+    ri = structure.radius_in
+    re = structure.radius_out
+    rt = structure.radius_tendons
+    p_e = 1 / rt  # Prestressing force of the unit prestressing [N/m2]
+    distr_fact = calc_distr_factor(structure)
+
+    # Vectorized counterpart of calc_node_stress
+    radii = mesh_space.node_centers_from_zero
+    stress_inner = calc_stress_inner_region(distr_fact, p_e, rt, ri, radii)
+    stress_outer = calc_stress_outer_region(distr_fact, p_e, rt, re, radii)
+    stress_acharya = np.where(radii < rt, stress_inner, np.where(radii > rt, stress_outer, (stress_inner + stress_outer) / 2))
+
+    unit_strain = stress_acharya / structure.modulus_total
+    return unit_strain, unit_strain * mesh_space.material_field.node_moduli
+
+
+def get_unit_prestressing_profiles(structure: Structure, mesh_space: MeshSpace) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    '''
+    This function returns the profiles of the unit prestressing (see calc_unit_prestressing_profiles),
+    which are calculated only once for each geometry.
+    '''
+    return get_cached_profiles(unit_prestressing_profiles_cache, get_geometry_key(structure, mesh_space), lambda: calc_unit_prestressing_profiles(structure, mesh_space))
+
+
+def calc_prestressing_stresses_block(structure: Structure, mesh_space: MeshSpace, results: Union[Results, StressBlock], steps: slice) -> None:
+    '''
+    This function writes the prestressing stresses (which are the same in all time steps)
+    into a block of time steps (rows) of the preallocated result matrices.
+
+    :param steps: The time steps of the block.
+    :type steps: slice
+    '''
+    prestressing = structure.tendons_stress * structure.tendons_area
+    unit_strain, unit_stress = get_unit_prestressing_profiles(structure, mesh_space)
+    np.multiply(prestressing, unit_strain, out=results.strain_prestressing[steps])
+    np.multiply(prestressing, unit_stress, out=results.stress_prestressing[steps])
+
+
 def calc_circumferential_stress(
         structure: Structure,
         mesh_space: MeshSpace,
@@ -125,40 +175,9 @@ def calc_circumferential_stress(
     '''
 
     try:
-        pt = structure.tendons_stress
-        at = structure.tendons_area
-        ri = structure.radius_in
-        re = structure.radius_out
-        rt = structure.radius_tendons
-
-        p_e = pt * at / rt  # Prestressing force [N/m2]
-
-        distr_fact = calc_distr_factor(structure)
-
-        # Initialize the arrays for the stresses and strains
-        array_strain_prestressing = init_empty_space_array(mesh_space)
-        array_stress_prestressing = init_empty_space_array(mesh_space)
-
-        # Calculate the prestressing stresses
-        node_centers_list = mesh_space.node_centers_from_zero
-        for node in mesh_space.nodes_range:
-            r_node = node_centers_list[node]
-
-            stress_acharya = calc_node_stress(distr_fact, p_e, rt, ri, re, r_node)
-
-            strain_act = stress_acharya / structure.modulus_total
-            array_strain_prestressing[node] = strain_act
-
-            real_stress = calc_stress_from_strain(strain_act, node, mesh_space, structure)
-            array_stress_prestressing[node] = real_stress
-
-        # Evolution of the maximal prestressing in concrete
-        max_stress_concrete_evol = init_empty_time_array(mesh_time)
-        max_stress_concrete_evol.fill(min(concrete_stress_distribution(array_stress_prestressing, mesh_space, structure)))
-
-        # Save the results into the results object.
-        results.strain_prestressing[:] = array_strain_prestressing
-        results.stress_prestressing[:] = array_stress_prestressing
+        # Calculate the prestressing stresses by scaling the profiles of the unit prestressing
+        # and save the results into the results object.
+        calc_prestressing_stresses_block(structure, mesh_space, results, slice(0, mesh_time.time_steps_count + 1))
 
         result_message = "Prestressing stresses calculated successfully."
 
@@ -166,8 +185,3 @@ def calc_circumferential_stress(
         result_message = "Prestressing stresses calculation FAILED: " + str(exception)
 
     return result_message
-
-
-
-
-
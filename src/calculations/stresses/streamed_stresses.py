@@ -0,0 +1,115 @@
+'''
+This module contains the streamed stress stage.
+
+The transient heat transfer (the producer) yields the time steps whose temperatures have been calculated,
+and a worker thread (the consumer) calculates the stresses of each block of STRESS_BLOCK_STEPS consecutive time steps
+as soon as the block is complete, i.e., the stresses are calculated while the transient heat transfer continues.
+The time steps are passed through the queue with their temperature distributions (which are not copied);
+the queue holds at most two blocks of time steps, so that the transient heat transfer waits for the worker thread if it gets too far ahead.
+In summary-only mode, the stresses of each block are calculated in a StressBlock, which only updates the summary of the results
+(see update_summary_with_block), so that no space-time matrix of the whole analysis is stored.
+Otherwise, the stresses are written into the result matrices like in the fused stress stage (see calc_stresses_of_steps).
+'''
+
+from src.models import Structure, MeshSpace, MeshTime, Results, Loads, StressBlock
+from src.config import STRESS_BLOCK_STEPS
+from src.calculations.temperatures.transient_heat_transfer import iterate_fixed_steps_heat_transfer
+from src.calculations.stresses.fused_stresses import calc_stresses_block, calc_stresses_of_steps, create_double_precision_block
+from src.calculations.outputs.result_processing import update_summary_with_block
+from typing import Callable
+import numpy as np
+import numpy.typing as npt
+import queue
+import threading
+
+
+def consume_time_steps(step_queue: queue.Queue, consume_block: Callable[[slice, list], None], block_steps: int, consumer_errors: list) -> None:
+    '''
+    This function collects the consecutive time steps (with their temperature distributions) from the queue
+    and passes them to consume_block in blocks (the last block may be shorter); None in the queue ends the stream.
+    After the first failure of consume_block, the remaining time steps are only taken from the queue.
+    '''
+    block_start = 0
+    temp_rows: list[npt.NDArray[np.float64]] = []
+    while True:
+        item = step_queue.get()
+        if item is not None:
+            temp_rows.append(item[1])
+        if len(temp_rows) >= block_steps or (item is None and temp_rows):
+            if not consumer_errors:
+                try:
+                    consume_block(slice(block_start, block_start + len(temp_rows)), temp_rows)
+                except Exception as exception:
+                    consumer_errors.append(exception)
+            block_start += len(temp_rows)
+            temp_rows = []
+        if item is None:
+            return
+
+
+def calc_summary_block(
+        structure: Structure,
+        mesh_space: MeshSpace,
+        loads: Loads,
+        results: Results,
+        block: StressBlock,
+        steps: slice,
+        temp_rows: list[npt.NDArray[np.float64]]) -> None:
+    '''
+    This function calculates all stresses of a block of time steps in the StressBlock and updates the summary of the results.
+    '''
+    rows = slice(0, len(temp_rows))
+    block.temp_matrix[rows] = temp_rows
+    gas_pressures = loads.air_pres_coeff_history[steps]  # During normal operations (first time step), the pressure coefficient is not used.
+    results.pres_air_int_vect[steps] = gas_pressures
+    calc_stresses_block(gas_pressures, structure, mesh_space, block, rows)
+    update_summary_with_block(structure, mesh_space, results, block, steps)
+
+
+def stream_heat_transfer_and_stresses(
+        structure: Structure,
+        mesh_space: MeshSpace,
+        mesh_time: MeshTime,
+        loads: Loads,
+        results: Results) -> tuple[str, str]:
+    '''
+    This function calculates the transient heat transfer (with fixed time steps) and, concurrently, all stresses.
+
+    :return: Strings indicating the successful/unsuccessful calculation of the transient heat transfer and of the stresses.
+    :rtype: tuple
+    '''
+    block_steps = max(1, int(STRESS_BLOCK_STEPS))
+    if results.summary_only:
+        block = StressBlock(mesh_space, block_steps, results.temp_init)
+        consume_block = lambda steps, temp_rows: calc_summary_block(structure, mesh_space, loads, results, block, steps, temp_rows)
+    else:
+        # The temperatures of the block are passed in float64 even if the temperature matrix is stored in single precision
+        block = create_double_precision_block(mesh_space, block_steps, results)
+        consume_block = lambda steps, temp_rows: calc_stresses_of_steps(structure, mesh_space, loads, results, steps, block, temp_rows)
+
+    step_queue: queue.Queue = queue.Queue(maxsize=2 * block_steps)
+    consumer_errors: list[Exception] = []
+    consumer = threading.Thread(target=consume_time_steps, args=(step_queue, consume_block, block_steps, consumer_errors), daemon=True)
+    consumer.start()
+
+    step_queue.put((0, results.temp_oper))  # The operating temperatures are known before the transient heat transfer
+    try:
+        for ftr_step, ftr_temp_distr in iterate_fixed_steps_heat_transfer(structure, mesh_space, mesh_time, loads, results):
+            step_queue.put((ftr_step, ftr_temp_distr))
+        heat_transfer_message = "Transient heat transfer calculated successfully."
+        heat_transfer_failed = False
+    except Exception as exception:
+        heat_transfer_message = "Transient heat transfer calculation FAILED: " + str(exception)
+        heat_transfer_failed = True
+    finally:
+        step_queue.put(None)
+        consumer.join()
+
+    if consumer_errors:
+        stress_message = "Stresses calculation FAILED: " + str(consumer_errors[0])
+    elif heat_transfer_failed:
+        stress_message = "Stresses calculation FAILED: the stresses were calculated only for the time steps with calculated temperatures."
+    else:
+        stress_message = "Stresses calculated successfully."
+
+    return heat_transfer_message, stress_message
@@ -1,7 +1,68 @@
-from src.models import Structure, MeshSpace, MeshTime, Results, Loads
+from src.models import Structure, MeshSpace, MeshTime, Results, Loads, StressBlock
 import numpy as np
 import numpy.typing as npt
-from src.calculations.stresses.general_functions import calc_stress_from_strain
+from typing import Union
+
+
+def calc_thermal_stresses_block(
+        structure: Structure,
+        mesh_space: MeshSpace,
+        results: Union[Results, StressBlock],
+        steps: slice) -> None:
+    """
+    This function calculates the thermal stresses in a block of time steps (rows of the result matrices)
+    and writes them into the preallocated result matrices; the only temporaries are of the size of the block.
+    """
+    therm_coeff = structure.therm_expan_coeff
+    stress_factor = 1 / (1 - structure.poisson)
+    center_of_section, inertia_of_section, area_of_section = structure.section_characteristics
+    node_moduli = mesh_space.material_field.node_moduli
+
+    # Calculate fixed stresses for each node
+    mat_strain_theor = results.strains_thermal_theoretical[steps]
+    np.subtract(results.temp_matrix[steps], results.temp_init, out=mat_strain_theor)
+    np.multiply(mat_strain_theor, therm_coeff, out=mat_strain_theor)
+    fixed_stresses = results.stress_temp_fixed[steps]
+    np.multiply(mat_strain_theor, node_moduli, out=fixed_stresses)
+    np.negative(fixed_stresses, out=fixed_stresses)
+
+    # Calculate thermal resultants: the stresses are integrated over the elements by the trapezoidal rule,
+    # i.e., each node gets half of the force (and the moment) of its two adjacent elements
+    element_forces = mesh_space.element_lengths * structure.width
+    element_moments = element_forces * (center_of_section - mesh_space.element_centers)
+    node_force_weights = np.zeros(mesh_space.node_count)
+    node_force_weights[:-1] += element_forces / 2
+    node_force_weights[1:] += element_forces / 2
+    node_moment_weights = np.zeros(mesh_space.node_count)
+    node_moment_weights[:-1] += element_moments / 2
+    node_moment_weights[1:] += element_moments / 2
+    normal_forces = fixed_stresses @ node_force_weights
+    bending_moments = fixed_stresses @ node_moment_weights
+
+    # Calculate strain and curvature
+    # TODO: Rollback to modulus_total
+    strains = (-normal_forces / (structure.modulus_concrete * area_of_section))[:, np.newaxis]
+    curvatures = (-bending_moments / (structure.modulus_concrete * inertia_of_section))[:, np.newaxis]
+
+    # Calculate clamped and free stresses for each node
+    stresses_clamped = results.stress_temp_clamped[steps]
+    np.subtract(strains, mat_strain_theor, out=stresses_clamped)
+    np.multiply(stresses_clamped, node_moduli, out=stresses_clamped)
+    stresses_free = results.stress_temp_free[steps]
+    np.multiply(curvatures, center_of_section - mesh_space.nodes_positions, out=stresses_free)
+    np.add(strains, stresses_free, out=stresses_free)
+
+    # The saved real strains are the same for all nodes of a time step (for free BC, the strain of the last node is saved; for fixed BC, there are no real strains)
+    results.strains_real_fixed[steps] = 0
+    results.strains_real_clamped[steps] = strains
+    results.strains_real_free[steps] = stresses_free[:, -1:]
+
+    np.subtract(stresses_free, mat_strain_theor, out=stresses_free)
+    np.multiply(stresses_free, node_moduli, out=stresses_free)
+
+    np.multiply(fixed_stresses, stress_factor, out=fixed_stresses)
+    np.multiply(stresses_clamped, stress_factor, out=stresses_clamped)
+    np.multiply(stresses_free, stress_factor, out=stresses_free)
 
 
 def calc_thermal_stresses(
@@ -12,94 +73,8 @@ def calc_thermal_stresses(
         results: Results) -> str:
 
     try:
-        mat_stress_fixed = np.zeros((int(mesh_time.time_steps_count + 1), int(mesh_space.node_count)))
-        mat_stress_clamped = np.zeros((int(mesh_time.time_steps_count + 1), int(mesh_space.node_count)))
-        mat_stress_free = np.zeros((int(mesh_time.time_steps_count + 1), int(mesh_space.node_count)))
-
-        mat_strain_theor = np.zeros((int(mesh_time.time_steps_count + 1), int(mesh_space.node_count)))
-        # mat_strain_fixed = np.zeros((int(mesh_time.time_steps_count + 1), int(mesh_space.node_count)))
-        mat_strain_clamped = np.zeros((int(mesh_time.time_steps_count + 1), int(mesh_space.node_count)))
-        mat_strain_free = np.zeros((int(mesh_time.time_steps_count + 1), int(mesh_space.node_count)))
-
-        therm_coeff = structure.therm_expan_coeff
-        poisson = structure.poisson
-
-        for current_step in range(int(mesh_time.time_steps_count) + 1):
-            curr_temps = results.temp_matrix[current_step]
-            curr_temp_diff = np.zeros(int(mesh_space.node_count))
-
-            # Calculate temperature differences for each node
-            for j in mesh_space.nodes_range:
-                curr_temp_diff[j] = (curr_temps[j] - results.temp_init[j])
-
-            theor_strains_list = np.zeros(int(mesh_space.node_count))
-            fixed_stresses_list = np.zeros(int(mesh_space.node_count))
-
-            # Calculate fixed stresses for each node
-            for j in mesh_space.nodes_range:
-                theor_strain = float(curr_temp_diff[j] * therm_coeff)
-                theor_strains_list[j] = theor_strain
-                fixed_stress = - calc_stress_from_strain(theor_strain, j, mesh_space, structure)
-                fixed_stresses_list[j] = fixed_stress
-
-            mat_strain_theor[current_step] = theor_strains_list
-
-            # print(current_step)
-            # print(fixed_stresses_list)
-
-            # Calculate thermal resultants
-            normal_force = 0
-            bending_moment = 0
-            for j in mesh_space.element_range:
-                stress = (fixed_stresses_list[j] + fixed_stresses_list[j + 1]) / 2
-                force = stress * mesh_space.element_length * structure.width
-                arm = (structure.center_of_section - mesh_space.element_centers[j])
-                # print('Force1: ' + str(force))
-                # print(arm)
-                normal_force += force
-                bending_moment += force * arm
-                # print('Forces sum: ' + str(normal_force))
-                # print(bending_moment)
-            # print('Forces sum final: ' + str(normal_force))
-            # print('Moment sum final: ' + str(bending_moment))
-
-            # Calculate strain and curvature
-            # TODO: Rollback to modulus_total
-            strain = -normal_force / (structure.modulus_concrete * structure.area_of_section)
-            curvature = -bending_moment / (structure.modulus_concrete * structure.inertia_of_section)
-
-            # print(strain*1000000)
-            # print(curvature*1000000)
-
-            stresses_clamped_list = np.zeros(int(mesh_space.node_count))
-            stresses_free_list = np.zeros(int(mesh_space.node_count))
-
-            # Calculate clamped and free stresses for each node
-            nodes_positions = mesh_space.nodes_positions
-            for j in mesh_space.nodes_range:
-                theor_strain = float(theor_strains_list[j])
-                node_loc = nodes_positions[j]
-                strain_real_clamped = strain
-                strain_real_free = strain + curvature * (structure.center_of_section - node_loc)
-                strain_prev_clamped = strain_real_clamped - theor_strain
-                strain_prev_free = strain_real_free - theor_strain
-                stresses_clamped_list[j] = calc_stress_from_strain(strain_prev_clamped, j, mesh_space, structure)
-                stresses_free_list[j] = calc_stress_from_strain(strain_prev_free, j, mesh_space, structure)
-
-            mat_strain_free[current_step] = strain_real_free
-            mat_strain_clamped[current_step] = strain_real_clamped
-
-            mat_stress_fixed[current_step] = (1 / (1 - poisson)) * fixed_stresses_list
-            mat_stress_clamped[current_step] = (1 / (1 - poisson)) * stresses_clamped_list
-            mat_stress_free[current_step] = (1 / (1 - poisson)) * stresses_free_list
-
-        results.stress_temp_fixed = mat_stress_fixed
-        results.stress_temp_clamped = mat_stress_clamped
-        results.stress_temp_free = mat_stress_free
-
-        results.strains_thermal_theoretical = mat_strain_theor
-        results.strains_real_clamped = mat_strain_clamped
-        results.strains_real_free = mat_strain_free
+        # All time steps are calculated at once (time steps in rows, nodes in columns)
+        calc_thermal_stresses_block(structure, mesh_space, results, slice(0, mesh_time.time_steps_count + 1))
 
         # print(results.stress_temp_fixed[-1])
         # print(results.stress_temp_clamped[-1])
@@ -1,4 +1,28 @@
-from src.models import Results
+from src.models import Results, StressBlock
+import numpy as np
+from typing import Union
+
+
+def sum_stresses_block(results: Union[Results, StressBlock], steps: slice) -> None:
+    '''
+    This function sums the thermal, internal-pressure, and prestressing stresses in a block of time steps (rows of the result matrices)
+    and writes the sums into the preallocated matrices of total stresses.
+
+    :param results: A handle to the :class:`models.Results` object containing the results.
+    :type results: class:`Results`
+    :param steps: The time steps of the block.
+    :type steps: slice
+    '''
+    stress_internal_pressure = results.stress_internal_pressure[steps]
+    stress_prestressing = results.stress_prestressing[steps]
+    for stress_temp, stress_total in (
+            (results.stress_temp_fixed, results.stress_total_fixed),
+            (results.stress_temp_clamped, results.stress_total_clamped),
+            (results.stress_temp_free, results.stress_total_free)):
+        np.add(stress_temp[steps], stress_internal_pressure, out=stress_total[steps])
+        np.add(stress_total[steps], stress_prestressing, out=stress_total[steps])
+        # matrixStrnR = matrixStrnR + matrixStrnOvrprss + matrixStrnPrstrss
+        # matrixStrnD = matrixStrnD + matrixStrnOvrprss + matrixStrnPrstrss
 
 
 def sum_all_stresses(
@@ -13,24 +37,8 @@ def sum_all_stresses(
     '''
 
     try:
-        # print('===== All stresses started. =====')
-        # print('Adding thermal stresses to overall stresses.')
-        results.stress_total_fixed = results.stress_temp_fixed
-        results.stress_total_clamped = results.stress_temp_clamped
-        results.stress_total_free = results.stress_temp_free
-        # print('Adding internal-pressure stresses to overall stresses.')
-        results.stress_total_fixed = results.stress_total_fixed + results.stress_internal_pressure
-        results.stress_total_clamped = results.stress_total_clamped + results.stress_internal_pressure
-        results.stress_total_free = results.stress_total_free + results.stress_internal_pressure
-        # matrixStrnR = matrixStrnR + matrixStrnOvrprss
-        # matrixStrnD = matrixStrnD + matrixStrnOvrprss
-        # print('Adding prestressing stresses to overall stresses.')
-        results.stress_total_fixed = results.stress_total_fixed + results.stress_prestressing
-        results.stress_total_clamped = results.stress_total_clamped + results.stress_prestressing
-        results.stress_total_free = results.stress_total_free + results.stress_prestressing
-        # matrixStrnR = matrixStrnR + matrixStrnPrstrss
-        # matrixStrnD = matrixStrnD + matrixStrnPrstrss
-        # print('===== All stresses ended. =====')
+        # The sums are written into the preallocated matrices (no temporary matrices of the whole analysis)
+        sum_stresses_block(results, slice(0, len(results.stress_total_fixed)))
 
         result_message = "Total stresses obtained successfully."
 
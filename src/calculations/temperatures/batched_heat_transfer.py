@@ -0,0 +1,218 @@
+'''
+This module contains the batched transient heat transfer, which advances several scenarios of the same wall
+(e.g., different evolutions of the internal air temperature or different initial and operating temperatures) together on a shared time axis.
+
+Temperatures of all scenarios are stored as a (scenario_count x node_count) array. The tridiagonal systems of the Newton iteration
+of all scenarios which have not converged yet are stacked into one banded system (without any coupling between the scenarios)
+and solved by one call of scipy.linalg.solve_banded. Converged scenarios are excluded from further iterations.
+
+The batched solver uses the fixed time axis, the full Newton method and the material properties frozen at the beginning of each time step
+(i.e., the formulation of JACOBIAN = 0); the time scheme, the extrapolated predictors and the tolerances are the same as in the transient_heat_transfer module.
+'''
+
+from src.models import Structure, MeshSpace, MeshTime, Results, Loads
+import numpy as np
+import numpy.typing as npt
+from scipy.linalg import solve_banded
+from src.calculations.temperatures.surface_heat_transfer_coefficient import calc_surface_heat_transfer_coef
+from src.calculations.temperatures.transient_heat_transfer import get_material_properties, get_time_scheme, predict_ftr_temp_distr
+from src.config import NEWTON_MAX_ITERATIONS, NEWTON_TOLERANCE_ABS, NEWTON_TOLERANCE_REL
+from src.general_functions import double_print
+from typing import Optional
+
+
+def sum_element_diag(element_diag: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    # Main diagonals (one row per scenario) assembled from the diagonal terms of the element matrices
+    main_diag = np.zeros((element_diag.shape[0], element_diag.shape[1] + 1))
+    main_diag[:, :-1] += element_diag
+    main_diag[:, 1:] += element_diag
+    return main_diag
+
+
+def create_batched_matrices(
+        temp_rows: npt.NDArray[np.float64],
+        mesh_space: MeshSpace,
+        structure: Structure) -> tuple[tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]], tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]]:
+    # Returns the conductivity and capacity matrices of all scenarios, each as a tuple (main diagonals, off diagonals)
+    element_lengths = mesh_space.element_lengths
+    elem_mean_temps = (temp_rows[:, :-1] + temp_rows[:, 1:]) / 2
+    elem_from_zero = mesh_space.element_centers_from_zero
+    steel_mask = np.tile(mesh_space.material_field.element_steel_mask, len(temp_rows))
+    conductivities, capacities = get_material_properties(elem_mean_temps.ravel(), steel_mask, structure)
+    elem_conduc = elem_from_zero * conductivities.reshape(elem_mean_temps.shape) / element_lengths
+    elem_capac = elem_from_zero * capacities.reshape(elem_mean_temps.shape) * element_lengths
+    return (sum_element_diag(elem_conduc), -elem_conduc), (sum_element_diag(elem_capac / 3), elem_capac / 6)
+
+
+def tridiagonal_dot(
+        main_diag: npt.NDArray[np.float64],
+        off_diag: npt.NDArray[np.float64],
+        vect: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    # Products of the symmetric tridiagonal matrices with the vectors (one row per scenario)
+    product = main_diag * vect
+    product[:, :-1] += off_diag * vect[:, 1:]
+    product[:, 1:] += off_diag * vect[:, :-1]
+    return product
+
+
+def solve_batched_tridiagonal(
+        main_diag: npt.NDArray[np.float64],
+        off_diag: npt.NDArray[np.float64],
+        vect: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    # The systems of all scenarios form one block-diagonal banded system (the off diagonals are zero between the blocks)
+    scenario_count, node_count = main_diag.shape
+    padded_off_diag = np.zeros((scenario_count, node_count))
+    padded_off_diag[:, :-1] = off_diag
+    banded_matrix = np.zeros((3, scenario_count * node_count))
+    banded_matrix[0, 1:] = padded_off_diag.ravel()[:-1]
+    banded_matrix[1] = main_diag.ravel()
+    banded_matrix[2, :-1] = padded_off_diag.ravel()[:-1]
+    solution = solve_banded((1, 1), banded_matrix, vect.ravel(), check_finite=False)
+    return solution.reshape(scenario_count, node_count)
+
+
+def get_batched_flux_vect_and_deriv(
+        temp_rows: npt.NDArray[np.float64],
+        temps_gas_in: npt.NDArray[np.float64],
+        temps_air_ext: npt.NDArray[np.float64],
+        structure: Structure,
+        mesh_space: MeshSpace) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    # Counterpart of get_flux_vect_and_deriv for all scenarios (the surface heat transfer coefficients are evaluated for all scenarios at once)
+    temps_surf_in = temp_rows[:, 0]
+    temps_surf_out = temp_rows[:, -1]
+    convection_coefs_in = calc_surface_heat_transfer_coef(structure, temps_surf_in, temps_gas_in)
+    convection_coefs_out = calc_surface_heat_transfer_coef(structure, temps_surf_out, temps_air_ext)
+    radius_surf_in = mesh_space.element_centers_from_zero[0]
+    radius_surf_out = mesh_space.element_centers_from_zero[-1]
+    flux_rows: npt.NDArray[np.float64] = np.zeros(temp_rows.shape)
+    flux_rows[:, 0] = convection_coefs_in * (temps_surf_in - temps_gas_in) * radius_surf_in
+    flux_rows[:, -1] = convection_coefs_out * (temps_surf_out - temps_air_ext) * radius_surf_out
+    flux_deriv_rows: npt.NDArray[np.float64] = np.zeros(temp_rows.shape)
+    flux_deriv_rows[:, 0] = convection_coefs_in * radius_surf_in
+    flux_deriv_rows[:, -1] = convection_coefs_out * radius_surf_out
+    return flux_rows, flux_deriv_rows
+
+
+def calc_batched_ftr_temp_distr(
+        curr_temp_rows: npt.NDArray[np.float64],
+        curr_temps_gas: npt.NDArray[np.float64],
+        ftr_temps_gas: npt.NDArray[np.float64],
+        temps_air_ext: npt.NDArray[np.float64],
+        time_jump: float,
+        structure: Structure,
+        mesh_space: MeshSpace,
+        prev_temp_rows: Optional[npt.NDArray[np.float64]] = None,
+        prev_time_jump: Optional[float] = None,
+        first_guess: Optional[npt.NDArray[np.float64]] = None) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.int64], npt.NDArray[np.float64]]:
+    # Returns the future temperature distributions, the numbers of Newton iterations and the final maximal residua of all scenarios.
+    # The steps are the same as in calc_ftr_temp_distr.
+
+    # 1) Calculate the conductivity matrices and capacity matrices for the current temperatures
+    (conduc_diag, conduc_off), (capac_diag, capac_off) = create_batched_matrices(curr_temp_rows, mesh_space, structure)
+
+    # 2) Calculate the parts of the residua given by the already known temperatures
+    theta, coef_ftr, coef_curr, coef_prev = get_time_scheme(time_jump, prev_time_jump)
+    hist_temp_rows: npt.NDArray[np.float64] = coef_curr * curr_temp_rows
+    if coef_prev != 0:
+        hist_temp_rows = hist_temp_rows + coef_prev * prev_temp_rows
+    explicit_rows: npt.NDArray[np.float64] = np.zeros(curr_temp_rows.shape)
+    if theta != 1:
+        curr_flux_rows = get_batched_flux_vect_and_deriv(curr_temp_rows, curr_temps_gas, temps_air_ext, structure, mesh_space)[0]
+        explicit_rows = (1 - theta) * (tridiagonal_dot(conduc_diag, conduc_off, curr_temp_rows) + curr_flux_rows)
+
+    # 3) Create a first guess of the temperature distributions in the future time step
+    ftr_temp_rows: npt.NDArray[np.float64] = np.copy(first_guess if first_guess is not None else curr_temp_rows)
+
+    # 4) Calculate the residua of all scenarios
+    def get_residua(temp_rows: npt.NDArray[np.float64], flux_rows: npt.NDArray[np.float64], active: npt.NDArray[np.bool_]) -> npt.NDArray[np.float64]:
+        rate_rows = (coef_ftr * temp_rows + hist_temp_rows[active]) / time_jump
+        return tridiagonal_dot(capac_diag[active], capac_off[active], rate_rows) + theta * (tridiagonal_dot(conduc_diag[active], conduc_off[active], temp_rows) + flux_rows) + explicit_rows[active]
+
+    all_scenarios = np.ones(len(curr_temp_rows), dtype=bool)
+    flux_rows, flux_deriv_rows = get_batched_flux_vect_and_deriv(ftr_temp_rows, ftr_temps_gas, temps_air_ext, structure, mesh_space)
+    residuum_rows = get_residua(ftr_temp_rows, flux_rows, all_scenarios)
+    max_residua: npt.NDArray[np.float64] = np.amax(np.absolute(residuum_rows), axis=1)
+    tolerances = np.maximum(NEWTON_TOLERANCE_ABS, NEWTON_TOLERANCE_REL * max_residua)
+    iteration_counts: npt.NDArray[np.int64] = np.zeros(len(curr_temp_rows), dtype=int)
+
+    # 5) Correct the temperatures of the scenarios which have not converged yet (the others are masked out)
+    active = max_residua > tolerances
+    while np.any(active):
+        if np.amax(iteration_counts[active]) == NEWTON_MAX_ITERATIONS:
+            raise ArithmeticError('Newton iteration did not converge in ' + str(NEWTON_MAX_ITERATIONS) + ' iterations (maximal residuum ' + str(np.amax(max_residua[active])) + ').')
+        deriv_diag = capac_diag[active] * coef_ftr / time_jump + theta * (conduc_diag[active] + flux_deriv_rows[active])
+        deriv_off = capac_off[active] * coef_ftr / time_jump + theta * conduc_off[active]
+        ftr_temp_rows[active] -= solve_batched_tridiagonal(deriv_diag, deriv_off, residuum_rows[active])
+        flux_rows[active], flux_deriv_rows[active] = get_batched_flux_vect_and_deriv(ftr_temp_rows[active], ftr_temps_gas[active], temps_air_ext[active], structure, mesh_space)
+        residuum_rows[active] = get_residua(ftr_temp_rows[active], flux_rows[active], active)
+        max_residua[active] = np.amax(np.absolute(residuum_rows[active]), axis=1)
+        iteration_counts[active] += 1
+        active = max_residua > tolerances
+
+    return ftr_temp_rows, iteration_counts, max_residua
+
+
+def fixed_steps_batched_heat_transfer(
+        structure_list: list[Structure],
+        mesh_space: MeshSpace,
+        mesh_time: MeshTime,
+        loads_list: list[Loads],
+        results_list: list[Results]) -> None:
+    # The first structure defines the wall (geometry and materials), the others differ only in the temperatures and loads.
+    # The initial temperature distributions are taken from the first row of the temperature matrix of each scenario.
+    structure = structure_list[0]
+    temps_air_ext = np.array([scenario_structure.temp_air_ext for scenario_structure in structure_list], dtype=float)
+    time_axis = mesh_time.time_axis
+    temps_gas_history = np.array([loads.air_temp_history for loads in loads_list])  # Temperatures of the inner gas (scenarios in rows)
+    temp_rows_history: list[npt.NDArray[np.float64]] = [np.array([results.temp_matrix[0] for results in results_list])]
+    for current_step in mesh_time.time_steps_range:
+
+        # Print the progress
+        ftr_step = current_step + 1
+        ftr_time = time_axis[ftr_step]
+        if mesh_time.is_log_step(ftr_step):
+            progress_percent = int(1000 * ftr_step / mesh_time.time_steps_count) / 10
+            double_print('Calculating temperatures of ' + str(len(results_list)) + ' scenarios for time: ' + str(ftr_time) + ' s (step ' + str(ftr_step) + ' out of ' + str(mesh_time.time_steps_count) + '; ' + str(progress_percent) + '%)')
+
+        # Calculate the future temperature distributions of all scenarios
+        curr_temps_gas = temps_gas_history[:, current_step]
+        ftr_temps_gas = temps_gas_history[:, ftr_step]
+        if current_step > 0:
+            prev_temp_rows = temp_rows_history[-2]
+            prev_time_jump = mesh_time.time_to_next_step(current_step - 1)
+        else:
+            prev_temp_rows = None
+            prev_time_jump = None
+        first_guess = predict_ftr_temp_distr(temp_rows_history, time_axis[max(0, ftr_step - len(temp_rows_history)):ftr_step], ftr_time)
+        ftr_temp_rows, iteration_counts, max_residua = calc_batched_ftr_temp_distr(temp_rows_history[-1], curr_temps_gas, ftr_temps_gas, temps_air_ext, mesh_time.time_to_next_step(current_step),
+                                                                                   structure, mesh_space, prev_temp_rows, prev_time_jump, first_guess)
+        temp_rows_history = temp_rows_history[-2:] + [ftr_temp_rows]
+
+        # Save the results of each scenario (one factorization is made in each iteration)
+        for scenario_index, results in enumerate(results_list):
+            results.temp_matrix[ftr_step] = ftr_temp_rows[scenario_index]
+            results.newton_iterations_vect[ftr_step] = iteration_counts[scenario_index]
+            results.newton_factorizations_vect[ftr_step] = iteration_counts[scenario_index]
+            results.newton_residuum_vect[ftr_step] = max_residua[scenario_index]
+
+    for results in results_list:
+        results.time_axis = time_axis
+
+    return None
+
+
+def batched_transient_heat_transfer(
+        structure_list: list[Structure],
+        mesh_space: MeshSpace,
+        mesh_time: MeshTime,
+        loads_list: list[Loads],
+        results_list: list[Results]) -> str:
+
+    try:
+        fixed_steps_batched_heat_transfer(structure_list, mesh_space, mesh_time, loads_list, results_list)
+        result_message = "Batched transient heat transfer of " + str(len(results_list)) + " scenarios calculated successfully."
+
+    except Exception as exception:
+        result_message = "Batched transient heat transfer calculation FAILED: " + str(exception)
+
+    return result_message
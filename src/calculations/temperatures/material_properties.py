@@ -1,4 +1,8 @@
-from src.config import CONCRETE_CONDUCTIVITY_LIMIT
+from src.config import CONCRETE_CONDUCTIVITY_LIMIT, MATERIAL_PROPERTIES, MATERIAL_TABLE_STEP
+from functools import lru_cache
+from typing import Callable
+import numpy as np
+import numpy.typing as npt
 
 
 def steel_conductivity(temperature: float) -> float:
@@ -63,6 +67,87 @@ def concrete_volumetric_heat_capacity(temperature: float, initial_density: float
 
 
 
+class MaterialPropertyTables:
+    """
+    Class for evaluating the material properties for whole arrays of temperatures.
+    If MATERIAL_PROPERTIES is 1, each property is precomputed on a fine temperature grid and interpolated linearly;
+    the grid contains the breakpoints of the property curves (from both sides), so that their jumps and kinks are kept.
+    Temperatures outside the grid and MATERIAL_PROPERTIES = 0 use the exact functions (reference mode).
+    """
+
+    temp_min: float = -100.0  # Celsius
+    temp_max: float = 1500.0  # Celsius
+    breakpoints: tuple[float, ...] = (100, 115, 200, 400, 600, 735, 800, 900)
+
+    def __init__(
+        self,
+        initial_density: float,
+        water_content: float,
+    ) -> None:
+        self.initial_density = initial_density
+        self.water_content = water_content
+        self.tabulated = MATERIAL_PROPERTIES == 1
+        if self.tabulated:
+            breakpoints = np.array(self.breakpoints, dtype=float)
+            self.temp_grid: npt.NDArray[np.float64] = np.unique(np.concatenate((
+                np.arange(self.temp_min, self.temp_max + MATERIAL_TABLE_STEP, MATERIAL_TABLE_STEP),
+                breakpoints - 1e-6,
+                breakpoints,
+                breakpoints + 1e-6
+            )))
+            self.table_steel_conductivity = self.__exact(steel_conductivity, self.temp_grid)
+            self.table_concrete_conductivity = self.__exact(concrete_conductivity, self.temp_grid)
+            self.table_steel_capacity = self.__exact(steel_volumetric_heat_capacity, self.temp_grid)
+            self.table_concrete_capacity = self.__exact(self.__concrete_capacity, self.temp_grid)
+
+    def __concrete_capacity(self, temperature: float) -> float:
+        return concrete_volumetric_heat_capacity(temperature, self.initial_density, self.water_content)
+
+    @staticmethod
+    def __exact(function: Callable[[float], float], temps: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+        return np.array([function(float(temp)) for temp in temps], dtype=float)
+
+    def __lookup(self, function: Callable[[float], float], table: npt.NDArray[np.float64], temps: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+        values: npt.NDArray[np.float64] = np.interp(temps, self.temp_grid, table)
+        outside_grid = (temps < self.temp_min) | (temps > self.temp_max)
+        if np.any(outside_grid):
+            values[outside_grid] = self.__exact(function, temps[outside_grid])
+        return values
+
+    def steel_conductivity(self, temps: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+        if not self.tabulated:
+            return self.__exact(steel_conductivity, temps)
+        return self.__lookup(steel_conductivity, self.table_steel_conductivity, temps)
+
+    def concrete_conductivity(self, temps: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+        if not self.tabulated:
+            return self.__exact(concrete_conductivity, temps)
+        return self.__lookup(concrete_conductivity, self.table_concrete_conductivity, temps)
+
+    def steel_volumetric_heat_capacity(self, temps: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+        if not self.tabulated:
+            return self.__exact(steel_volumetric_heat_capacity, temps)
+        return self.__lookup(steel_volumetric_heat_capacity, self.table_steel_capacity, temps)
+
+    def concrete_volumetric_heat_capacity(self, temps: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+        if not self.tabulated:
+            return self.__exact(self.__concrete_capacity, temps)
+        return self.__lookup(self.__concrete_capacity, self.table_concrete_capacity, temps)
+
+    def slope(self, material_property: Callable[[npt.NDArray[np.float64]], npt.NDArray[np.float64]], temps: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+        # Central difference of the given property (one of the methods above) over one step of the table;
+        # jumps of the property curves thus give large but finite slopes in their close vicinity
+        half_step = MATERIAL_TABLE_STEP / 2
+        return (material_property(temps + half_step) - material_property(temps - half_step)) / MATERIAL_TABLE_STEP
+
+
+@lru_cache(maxsize=8)
+def get_material_property_tables(initial_density: float, water_content: float) -> MaterialPropertyTables:
+    # The tables are created only once for given properties of concrete (i.e., once per analysis)
+    return MaterialPropertyTables(initial_density, water_content)
+
+
+
 
     # def volHeatCap(T):
     #     return (density(T)*heatCapac(T))
@@ -1,4 +1,4 @@
-from src.models import Structure, MeshSpace
+from src.models import Structure, MeshSpace, MaterialField
 from src.calculations.temperatures.material_properties import steel_conductivity, concrete_conductivity
 import numpy as np
 import numpy.typing as npt
@@ -51,19 +51,15 @@ def calc_steady_state_heat_transfer(structure: Structure, mesh_space: MeshSpace,
     temp_concrete_ext = result_steady_state[3]
     temp_surf_ext_new = result_steady_state[4]
 
-    nodes_range = mesh_space.nodes_range
-    node_count = mesh_space.node_count
-    slice_index_steel_in = mesh_space.slice_index_steel_in
-    slice_index_steel_out = mesh_space.slice_index_steel_out
-    element_length = mesh_space.element_length
-    temperature_distribution = np.zeros(node_count)
-    for i in nodes_range:
-        if steel_thick_in != 0 and i <= slice_index_steel_in:
-            temperature_distribution[i] = temp_surf_int_new - (i * element_length / steel_thick_in) * (temp_surf_int_new - temp_concrete_int)
-        elif steel_thick_out != 0 and i >= slice_index_steel_out:
-            temperature_distribution[i] = temp_concrete_ext - ((i * element_length - steel_thick_in - concrete_thick) / steel_thick_out) * (temp_concrete_ext - temp_surf_ext_new)
-        else:
-            temperature_distribution[i] = temp_concrete_int - ((i * element_length - steel_thick_in) / concrete_thick) * (temp_concrete_int - temp_concrete_ext)
+    # The linear temperature profile of each layer is evaluated at once for all nodes of the layer
+    node_layer_ids = mesh_space.material_field.node_layer_ids
+    nodes_positions = mesh_space.nodes_positions
+    temps_steel_inner = temp_surf_int_new - (nodes_positions / steel_thick_in) * (temp_surf_int_new - temp_concrete_int) if steel_thick_in != 0 else 0.0
+    temps_steel_outer = temp_concrete_ext - ((nodes_positions - steel_thick_in - concrete_thick) / steel_thick_out) * (temp_concrete_ext - temp_surf_ext_new) if steel_thick_out != 0 else 0.0
+    temps_concrete = temp_concrete_int - ((nodes_positions - steel_thick_in) / concrete_thick) * (temp_concrete_int - temp_concrete_ext)
+    temperature_distribution = np.select(
+        [node_layer_ids == MaterialField.LAYER_STEEL_INNER, node_layer_ids == MaterialField.LAYER_STEEL_OUTER],
+        [temps_steel_inner, temps_steel_outer],
+        temps_concrete,
+    )
     return temperature_distribution
-
-
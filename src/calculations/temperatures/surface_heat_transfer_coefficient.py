@@ -1,14 +1,20 @@
-from src.config import STEF_BOLT_CONST, AIR_FLOW
+from src.config import STEF_BOLT_CONST, AIR_FLOW, HEAT_COEF_CACHE_SIZE
 from src.calculations.temperatures.air_properties import calc_air_conductivity, calc_air_dyn_viscosity, calc_air_density, calc_air_heat_capacity
 from src.models import Structure
+from functools import lru_cache
+import numpy as np
+import numpy.typing as npt
+from typing import Union
 
+# All functions in this module accept both floats and NumPy arrays of temperatures (evaluated element-wise).
 
-def celsius_to_kelvin(temp: float) -> float:
+
+def celsius_to_kelvin(temp: Union[float, npt.NDArray[np.float64]]) -> Union[float, npt.NDArray[np.float64]]:
     return temp + 273.15
 
 
-def calc_convective_coefficient(char_len: float, temp_surf: float, temp_air: float) -> float:
-    # Temperatures (in inputs) are in Kelvin
+def calc_convection_numbers(char_len: float, temp_surf: Union[float, npt.NDArray[np.float64]], temp_air: Union[float, npt.NDArray[np.float64]]) -> tuple:
+    # Returns the air conductivity (W/mK), Rayleigh number and Prandtl number; temperatures (in inputs) are in Kelvin
     air_conduc = calc_air_conductivity(temp_air)  # W/mK
     air_dyn_viscosity = calc_air_dyn_viscosity(temp_air)  # Ns/m2
     air_density = calc_air_density(temp_air)  # kg/m3
@@ -17,8 +23,14 @@ def calc_convective_coefficient(char_len: float, temp_surf: float, temp_air: flo
     beta = 1 / temp_air  # 1/K
     air_kinematic_viscosity = air_dyn_viscosity / air_density  # m2/s
     air_diffusivity = air_conduc / (air_density * air_heat_capac)  # m2/s
-    Ra = (ga * beta / (air_kinematic_viscosity * air_diffusivity)) * abs(temp_surf - temp_air) * char_len ** 3  # dimensionless
+    Ra = (ga * beta / (air_kinematic_viscosity * air_diffusivity)) * np.abs(temp_surf - temp_air) * char_len ** 3  # dimensionless
     Pr = air_kinematic_viscosity / air_diffusivity  # dimensionless
+    return air_conduc, Ra, Pr
+
+
+def calc_convective_coefficient(char_len: float, temp_surf: Union[float, npt.NDArray[np.float64]], temp_air: Union[float, npt.NDArray[np.float64]]) -> Union[float, npt.NDArray[np.float64]]:
+    # Temperatures (in inputs) are in Kelvin
+    air_conduc, Ra, Pr = calc_convection_numbers(char_len, temp_surf, temp_air)
     if AIR_FLOW == 0:
         conv_coef = (air_conduc / char_len) * (0.68 + 0.67 * Ra ** (1 / 4) / (1 + (0.492 / Pr) ** (9 / 16)) ** (4 / 9))  # W/m2K
     else:
@@ -26,17 +38,72 @@ def calc_convective_coefficient(char_len: float, temp_surf: float, temp_air: flo
     return conv_coef
 
 
-def calc_surface_heat_transfer_coef(structure: Structure, temp_surf: float, temp_air: float) -> float:
-    # Temperatures (in inputs) are in Celsius
+def calc_convective_coefficient_slope_term(char_len: float, temp_surf: Union[float, npt.NDArray[np.float64]], temp_air: Union[float, npt.NDArray[np.float64]]) -> Union[float, npt.NDArray[np.float64]]:
+    # Returns (temp_surf - temp_air) * d(conv_coef)/d(temp_surf); temperatures (in inputs) are in Kelvin.
+    # The Rayleigh number is proportional to |temp_surf - temp_air|, thus the term stays finite for equal temperatures.
+    air_conduc, Ra, Pr = calc_convection_numbers(char_len, temp_surf, temp_air)
+    if AIR_FLOW == 0:
+        coef_ra = 0.67 / (1 + (0.492 / Pr) ** (9 / 16)) ** (4 / 9)
+        return (air_conduc / char_len) * coef_ra * Ra ** (1 / 4) / 4  # W/m2K
+    else:
+        coef_ra = 0.387 / (1 + (0.492 / Pr) ** (9 / 16)) ** (8 / 27)
+        return (air_conduc / char_len) * 2 * (0.825 + coef_ra * Ra ** (1 / 6)) * coef_ra * Ra ** (1 / 6) / 6  # W/m2K
+
+
+def calc_heat_transfer_coef(char_len: float, emissivity: float, temp_surf: Union[float, npt.NDArray[np.float64]], temp_air: Union[float, npt.NDArray[np.float64]]) -> Union[float, npt.NDArray[np.float64]]:
+    # Temperatures (in inputs) are in Celsius; this function is also called by the compiled kernel (see transient_kernel)
     temp_surf_k = celsius_to_kelvin(temp_surf)
     temp_air_k = celsius_to_kelvin(temp_air)
-    conv_coeff = calc_convective_coefficient(structure.char_len, temp_surf_k, temp_air_k)
-    rad_coeff = structure.emissivity * STEF_BOLT_CONST * (temp_surf_k + temp_air_k) * (temp_surf_k * temp_surf_k + temp_air_k * temp_air_k)
+    conv_coeff = calc_convective_coefficient(char_len, temp_surf_k, temp_air_k)
+    rad_coeff = emissivity * STEF_BOLT_CONST * (temp_surf_k + temp_air_k) * (temp_surf_k * temp_surf_k + temp_air_k * temp_air_k)
     total_coeff = conv_coeff + rad_coeff
     return total_coeff
 
 
-def calc_surface_resistance(structure: Structure, temp_surf: float, temp_air: float) -> float:
+def calc_surface_heat_transfer_coef(structure: Structure, temp_surf: Union[float, npt.NDArray[np.float64]], temp_air: Union[float, npt.NDArray[np.float64]]) -> Union[float, npt.NDArray[np.float64]]:
+    # Temperatures (in inputs) are in Celsius
+    return calc_heat_transfer_coef(structure.char_len, structure.emissivity, temp_surf, temp_air)
+
+
+@lru_cache(maxsize=HEAT_COEF_CACHE_SIZE)
+def _calc_memoized_coef(char_len: float, emissivity: float, temp_surf: float, temp_air: float) -> float:
+    return float(calc_heat_transfer_coef(char_len, emissivity, temp_surf, temp_air))
+
+
+def calc_surface_heat_transfer_coef_memoized(structure: Structure, temp_surf: float, temp_air: float) -> float:
+    # Scalar version with a bounded memory of recently evaluated pairs of temperatures,
+    # so that repeated evaluations (e.g., of the flux vector and its derivative in one iteration) are calculated only once
+    return _calc_memoized_coef(structure.char_len, structure.emissivity, float(temp_surf), float(temp_air))
+
+
+def calc_heat_flux_deriv_slope_term(char_len: float, emissivity: float, temp_surf: Union[float, npt.NDArray[np.float64]], temp_air: Union[float, npt.NDArray[np.float64]]) -> Union[float, npt.NDArray[np.float64]]:
+    # Returns (temp_surf - temp_air) * d(coef)/d(temp_surf) of the total (convective and radiative) coefficient (in W/m2K).
+    # Temperatures (in inputs) are in Celsius
+    temp_surf_k = celsius_to_kelvin(temp_surf)
+    temp_air_k = celsius_to_kelvin(temp_air)
+    conv_slope_term = calc_convective_coefficient_slope_term(char_len, temp_surf_k, temp_air_k)
+    rad_slope = emissivity * STEF_BOLT_CONST * (temp_surf_k * temp_surf_k + temp_air_k * temp_air_k + 2 * temp_surf_k * (temp_surf_k + temp_air_k))
+    return conv_slope_term + (temp_surf_k - temp_air_k) * rad_slope
+
+
+def calc_surface_heat_flux_deriv(structure: Structure, temp_surf: Union[float, npt.NDArray[np.float64]], temp_air: Union[float, npt.NDArray[np.float64]]) -> Union[float, npt.NDArray[np.float64]]:
+    # Returns the derivation of the heat flux coef * (temp_surf - temp_air) with respect to temp_surf (in W/m2K),
+    # i.e., including the dependence of the convective and radiative coefficients on the surface temperature.
+    # Temperatures (in inputs) are in Celsius
+    total_coeff = calc_surface_heat_transfer_coef(structure, temp_surf, temp_air)
+    return total_coeff + calc_heat_flux_deriv_slope_term(structure.char_len, structure.emissivity, temp_surf, temp_air)
+
+
+@lru_cache(maxsize=HEAT_COEF_CACHE_SIZE)
+def _calc_memoized_flux_deriv(char_len: float, emissivity: float, temp_surf: float, temp_air: float) -> float:
+    return _calc_memoized_coef(char_len, emissivity, temp_surf, temp_air) + float(calc_heat_flux_deriv_slope_term(char_len, emissivity, temp_surf, temp_air))
+
+
+def calc_surface_heat_flux_deriv_memoized(structure: Structure, temp_surf: float, temp_air: float) -> float:
+    return _calc_memoized_flux_deriv(structure.char_len, structure.emissivity, float(temp_surf), float(temp_air))
+
+
+def calc_surface_resistance(structure: Structure, temp_surf: Union[float, npt.NDArray[np.float64]], temp_air: Union[float, npt.NDArray[np.float64]]) -> Union[float, npt.NDArray[np.float64]]:
     return 1 / calc_surface_heat_transfer_coef(structure, temp_surf, temp_air)
 
 
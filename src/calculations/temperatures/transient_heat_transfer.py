@@ -1,8 +1,16 @@
-from src.models import Structure, MeshSpace, MeshTime, Results, Loads
+from src.models import Structure, MeshSpace, MeshTime, Results, Loads, MaterialField
 import numpy as np
 import numpy.typing as npt
+from typing import Iterator, Optional
 from src.calculations.temperatures.material_properties import steel_conductivity, concrete_conductivity, steel_volumetric_heat_capacity, concrete_volumetric_heat_capacity
-from src.calculations.temperatures.surface_heat_transfer_coefficient import calc_surface_heat_transfer_coef
+from src.calculations.temperatures.material_properties import get_material_property_tables
+from src.calculations.temperatures.surface_heat_transfer_coefficient import calc_surface_heat_transfer_coef_memoized, calc_surface_heat_flux_deriv_memoized
+from src.calculations.temperatures.transient_kernel import NUMBA_AVAILABLE, kernel_fixed_steps
+from src.calculations.temperatures.transient_matrices import init_empty_matrix, add_element_matrix, finish_assembly, assemble_symmetric_matrix, add_to_diagonal, add_tridiagonal, matrix_dot, solve_linear_system, factorize_matrix
+from src.config import ASSEMBLY, TIME_INTEGRATION, THETA, TIME_STEPPING, ADAPTIVE_TOLERANCE, ADAPTIVE_STEP_MIN, ADAPTIVE_STEP_MAX
+from src.config import PREDICTOR, ADAPTIVE_ERROR_ESTIMATE
+from src.config import NEWTON_METHOD, NEWTON_MAX_ITERATIONS, NEWTON_TOLERANCE_ABS, NEWTON_TOLERANCE_REL, JACOBIAN
+from src.config import KERNEL, LOAD_BREAKPOINTS, LOG_PERCENTAGE
 import eel
 from src.general_functions import get_timestamp
 from src.general_functions import double_print
@@ -11,10 +19,7 @@ np.set_printoptions(linewidth=200)
 
 
 def get_material_conductivity(temp: float, index: int, structure: Structure, mesh_space: MeshSpace) -> float:
-    if structure.has_inner_steel and (index <= mesh_space.slice_index_steel_in):
-    # TODO: Rollback to: <
-        return steel_conductivity(temp)
-    elif structure.has_outer_steel and (index >= mesh_space.slice_index_steel_out):
+    if mesh_space.material_field.element_material_ids[index] == MaterialField.MATERIAL_STEEL:
         return steel_conductivity(temp)
     else:
         return concrete_conductivity(temp)
@@ -23,26 +28,21 @@ def get_material_conductivity(temp: float, index: int, structure: Structure, mes
 def create_element_conductivity_matrix(temp: float, index: int, structure: Structure, mesh_space: MeshSpace) -> npt.NDArray[np.float64]:
     material_conduc = get_material_conductivity(temp, index, structure, mesh_space)
     element_from_zero = mesh_space.element_centers_from_zero[index]
-    element_matrix = element_from_zero * material_conduc * np.array([[1, -1], [-1, 1]]) / mesh_space.element_length
+    element_matrix = element_from_zero * material_conduc * np.array([[1, -1], [-1, 1]]) / mesh_space.element_lengths[index]
     return element_matrix
 
 
 def create_global_conduc_mat(temp_vect: npt.NDArray[np.float64], mesh_space: MeshSpace, structure: Structure) -> npt.NDArray[np.float64]:
-    global_matrix: npt.NDArray[np.float64] = np.zeros((mesh_space.node_count, mesh_space.node_count))
+    global_matrix: npt.NDArray[np.float64] = init_empty_matrix(mesh_space.node_count)
     for i in range(mesh_space.element_count):
         elem_mean_temp = (float(temp_vect[i]) + float(temp_vect[i + 1])) / 2
         element_matrix = create_element_conductivity_matrix(elem_mean_temp, i, structure, mesh_space)
-        for j in range(2):
-            for k in range(2):
-                global_matrix[i + j, i + k] += element_matrix[j, k]
-    return global_matrix
+        add_element_matrix(global_matrix, element_matrix, i)
+    return finish_assembly(global_matrix)
 
 
 def get_material_capacity(temp: float, index: int, structure: Structure, mesh_space: MeshSpace) -> float:
-    if structure.has_inner_steel and (index <= mesh_space.slice_index_steel_in):
-    # TODO: Rollback to: <
-        return steel_volumetric_heat_capacity(temp)
-    elif structure.has_outer_steel and (index >= mesh_space.slice_index_steel_out):
+    if mesh_space.material_field.element_material_ids[index] == MaterialField.MATERIAL_STEEL:
         return steel_volumetric_heat_capacity(temp)
     else:
         return concrete_volumetric_heat_capacity(temp, structure.density, structure.water_cont)
@@ -51,19 +51,96 @@ def get_material_capacity(temp: float, index: int, structure: Structure, mesh_sp
 def create_element_capacity_matrix(temp: float, index: int, structure: Structure, mesh_space: MeshSpace) -> npt.NDArray[np.float64]:
     material_capacity: float = get_material_capacity(temp, index, structure, mesh_space)
     element_from_zero: float = mesh_space.element_centers_from_zero[index]
-    element_matrix: npt.NDArray[np.float64] = element_from_zero * material_capacity * np.array([[1/3, 1/6], [1/6, 1/3]]) * mesh_space.element_length
+    element_matrix: npt.NDArray[np.float64] = element_from_zero * material_capacity * np.array([[1/3, 1/6], [1/6, 1/3]]) * mesh_space.element_lengths[index]
     return element_matrix
 
 
 def create_global_capac_mat(temp_vect: npt.NDArray[np.float64], mesh_space: MeshSpace, structure: Structure) -> npt.NDArray[np.float64]:
-    global_matrix: npt.NDArray[np.float64] = np.zeros((mesh_space.node_count, mesh_space.node_count))
+    global_matrix: npt.NDArray[np.float64] = init_empty_matrix(mesh_space.node_count)
     for i in range(mesh_space.element_count):
         elem_mean_temp = (float(temp_vect[i]) + float(temp_vect[i + 1])) / 2
         element_matrix = create_element_capacity_matrix(elem_mean_temp, i, structure, mesh_space)
-        for j in range(2):
-            for k in range(2):
-                global_matrix[i + j, i + k] += element_matrix[j, k]
-    return global_matrix
+        add_element_matrix(global_matrix, element_matrix, i)
+    return finish_assembly(global_matrix)
+
+
+def get_material_properties(
+        elem_temps: npt.NDArray[np.float64],
+        steel_mask: npt.NDArray[np.bool_],
+        structure: Structure) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    property_tables = get_material_property_tables(structure.density, structure.water_cont)
+    steel_temps = elem_temps[steel_mask]
+    concrete_temps = elem_temps[~steel_mask]
+    conductivities: npt.NDArray[np.float64] = np.empty(len(elem_temps))
+    capacities: npt.NDArray[np.float64] = np.empty(len(elem_temps))
+    conductivities[steel_mask] = property_tables.steel_conductivity(steel_temps)
+    conductivities[~steel_mask] = property_tables.concrete_conductivity(concrete_temps)
+    capacities[steel_mask] = property_tables.steel_volumetric_heat_capacity(steel_temps)
+    capacities[~steel_mask] = property_tables.concrete_volumetric_heat_capacity(concrete_temps)
+    return conductivities, capacities
+
+
+def get_material_property_slopes(
+        elem_temps: npt.NDArray[np.float64],
+        steel_mask: npt.NDArray[np.bool_],
+        structure: Structure) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    # Derivations of the conductivities and volumetric heat capacities with respect to the temperature
+    property_tables = get_material_property_tables(structure.density, structure.water_cont)
+    steel_temps = elem_temps[steel_mask]
+    concrete_temps = elem_temps[~steel_mask]
+    conductivity_slopes: npt.NDArray[np.float64] = np.empty(len(elem_temps))
+    capacity_slopes: npt.NDArray[np.float64] = np.empty(len(elem_temps))
+    conductivity_slopes[steel_mask] = property_tables.slope(property_tables.steel_conductivity, steel_temps)
+    conductivity_slopes[~steel_mask] = property_tables.slope(property_tables.concrete_conductivity, concrete_temps)
+    capacity_slopes[steel_mask] = property_tables.slope(property_tables.steel_volumetric_heat_capacity, steel_temps)
+    capacity_slopes[~steel_mask] = property_tables.slope(property_tables.concrete_volumetric_heat_capacity, concrete_temps)
+    return conductivity_slopes, capacity_slopes
+
+
+def create_global_matrices(temp_vect: npt.NDArray[np.float64], mesh_space: MeshSpace, structure: Structure) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    if ASSEMBLY == 0:
+        return create_global_conduc_mat(temp_vect, mesh_space, structure), create_global_capac_mat(temp_vect, mesh_space, structure)
+
+    # Properties of all elements are evaluated at once and the matrices are formed directly from their diagonals
+    element_lengths = mesh_space.element_lengths
+    elem_mean_temps = (temp_vect[:-1] + temp_vect[1:]) / 2
+    elem_from_zero = mesh_space.element_centers_from_zero
+    conductivities, capacities = get_material_properties(elem_mean_temps, mesh_space.material_field.element_steel_mask, structure)
+    elem_conduc = elem_from_zero * conductivities / element_lengths
+    elem_capac = elem_from_zero * capacities * element_lengths
+    conduc_mat = assemble_symmetric_matrix(elem_conduc, -elem_conduc)
+    capac_mat = assemble_symmetric_matrix(elem_capac / 3, elem_capac / 6)
+    return conduc_mat, capac_mat
+
+
+def get_surface_heat_transfer_coefs(temp_distr: npt.NDArray[np.float64], temp_gas_in: float, structure: Structure) -> tuple[float, float]:
+    # The coefficients are memoized, thus the flux vector and its derivation at the same temperatures share one evaluation
+    convection_coef_in = calc_surface_heat_transfer_coef_memoized(structure, temp_distr[0], temp_gas_in)
+    convection_coef_out = calc_surface_heat_transfer_coef_memoized(structure, temp_distr[-1], structure.temp_air_ext)
+    return convection_coef_in, convection_coef_out
+
+
+def get_flux_vect_and_deriv(
+        temp_distr: npt.NDArray[np.float64],
+        temp_gas_in: float,
+        structure: Structure,
+        mesh_space: MeshSpace) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    temp_surf_in: float = float(temp_distr[0])
+    temp_surf_out: float = float(temp_distr[-1])
+    convection_coef_in, convection_coef_out = get_surface_heat_transfer_coefs(temp_distr, temp_gas_in, structure)
+    radius_surf_in = mesh_space.element_centers_from_zero[0]
+    radius_surf_out = mesh_space.element_centers_from_zero[-1]
+    flux_vector: npt.NDArray[np.float64] = np.zeros(mesh_space.node_count)
+    flux_vector[0] = convection_coef_in * (temp_surf_in - temp_gas_in) * radius_surf_in
+    flux_vector[-1] = convection_coef_out * (temp_surf_out - structure.temp_air_ext) * radius_surf_out
+    if JACOBIAN == 1:
+        # The dependence of the coefficients on the surface temperatures is included
+        convection_coef_in = calc_surface_heat_flux_deriv_memoized(structure, temp_surf_in, temp_gas_in)
+        convection_coef_out = calc_surface_heat_flux_deriv_memoized(structure, temp_surf_out, structure.temp_air_ext)
+    flux_vector_deriv: npt.NDArray[np.float64] = np.zeros(mesh_space.node_count)
+    flux_vector_deriv[0] = convection_coef_in * radius_surf_in
+    flux_vector_deriv[-1] = convection_coef_out * radius_surf_out
+    return flux_vector, flux_vector_deriv
 
 
 def get_flux_vect(
@@ -71,29 +148,28 @@ def get_flux_vect(
         temp_gas_in: float,
         structure: Structure,
         mesh_space: MeshSpace) -> npt.NDArray[np.float64]:
-    temp_surf_in: float = float(temp_distr[0])
-    temp_surf_out: float = float(temp_distr[-1])
-    convection_coef_in = calc_surface_heat_transfer_coef(structure, temp_surf_in, temp_gas_in)
-    convection_coef_out = calc_surface_heat_transfer_coef(structure, temp_surf_out, structure.temp_air_ext)
-    convection_in = convection_coef_in * (temp_surf_in - temp_gas_in)
-    convection_out = convection_coef_out * (temp_surf_out - structure.temp_air_ext)
-    flux_vector: npt.NDArray[np.float64] = np.zeros(mesh_space.node_count)
-    flux_vector[0] = convection_in * mesh_space.element_centers_from_zero[0]
-    flux_vector[-1] = convection_out * mesh_space.element_centers_from_zero[-1]
-    return flux_vector
+    return get_flux_vect_and_deriv(temp_distr, temp_gas_in, structure, mesh_space)[0]
 
 
 def get_flux_vect_deriv(temp_distr: npt.NDArray[np.float64], temp_gas_in: float, structure: Structure, mesh_space: MeshSpace) -> npt.NDArray[np.float64]:
-    temp_surf_in: float = float(temp_distr[0])
-    temp_surf_out: float = float(temp_distr[-1])
-    convection_coef_in = calc_surface_heat_transfer_coef(structure, temp_surf_in, temp_gas_in)
-    convection_coef_out = calc_surface_heat_transfer_coef(structure, temp_surf_out, structure.temp_air_ext)
-    convection_in_deriv = convection_coef_in
-    convection_out_deriv = convection_coef_out
-    flux_vector_deriv: npt.NDArray[np.float64] = np.zeros(mesh_space.node_count)
-    flux_vector_deriv[0] = convection_in_deriv * mesh_space.element_centers_from_zero[0]
-    flux_vector_deriv[-1] = convection_out_deriv * mesh_space.element_centers_from_zero[-1]
-    return flux_vector_deriv
+    return get_flux_vect_and_deriv(temp_distr, temp_gas_in, structure, mesh_space)[1]
+
+
+def get_time_scheme(time_jump: float, prev_time_jump: Optional[float]) -> tuple[float, float, float, float]:
+    # The time derivative is approximated as (coef_ftr * T_ftr + coef_curr * T_curr + coef_prev * T_prev) / time_jump
+    # and the spatial terms are weighted as theta * (future terms) + (1 - theta) * (current terms).
+    # Returns a tuple (theta, coef_ftr, coef_curr, coef_prev).
+    if TIME_INTEGRATION == 1 and prev_time_jump is not None:
+        # BDF2 with variable time steps (the first time step is calculated by backward Euler)
+        ratio = time_jump / prev_time_jump
+        return 1, (1 + 2 * ratio) / (1 + ratio), -(1 + ratio), ratio * ratio / (1 + ratio)
+    return THETA, 1, -1, 0
+
+
+def get_time_scheme_order() -> int:
+    if TIME_INTEGRATION == 1 or THETA == 0.5:
+        return 2
+    return 1
 
 
 def get_residuum(
@@ -101,9 +177,14 @@ def get_residuum(
         capac_mat: npt.NDArray[np.float64],
         flux_vect: npt.NDArray[np.float64],
         ftr_temp_distr: npt.NDArray[np.float64],
-        curr_temp_distr: npt.NDArray[np.float64],
-        time_jump: float) -> npt.NDArray[np.float64]:
-    residuum: npt.NDArray[np.float64] = capac_mat.dot((ftr_temp_distr - curr_temp_distr) / time_jump) + conduc_mat.dot(ftr_temp_distr) + flux_vect
+        hist_temp_distr: npt.NDArray[np.float64],
+        explicit_vect: npt.NDArray[np.float64],
+        time_jump: float,
+        theta: float,
+        coef_ftr: float) -> npt.NDArray[np.float64]:
+    # hist_temp_distr contains the part of the time derivative given by the already known temperatures,
+    # explicit_vect contains the spatial terms of the current time step weighted by (1 - theta)
+    residuum: npt.NDArray[np.float64] = matrix_dot(capac_mat, (coef_ftr * ftr_temp_distr + hist_temp_distr) / time_jump) + theta * (matrix_dot(conduc_mat, ftr_temp_distr) + flux_vect) + explicit_vect
     return residuum
 
 
@@ -111,66 +192,377 @@ def get_residuum_deriv(
         conduc_mat: npt.NDArray[np.float64],
         capac_mat: npt.NDArray[np.float64],
         flux_vect_deriv: npt.NDArray[np.float64],
-        time_jump: float) -> npt.NDArray[np.float64]:
-    residuum_deriv: npt.NDArray[np.float64] = capac_mat / time_jump + conduc_mat + flux_vect_deriv
+        time_jump: float,
+        theta: float,
+        coef_ftr: float) -> npt.NDArray[np.float64]:
+    # The flux vector depends only on the surface temperatures, thus its derivative lies on the diagonal
+    residuum_deriv: npt.NDArray[np.float64] = add_to_diagonal(capac_mat * coef_ftr / time_jump + theta * conduc_mat, theta * flux_vect_deriv)
     return residuum_deriv
 
 
-def transient_heat_transfer(
+def add_material_residuum_deriv(
+        residuum_deriv: npt.NDArray[np.float64],
+        ftr_temp_distr: npt.NDArray[np.float64],
+        hist_temp_distr: npt.NDArray[np.float64],
+        time_jump: float,
+        theta: float,
+        coef_ftr: float,
+        structure: Structure,
+        mesh_space: MeshSpace) -> npt.NDArray[np.float64]:
+    # Adds the derivation of the residua with respect to the temperature-dependent material properties
+    # (the properties of an element depend on its mean temperature, i.e., half of the derivation goes to each of its nodes).
+    # The resulting matrix is tridiagonal but not symmetric.
+    element_lengths = mesh_space.element_lengths
+    elem_mean_temps = (ftr_temp_distr[:-1] + ftr_temp_distr[1:]) / 2
+    elem_from_zero = mesh_space.element_centers_from_zero
+    conductivity_slopes, capacity_slopes = get_material_property_slopes(elem_mean_temps, mesh_space.material_field.element_steel_mask, structure)
+
+    # Conductivity: the element residua are theta * r * k / L * (T_a - T_b) and the opposite value
+    conduc_term = theta * elem_from_zero * conductivity_slopes / element_lengths * (ftr_temp_distr[:-1] - ftr_temp_distr[1:]) / 2
+    # Capacity: the element residua are r * c * L * (U_a / 3 + U_b / 6) / time_jump and r * c * L * (U_a / 6 + U_b / 3) / time_jump
+    rate_vect = (coef_ftr * ftr_temp_distr + hist_temp_distr) / time_jump
+    capac_weight = elem_from_zero * capacity_slopes * element_lengths / 2
+    capac_term_a = capac_weight * (rate_vect[:-1] / 3 + rate_vect[1:] / 6)
+    capac_term_b = capac_weight * (rate_vect[:-1] / 6 + rate_vect[1:] / 3)
+
+    # Both terms of an element row are the same for the two nodes of the element
+    elem_row_a = conduc_term + capac_term_a
+    elem_row_b = capac_term_b - conduc_term
+    main_diag = np.zeros(mesh_space.node_count)
+    main_diag[:-1] += elem_row_a
+    main_diag[1:] += elem_row_b
+    return add_tridiagonal(residuum_deriv, main_diag, elem_row_a, elem_row_b)
+
+
+def extrapolate_temp_distr(
+        temp_rows: list[npt.NDArray[np.float64]],
+        time_points: list[float],
+        ftr_time: float) -> npt.NDArray[np.float64]:
+    # Lagrange extrapolation of the temperature distributions in the given time points to the future time
+    ftr_temp_distr: npt.NDArray[np.float64] = np.zeros(np.shape(temp_rows[0]))
+    for i in range(len(temp_rows)):
+        weight = 1.0
+        for j in range(len(temp_rows)):
+            if j != i:
+                weight *= (ftr_time - time_points[j]) / (time_points[i] - time_points[j])
+        ftr_temp_distr += weight * temp_rows[i]
+    return ftr_temp_distr
+
+
+def predict_ftr_temp_distr(
+        temp_rows: list[npt.NDArray[np.float64]],
+        time_points: list[float],
+        ftr_time: float) -> Optional[npt.NDArray[np.float64]]:
+    # Returns the first guess of the future temperatures extrapolated from the latest time steps (None if it is not extrapolated)
+    if PREDICTOR in (1, 2) and len(temp_rows) > PREDICTOR:
+        return extrapolate_temp_distr(list(temp_rows[-PREDICTOR - 1:]), list(time_points[-PREDICTOR - 1:]), ftr_time)
+    return None
+
+
+def get_predictor_error_factor() -> float:
+    # Ratio of the local error of the time scheme to the difference between the solution and the predictor of the same order
+    # (derived for constant time steps; the predictor of first-order schemes is linear, of second-order schemes quadratic)
+    if TIME_INTEGRATION == 1:
+        return 2 / 11
+    elif THETA == 0.5:
+        return 1 / 13
+    return abs(THETA - 0.5) / (THETA + 0.5)
+
+
+def calc_ftr_temp_distr(
+        curr_temp_distr: npt.NDArray[np.float64],
+        curr_temp_gas: float,
+        ftr_temp_gas: float,
+        time_jump: float,
+        structure: Structure,
+        mesh_space: MeshSpace,
+        jacobian_cache: dict,
+        prev_temp_distr: Optional[npt.NDArray[np.float64]] = None,
+        prev_time_jump: Optional[float] = None,
+        first_guess: Optional[npt.NDArray[np.float64]] = None) -> tuple[npt.NDArray[np.float64], tuple[int, int, float]]:
+    # Returns the future temperature distribution and the statistics of the Newton iteration (iterations, factorizations, final maximal residuum).
+    # jacobian_cache keeps the factorizations of the derivation of the residua for the modified Newton and chord methods between the calls.
+
+    # 1) Calculate the conductivity matrix and capacity matrix for the current temperatures
+    curr_conduc_mat, curr_capac_mat = create_global_matrices(curr_temp_distr, mesh_space, structure)
+
+    # 2) Calculate the parts of the residuum given by the already known temperatures
+    theta, coef_ftr, coef_curr, coef_prev = get_time_scheme(time_jump, prev_time_jump)
+    hist_temp_distr: npt.NDArray[np.float64] = coef_curr * curr_temp_distr
+    if coef_prev != 0:
+        hist_temp_distr = hist_temp_distr + coef_prev * prev_temp_distr
+    explicit_vect: npt.NDArray[np.float64] = np.zeros(mesh_space.node_count)
+    if theta != 1:
+        curr_flux_vect = get_flux_vect(curr_temp_distr, curr_temp_gas, structure, mesh_space)
+        explicit_vect = (1 - theta) * (matrix_dot(curr_conduc_mat, curr_temp_distr) + curr_flux_vect)
+
+    # 3) Create a first guess of the temperature distribution in the future time step
+    if first_guess is not None:
+        ftr_temp_distr: npt.NDArray[np.float64] = np.copy(first_guess)
+    elif PREDICTOR == 3:
+        # Explicit Euler over a half of the time step with the gas temperature of the future time step
+        temp_rate = -solve_linear_system(curr_capac_mat, matrix_dot(curr_conduc_mat, curr_temp_distr) + get_flux_vect(curr_temp_distr, ftr_temp_gas, structure, mesh_space))
+        ftr_temp_distr = curr_temp_distr + temp_rate * time_jump / 2
+    else:
+        ftr_temp_distr = np.copy(curr_temp_distr)
+
+    # 4) Calculate the flux vector in the future time step and the residua (errors) of the transient heat transfer matrix equation
+    # (the derivation of the flux vector is obtained from the same evaluation of the surface heat transfer coefficients).
+    # For the consistent Jacobian, the material properties of the future time step are evaluated for the iterated temperatures.
+    ftr_conduc_mat, ftr_capac_mat = curr_conduc_mat, curr_capac_mat
+    if JACOBIAN == 1:
+        ftr_conduc_mat, ftr_capac_mat = create_global_matrices(ftr_temp_distr, mesh_space, structure)
+    flux_vect, flux_vect_deriv = get_flux_vect_and_deriv(ftr_temp_distr, ftr_temp_gas, structure, mesh_space)
+    residuum_vect: npt.NDArray[np.float64] = get_residuum(ftr_conduc_mat, ftr_capac_mat, flux_vect, ftr_temp_distr, hist_temp_distr, explicit_vect, time_jump, theta, coef_ftr)
+    max_residuum: float = float(np.amax(np.absolute(residuum_vect)))
+    tolerance: float = max(NEWTON_TOLERANCE_ABS, NEWTON_TOLERANCE_REL * max_residuum)
+
+    # 5) Prepare the factorizations of the derivation of the residua which can be reused.
+    # The derivation depends on the time step, thus the factorizations are stored for each value of coef_ftr / time_jump.
+    time_coef = coef_ftr / time_jump
+    if NEWTON_METHOD == 2 or len(jacobian_cache) > 4:
+        jacobian_cache.clear()
+    iteration_count = 0
+    factorization_count = 0
+
+    # 6) If the error is large, we will make an adjustment to the temperatures in the future time step and recalculate the flux vector and the residua
+    while max_residuum > tolerance:
+        if iteration_count == NEWTON_MAX_ITERATIONS:
+            raise ArithmeticError('Newton iteration did not converge in ' + str(NEWTON_MAX_ITERATIONS) + ' iterations (maximal residuum ' + str(max_residuum) + ').')
+
+        # The derivation of the residua is recalculated in every iteration for the full Newton method, and only when needed for the other methods
+        if NEWTON_METHOD == 0 or time_coef not in jacobian_cache:
+            residuum_vect_deriv = get_residuum_deriv(ftr_conduc_mat, ftr_capac_mat, flux_vect_deriv, time_jump, theta, coef_ftr)
+            if JACOBIAN == 1:
+                residuum_vect_deriv = add_material_residuum_deriv(residuum_vect_deriv, ftr_temp_distr, hist_temp_distr, time_jump, theta, coef_ftr, structure, mesh_space)
+            factorization_count += 1
+            if NEWTON_METHOD != 0:
+                jacobian_cache[time_coef] = factorize_matrix(residuum_vect_deriv)
+        if NEWTON_METHOD == 0:
+            temp_corr = solve_linear_system(residuum_vect_deriv, residuum_vect)
+        else:
+            temp_corr = jacobian_cache[time_coef](residuum_vect)
+        ftr_temp_distr = ftr_temp_distr - temp_corr
+
+        if JACOBIAN == 1:
+            ftr_conduc_mat, ftr_capac_mat = create_global_matrices(ftr_temp_distr, mesh_space, structure)
+        flux_vect, flux_vect_deriv = get_flux_vect_and_deriv(ftr_temp_distr, ftr_temp_gas, structure, mesh_space)
+        residuum_vect = get_residuum(ftr_conduc_mat, ftr_capac_mat, flux_vect, ftr_temp_distr, hist_temp_distr, explicit_vect, time_jump, theta, coef_ftr)
+        prev_max_residuum = max_residuum
+        max_residuum = float(np.amax(np.absolute(residuum_vect)))
+        iteration_count += 1
+
+        # A reused factorization is discarded if it does not reduce the residua at least by half
+        if max_residuum > prev_max_residuum / 2:
+            jacobian_cache.pop(time_coef, None)
+
+    return ftr_temp_distr, (iteration_count, factorization_count, max_residuum)
+
+
+def iterate_fixed_steps_heat_transfer(
         structure: Structure,
         mesh_space: MeshSpace,
         mesh_time: MeshTime,
         loads: Loads,
-        results: Results) -> str:
-
-    try:
-
-        # In a given time step ("current step"), we calculate the temperature distribution for the next time step ("future time step") using the temperature distribution from the current time step.
-        for current_step in mesh_time.time_steps_range:
-
-            # 0) Print the progress
-            ftr_step = current_step + 1
-            ftr_time = mesh_time.time_axis[ftr_step]  # Time of the future time step
+        results: Results) -> Iterator[tuple[int, npt.NDArray[np.float64]]]:
+
+    # Generator of the transient heat transfer with fixed time steps: each future time step and its temperatures are yielded as soon as they are calculated,
+    # so that the following stages may process the rows while the next ones are calculated.
+    # The rows are saved into the temperature matrix unless only the summary of the results is stored (the time steps use only the latest rows).
+    # In a given time step ("current step"), we calculate the temperature distribution for the next time step ("future time step") using the temperature distribution from the current time step.
+    jacobian_cache: dict = {}
+    recent_temp_rows = [results.temp_oper]  # Temperature distributions in the latest time steps (at most three, see predict_ftr_temp_distr)
+    recent_times = [mesh_time.time_axis[0]]
+    for current_step in mesh_time.time_steps_range:
+
+        # Print the progress
+        ftr_step = current_step + 1
+        ftr_time = mesh_time.time_axis[ftr_step]  # Time of the future time step
+        if mesh_time.is_log_step(ftr_step):
             progress_percent = int(1000 * ftr_step / mesh_time.time_steps_count)/10
             double_print('Calculating temperatures for time: ' + str(ftr_time) + ' s (step ' + str(ftr_step) + ' out of ' + str(mesh_time.time_steps_count) + '; ' + str(progress_percent) + '%)')
-            # TODO: Set the print to show only every 1% of the progress. Currently it shows every step.
-            # TODO: Make the progress bar more wide.
+        # TODO: Make the progress bar more wide.
+
+        # Calculate and save the future temperature distribution into the temperature matrix
+        curr_temp_gas = loads.air_temp_history[current_step]  # Temperature of the inner gas in the current time step
+        ftr_temp_gas = loads.air_temp_history[ftr_step]  # Temperature of the inner gas in the future time step
+        if current_step > 0:
+            prev_temp_distr = recent_temp_rows[-2]
+            prev_time_jump = mesh_time.time_to_next_step(current_step - 1)
+        else:
+            prev_temp_distr = None
+            prev_time_jump = None
+        first_guess = predict_ftr_temp_distr(recent_temp_rows, recent_times, ftr_time)
+        ftr_temp_distr, newton_stats = calc_ftr_temp_distr(recent_temp_rows[-1], curr_temp_gas, ftr_temp_gas, mesh_time.time_to_next_step(current_step),
+                                                           structure, mesh_space, jacobian_cache, prev_temp_distr, prev_time_jump, first_guess)
+        if not results.summary_only:
+            results.temp_matrix[ftr_step] = ftr_temp_distr
+        results.newton_iterations_vect[ftr_step], results.newton_factorizations_vect[ftr_step], results.newton_residuum_vect[ftr_step] = newton_stats
+        recent_temp_rows = (recent_temp_rows + [ftr_temp_distr])[-3:]
+        recent_times = (recent_times + [ftr_time])[-3:]
+        yield ftr_step, ftr_temp_distr
+
+    results.time_axis = mesh_time.time_axis
+
+
+def fixed_steps_heat_transfer(
+        structure: Structure,
+        mesh_space: MeshSpace,
+        mesh_time: MeshTime,
+        loads: Loads,
+        results: Results) -> None:
 
-            # 1) Obtain the current temperatures and calculate the conductivity matrix and capacity matrix
-            curr_temp_distr: npt.NDArray[np.float64] = results.temp_matrix[current_step]
-            curr_conduc_mat: npt.NDArray[np.float64] = create_global_conduc_mat(curr_temp_distr, mesh_space, structure)
-            curr_capac_mat: npt.NDArray[np.float64] = create_global_capac_mat(curr_temp_distr, mesh_space, structure)
+    for _ in iterate_fixed_steps_heat_transfer(structure, mesh_space, mesh_time, loads, results):
+        pass
 
-            # 2) Create a first guess of the temperature distribution in the future time step
-            ftr_temp_distr: npt.NDArray[np.float64] = np.copy(curr_temp_distr)  #
+    return None
 
-            # 3) Calculate the flux vector and its derivative in the future time step
-            ftr_temp_gas = loads.get_current_air_temp(ftr_time)  # Temperature of the inner gas in the future time step
-            flux_vect: npt.NDArray[np.float64] = get_flux_vect(ftr_temp_distr, ftr_temp_gas, structure, mesh_space)
-            flux_vect_deriv: npt.NDArray[np.float64] = get_flux_vect_deriv(ftr_temp_distr, ftr_temp_gas, structure, mesh_space)
 
-            # 4) Calculate the residua (errors) of the transient heat transfer matrix equation and residua of its derivation
-            residuum_vect: npt.NDArray[np.float64] = get_residuum(curr_conduc_mat, curr_capac_mat, flux_vect, ftr_temp_distr, curr_temp_distr, mesh_time.time_to_next_step(current_step))
-            residuum_vect_deriv: npt.NDArray[np.float64] = get_residuum_deriv(curr_conduc_mat, curr_capac_mat, flux_vect_deriv, mesh_time.time_to_next_step(current_step))
-            max_residuum: float = np.amax(np.absolute(residuum_vect))
+def use_compiled_kernel() -> bool:
+    # The compiled kernel covers only the fixed time steps with the default formulation; otherwise (or without Numba), the NumPy implementation is used
+    if KERNEL != 1:
+        return False
+    if not NUMBA_AVAILABLE:
+        double_print('Numba is not installed, the transient heat transfer is calculated without the compiled kernel.')
+        return False
+    return JACOBIAN == 0 and NEWTON_METHOD == 0 and PREDICTOR != 3
 
-            # 5) If the error is large, we will make an adjustment to the temperatures in the future time step and recalculate the flux vector and its derivative
-            while max_residuum > (1 / 1000):
-                temp_corr = np.linalg.solve(residuum_vect_deriv, residuum_vect)
-                ftr_temp_distr = ftr_temp_distr - temp_corr
 
-                flux_vect = get_flux_vect(ftr_temp_distr, ftr_temp_gas, structure, mesh_space)
-                flux_vect_deriv = get_flux_vect_deriv(ftr_temp_distr, ftr_temp_gas, structure, mesh_space)
+def compiled_fixed_steps_heat_transfer(
+        structure: Structure,
+        mesh_space: MeshSpace,
+        mesh_time: MeshTime,
+        loads: Loads,
+        results: Results) -> None:
+    # Prepares the arrays for the compiled kernel, which fills the results directly (the first row of the temperature matrix contains the initial temperatures)
+    # Without the tables (MATERIAL_PROPERTIES = 0), the table range is empty and the kernel evaluates all properties exactly
+    property_tables = get_material_property_tables(structure.density, structure.water_cont)
+    if property_tables.tabulated:
+        temp_grid = property_tables.temp_grid
+        material_tables = np.array([property_tables.table_steel_conductivity, property_tables.table_concrete_conductivity,
+                                    property_tables.table_steel_capacity, property_tables.table_concrete_capacity])
+        table_temp_min, table_temp_max = property_tables.temp_min, property_tables.temp_max
+    else:
+        temp_grid = np.zeros(1)
+        material_tables = np.zeros((4, 1))
+        table_temp_min, table_temp_max = np.inf, -np.inf
+    elem_from_zero = mesh_space.element_centers_from_zero
+    time_axis = mesh_time.time_axis
+    double_print('Calculating temperatures for ' + str(mesh_time.time_steps_count) + ' time steps by the compiled kernel...')
+    failed_step = kernel_fixed_steps(results.temp_matrix, time_axis, loads.air_temp_history, float(structure.temp_air_ext), elem_from_zero, mesh_space.element_lengths,
+                                     float(elem_from_zero[0]), float(elem_from_zero[-1]), mesh_space.material_field.element_steel_mask,
+                                     temp_grid, material_tables, float(table_temp_min), float(table_temp_max), float(structure.density), float(structure.water_cont),
+                                     float(structure.char_len), float(structure.emissivity),
+                                     results.newton_iterations_vect, results.newton_residuum_vect)
+    if failed_step > 0:
+        raise ArithmeticError('Newton iteration did not converge in ' + str(NEWTON_MAX_ITERATIONS) + ' iterations (time step ' + str(failed_step) + ').')
+    results.newton_factorizations_vect[:] = results.newton_iterations_vect
+    results.time_axis = time_axis
+    return None
+
+
+def adaptive_steps_heat_transfer(
+        structure: Structure,
+        mesh_space: MeshSpace,
+        mesh_time: MeshTime,
+        loads: Loads,
+        results: Results) -> None:
+
+    # The error of each step is estimated either by step doubling, i.e., by comparing one full step with two half steps,
+    # or by comparing the solution with the predictor extrapolated from the previous steps (if enough steps are available).
+    # The local error of a time scheme of order p is proportional to time_jump ** (p + 1), which is used to adapt the next step.
+    scheme_order = get_time_scheme_order()
+    error_exponent = 1 / (scheme_order + 1)
+    jacobian_cache: dict = {}
+    time_axis: list[float] = [0.0]
+    temp_rows: list[npt.NDArray[np.float64]] = [results.temp_matrix[0]]
+    newton_stats_rows: list[tuple[int, int, float]] = [(0, 0, 0.0)]
+    time_jump: float = structure.step_time_1
+    # The number of steps is not known in advance, thus the progress is logged when the time reaches the next multiple of LOG_PERCENTAGE of the duration
+    logged_progress_level: int = -1
+    while time_axis[-1] < mesh_time.duration:
+        curr_time = time_axis[-1]
+        curr_temp_distr = temp_rows[-1]
+        time_jump = min(time_jump, ADAPTIVE_STEP_MAX, mesh_time.duration - curr_time)
+        if LOAD_BREAKPOINTS == 1:
+            # The step ends at the next turning point of the loads at the latest (so that the peaks are not stepped over)
+            time_jump = min(time_jump, loads.get_next_breakpoint(curr_time) - curr_time)
+        # The last step ends exactly at the duration (the sum of the times may differ from it by a rounding error)
+        ftr_time = mesh_time.duration if time_jump == mesh_time.duration - curr_time else curr_time + time_jump
+
+        # Calculate the future temperatures using one full step and two half steps
+        curr_temp_gas = loads.get_current_air_temp(curr_time)
+        half_temp_gas = loads.get_current_air_temp(curr_time + time_jump / 2)
+        ftr_temp_gas = loads.get_current_air_temp(ftr_time)
+        if len(temp_rows) > 1:
+            prev_temp_distr = temp_rows[-2]
+            prev_time_jump = curr_time - time_axis[-2]
+        else:
+            prev_temp_distr = None
+            prev_time_jump = None
+        try:
+            if ADAPTIVE_ERROR_ESTIMATE == 1 and len(temp_rows) > scheme_order:
+                predicted_temp_distr = extrapolate_temp_distr(temp_rows[-scheme_order - 1:], time_axis[-scheme_order - 1:], ftr_time)
+                ftr_temp_distr, newton_stats = calc_ftr_temp_distr(curr_temp_distr, curr_temp_gas, ftr_temp_gas, time_jump, structure, mesh_space, jacobian_cache, prev_temp_distr, prev_time_jump, predicted_temp_distr)
+                error = get_predictor_error_factor() * float(np.amax(np.absolute(ftr_temp_distr - predicted_temp_distr)))
+            else:
+                first_guess = predict_ftr_temp_distr(temp_rows, time_axis, ftr_time)
+                half_guess = predict_ftr_temp_distr(temp_rows, time_axis, curr_time + time_jump / 2)
+                ftr_temp_full, stats_full = calc_ftr_temp_distr(curr_temp_distr, curr_temp_gas, ftr_temp_gas, time_jump, structure, mesh_space, jacobian_cache, prev_temp_distr, prev_time_jump, first_guess)
+                half_temp_distr, stats_half_1 = calc_ftr_temp_distr(curr_temp_distr, curr_temp_gas, half_temp_gas, time_jump / 2, structure, mesh_space, jacobian_cache, prev_temp_distr, prev_time_jump, half_guess)
+                ftr_temp_distr, stats_half_2 = calc_ftr_temp_distr(half_temp_distr, half_temp_gas, ftr_temp_gas, time_jump / 2, structure, mesh_space, jacobian_cache, curr_temp_distr, time_jump / 2, ftr_temp_full)
+                newton_stats = (stats_full[0] + stats_half_1[0] + stats_half_2[0], stats_full[1] + stats_half_1[1] + stats_half_2[1], stats_half_2[2])
+                error = float(np.amax(np.absolute(ftr_temp_distr - ftr_temp_full)))
+        except ArithmeticError:
+            # If the Newton iteration does not converge, the step is repeated with a half time step
+            if time_jump <= ADAPTIVE_STEP_MIN:
+                raise
+            time_jump = max(ADAPTIVE_STEP_MIN, time_jump / 2)
+            continue
+
+        # Accept the step (with the more accurate result of two half steps in case of step doubling) if the error is small enough
+        if error <= ADAPTIVE_TOLERANCE or time_jump <= ADAPTIVE_STEP_MIN:
+            time_axis.append(ftr_time)
+            temp_rows.append(ftr_temp_distr)
+            newton_stats_rows.append(newton_stats)
+            progress_level = int(100 * ftr_time / mesh_time.duration / LOG_PERCENTAGE)
+            if progress_level > logged_progress_level:
+                logged_progress_level = progress_level
+                progress_percent = int(1000 * ftr_time / mesh_time.duration) / 10
+                double_print('Calculating temperatures for time: ' + str(round(ftr_time, 3)) + ' s (step ' + str(len(time_axis) - 1) + ', time step ' + str(round(time_jump, 3)) + ' s; ' + str(progress_percent) + '%)')
+
+        # Adapt the next time step (the growth and the reduction of the step are limited)
+        step_factor = 0.9 * (ADAPTIVE_TOLERANCE / error) ** error_exponent if error > 0 else 5
+        time_jump = max(ADAPTIVE_STEP_MIN, time_jump * min(5, max(0.2, step_factor)))
+
+    results.time_axis = np.array(time_axis)
+    results.temp_matrix = np.array(temp_rows)
+    results.newton_iterations_vect = np.array([stats[0] for stats in newton_stats_rows], dtype=int)
+    results.newton_factorizations_vect = np.array([stats[1] for stats in newton_stats_rows], dtype=int)
+    results.newton_residuum_vect = np.array([stats[2] for stats in newton_stats_rows], dtype=float)
+
+    return None
+
+
+def can_stream_heat_transfer() -> bool:
+    # Only the NumPy implementation with fixed time steps calculates the rows of the temperature matrix one by one in their final positions
+    return TIME_STEPPING == 0 and not use_compiled_kernel()
 
-                residuum_vect = get_residuum(curr_conduc_mat, curr_capac_mat, flux_vect, ftr_temp_distr, curr_temp_distr, mesh_time.time_to_next_step(current_step))
-                residuum_vect_deriv = get_residuum_deriv(curr_conduc_mat, curr_capac_mat, flux_vect_deriv, mesh_time.time_to_next_step(current_step))
-                max_residuum = np.amax(np.absolute(residuum_vect))
 
-            # 6) Save the final future temperature distribution into the temperature matrix
-            results.temp_matrix[current_step + 1] = ftr_temp_distr
+def transient_heat_transfer(
+        structure: Structure,
+        mesh_space: MeshSpace,
+        mesh_time: MeshTime,
+        loads: Loads,
+        results: Results) -> str:
 
-        # TODO: Simplify the algorithm by moving the first guess of the future temperature distribution to the beginning of the loop
-        # TODO: Modify the calculation (use sparse matrices) to improve the performance of the algorithm
+    try:
+        if TIME_STEPPING == 1:
+            adaptive_steps_heat_transfer(structure, mesh_space, mesh_time, loads, results)
+        elif use_compiled_kernel():
+            compiled_fixed_steps_heat_transfer(structure, mesh_space, mesh_time, loads, results)
+        else:
+            fixed_steps_heat_transfer(structure, mesh_space, mesh_time, loads, results)
 
         result_message = "Transient heat transfer calculated successfully."
 
@@ -178,6 +570,3 @@ def transient_heat_transfer(
         result_message = "Transient heat transfer calculation FAILED: " + str(exception)
 
     return result_message
-
-
-
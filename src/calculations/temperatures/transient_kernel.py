@@ -0,0 +1,222 @@
+'''
+This module contains the compiled kernel of the transient heat transfer with fixed time steps.
+
+The whole time loop (evaluation of the material properties, assembly of the tridiagonal matrices, flux vector,
+Newton iteration and the tridiagonal solve by the Thomas algorithm) is one function compiled by Numba, which fills the temperature matrix directly.
+Numba is an optional dependency: if it is not installed, NUMBA_AVAILABLE is False, the kernel functions remain plain Python functions,
+and the transient_heat_transfer module uses its NumPy implementation instead (see compiled_fixed_steps_heat_transfer there).
+
+The kernel solves the same equations as calc_ftr_temp_distr with JACOBIAN = 0 and full Newton (theta method or BDF2,
+first guess by copying or extrapolation). The material properties and the surface heat transfer coefficient are evaluated by the functions
+of the NumPy implementation, which are registered for the compiled code, so both implementations share the same formulas.
+The settings from config are compiled into the kernel as constants, thus the compiled kernel is not cached on disk (it is compiled on its first call in each run).
+'''
+
+from src.config import NEWTON_MAX_ITERATIONS, NEWTON_TOLERANCE_ABS, NEWTON_TOLERANCE_REL, TIME_INTEGRATION, THETA, PREDICTOR
+from src.calculations.temperatures.air_properties import calc_air_conductivity, calc_air_dyn_viscosity, calc_air_density, calc_air_heat_capacity
+from src.calculations.temperatures.surface_heat_transfer_coefficient import celsius_to_kelvin, calc_convection_numbers, calc_convective_coefficient, calc_heat_transfer_coef
+from src.calculations.temperatures.material_properties import steel_conductivity, concrete_conductivity, steel_volumetric_heat_capacity
+from src.calculations.temperatures.material_properties import concrete_density, concrete_specific_heat_capacity, concrete_volumetric_heat_capacity
+import numpy as np
+import numpy.typing as npt
+
+try:
+    from numba import njit
+    from numba.extending import register_jitable
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        # Without Numba, the decorated functions are kept as they are
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda function: function
+
+    def register_jitable(function):
+        return function
+
+# The scalar functions of the NumPy implementation can be called from the compiled functions
+for shared_function in (calc_air_conductivity, calc_air_dyn_viscosity, calc_air_density, calc_air_heat_capacity,
+                        celsius_to_kelvin, calc_convection_numbers, calc_convective_coefficient, calc_heat_transfer_coef,
+                        steel_conductivity, concrete_conductivity, steel_volumetric_heat_capacity,
+                        concrete_density, concrete_specific_heat_capacity, concrete_volumetric_heat_capacity):
+    register_jitable(shared_function)
+
+
+@njit
+def kernel_material_properties(
+        temp: float,
+        is_steel: bool,
+        temp_grid: npt.NDArray[np.float64],
+        material_tables: npt.NDArray[np.float64],
+        table_temp_min: float,
+        table_temp_max: float,
+        initial_density: float,
+        water_content: float) -> tuple:
+    # Returns the conductivity and the volumetric heat capacity; like in MaterialPropertyTables, the properties are interpolated
+    # from the tables (rows: steel conductivity, concrete conductivity, steel capacity, concrete capacity) inside their temperature range and exact otherwise
+    if table_temp_min <= temp <= table_temp_max:
+        material_row = 0 if is_steel else 1
+        return np.interp(temp, temp_grid, material_tables[material_row]), np.interp(temp, temp_grid, material_tables[material_row + 2])
+    if is_steel:
+        return steel_conductivity(temp), steel_volumetric_heat_capacity(temp)
+    return concrete_conductivity(temp), concrete_volumetric_heat_capacity(temp, initial_density, water_content)
+
+
+@njit
+def kernel_assemble(
+        temp_distr: npt.NDArray[np.float64],
+        elem_from_zero: npt.NDArray[np.float64],
+        element_lengths: npt.NDArray[np.float64],
+        steel_mask: npt.NDArray[np.bool_],
+        temp_grid: npt.NDArray[np.float64],
+        material_tables: npt.NDArray[np.float64],
+        table_temp_min: float,
+        table_temp_max: float,
+        initial_density: float,
+        water_content: float) -> tuple:
+    node_count = len(temp_distr)
+    conduc_diag = np.zeros(node_count)
+    capac_diag = np.zeros(node_count)
+    conduc_off = np.zeros(node_count - 1)
+    capac_off = np.zeros(node_count - 1)
+    for i in range(node_count - 1):
+        elem_temp = (temp_distr[i] + temp_distr[i + 1]) / 2
+        conductivity, capacity = kernel_material_properties(elem_temp, steel_mask[i], temp_grid, material_tables, table_temp_min, table_temp_max, initial_density, water_content)
+        elem_conduc = elem_from_zero[i] * conductivity / element_lengths[i]
+        elem_capac = elem_from_zero[i] * capacity * element_lengths[i]
+        conduc_diag[i] += elem_conduc
+        conduc_diag[i + 1] += elem_conduc
+        conduc_off[i] = -elem_conduc
+        capac_diag[i] += elem_capac / 3
+        capac_diag[i + 1] += elem_capac / 3
+        capac_off[i] = elem_capac / 6
+    return conduc_diag, conduc_off, capac_diag, capac_off
+
+
+@njit
+def kernel_tridiagonal_dot(main_diag: npt.NDArray[np.float64], off_diag: npt.NDArray[np.float64], vect: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    product = main_diag * vect
+    product[:-1] += off_diag * vect[1:]
+    product[1:] += off_diag * vect[:-1]
+    return product
+
+
+@njit
+def kernel_solve_tridiagonal(main_diag: npt.NDArray[np.float64], off_diag: npt.NDArray[np.float64], vect: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    # Thomas algorithm for a symmetric tridiagonal matrix (the matrices of the heat transfer are diagonally dominant)
+    node_count = len(vect)
+    upper = np.zeros(node_count)
+    rhs = np.zeros(node_count)
+    upper[0] = off_diag[0] / main_diag[0]
+    rhs[0] = vect[0] / main_diag[0]
+    for i in range(1, node_count):
+        denominator = main_diag[i] - off_diag[i - 1] * upper[i - 1]
+        if i < node_count - 1:
+            upper[i] = off_diag[i] / denominator
+        rhs[i] = (vect[i] - off_diag[i - 1] * rhs[i - 1]) / denominator
+    solution = np.zeros(node_count)
+    solution[-1] = rhs[-1]
+    for i in range(node_count - 2, -1, -1):
+        solution[i] = rhs[i] - upper[i] * solution[i + 1]
+    return solution
+
+
+@njit
+def kernel_flux(
+        temp_distr: npt.NDArray[np.float64],
+        temp_gas_in: float,
+        temp_air_ext: float,
+        radius_surf_in: float,
+        radius_surf_out: float,
+        char_len: float,
+        emissivity: float) -> tuple:
+    # Returns the flux vector and its derivation
+    flux_vect = np.zeros(len(temp_distr))
+    flux_vect_deriv = np.zeros(len(temp_distr))
+    convection_coef_in = calc_heat_transfer_coef(char_len, emissivity, temp_distr[0], temp_gas_in)
+    convection_coef_out = calc_heat_transfer_coef(char_len, emissivity, temp_distr[-1], temp_air_ext)
+    flux_vect[0] = convection_coef_in * (temp_distr[0] - temp_gas_in) * radius_surf_in
+    flux_vect[-1] = convection_coef_out * (temp_distr[-1] - temp_air_ext) * radius_surf_out
+    flux_vect_deriv[0] = convection_coef_in * radius_surf_in
+    flux_vect_deriv[-1] = convection_coef_out * radius_surf_out
+    return flux_vect, flux_vect_deriv
+
+
+@njit
+def kernel_fixed_steps(
+        temp_matrix: npt.NDArray[np.float64],
+        time_axis: npt.NDArray[np.float64],
+        temps_gas: npt.NDArray[np.float64],
+        temp_air_ext: float,
+        elem_from_zero: npt.NDArray[np.float64],
+        element_lengths: npt.NDArray[np.float64],
+        radius_surf_in: float,
+        radius_surf_out: float,
+        steel_mask: npt.NDArray[np.bool_],
+        temp_grid: npt.NDArray[np.float64],
+        material_tables: npt.NDArray[np.float64],
+        table_temp_min: float,
+        table_temp_max: float,
+        initial_density: float,
+        water_content: float,
+        char_len: float,
+        emissivity: float,
+        newton_iterations: npt.NDArray[np.int64],
+        newton_residua: npt.NDArray[np.float64]) -> int:
+    # Fills temp_matrix (its first row contains the initial temperatures) and the Newton statistics.
+    # Returns 0, or the number of the time step in which the Newton iteration did not converge.
+    for current_step in range(len(time_axis) - 1):
+        ftr_step = current_step + 1
+        time_jump = time_axis[ftr_step] - time_axis[current_step]
+        curr_temp_distr = temp_matrix[current_step]
+        conduc_diag, conduc_off, capac_diag, capac_off = kernel_assemble(curr_temp_distr, elem_from_zero, element_lengths, steel_mask, temp_grid, material_tables,
+                                                                         table_temp_min, table_temp_max, initial_density, water_content)
+
+        # Time scheme (see get_time_scheme)
+        theta, coef_ftr, coef_curr, coef_prev = THETA, 1.0, -1.0, 0.0
+        if TIME_INTEGRATION == 1 and current_step > 0:
+            ratio = time_jump / (time_axis[current_step] - time_axis[current_step - 1])
+            theta, coef_ftr, coef_curr, coef_prev = 1.0, (1 + 2 * ratio) / (1 + ratio), -(1 + ratio), ratio * ratio / (1 + ratio)
+        hist_temp_distr = coef_curr * curr_temp_distr
+        if coef_prev != 0:
+            hist_temp_distr = hist_temp_distr + coef_prev * temp_matrix[current_step - 1]
+        explicit_vect = np.zeros(len(curr_temp_distr))
+        if theta != 1:
+            curr_flux_vect = kernel_flux(curr_temp_distr, temps_gas[current_step], temp_air_ext, radius_surf_in, radius_surf_out, char_len, emissivity)[0]
+            explicit_vect = (1 - theta) * (kernel_tridiagonal_dot(conduc_diag, conduc_off, curr_temp_distr) + curr_flux_vect)
+
+        # First guess (see predict_ftr_temp_distr)
+        ftr_temp_distr = np.copy(curr_temp_distr)
+        if (PREDICTOR == 1 or PREDICTOR == 2) and ftr_step > PREDICTOR:
+            ftr_temp_distr = np.zeros(len(curr_temp_distr))
+            for i in range(ftr_step - PREDICTOR - 1, ftr_step):
+                weight = 1.0
+                for j in range(ftr_step - PREDICTOR - 1, ftr_step):
+                    if j != i:
+                        weight *= (time_axis[ftr_step] - time_axis[j]) / (time_axis[i] - time_axis[j])
+                ftr_temp_distr += weight * temp_matrix[i]
+
+        # Newton iteration
+        deriv_off = capac_off * coef_ftr / time_jump + theta * conduc_off
+        flux_vect, flux_vect_deriv = kernel_flux(ftr_temp_distr, temps_gas[ftr_step], temp_air_ext, radius_surf_in, radius_surf_out, char_len, emissivity)
+        residuum_vect = kernel_tridiagonal_dot(capac_diag, capac_off, (coef_ftr * ftr_temp_distr + hist_temp_distr) / time_jump) + theta * (kernel_tridiagonal_dot(conduc_diag, conduc_off, ftr_temp_distr) + flux_vect) + explicit_vect
+        max_residuum = np.amax(np.absolute(residuum_vect))
+        tolerance = max(NEWTON_TOLERANCE_ABS, NEWTON_TOLERANCE_REL * max_residuum)
+        iteration_count = 0
+        while max_residuum > tolerance:
+            if iteration_count == NEWTON_MAX_ITERATIONS:
+                return ftr_step
+            deriv_diag = capac_diag * coef_ftr / time_jump + theta * (conduc_diag + flux_vect_deriv)
+            ftr_temp_distr = ftr_temp_distr - kernel_solve_tridiagonal(deriv_diag, deriv_off, residuum_vect)
+            flux_vect, flux_vect_deriv = kernel_flux(ftr_temp_distr, temps_gas[ftr_step], temp_air_ext, radius_surf_in, radius_surf_out, char_len, emissivity)
+            residuum_vect = kernel_tridiagonal_dot(capac_diag, capac_off, (coef_ftr * ftr_temp_distr + hist_temp_distr) / time_jump) + theta * (kernel_tridiagonal_dot(conduc_diag, conduc_off, ftr_temp_distr) + flux_vect) + explicit_vect
+            max_residuum = np.amax(np.absolute(residuum_vect))
+            iteration_count += 1
+
+        temp_matrix[ftr_step] = ftr_temp_distr
+        newton_iterations[ftr_step] = iteration_count
+        newton_residua[ftr_step] = max_residuum
+    return 0
+
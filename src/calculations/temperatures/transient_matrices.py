@@ -1 +1,127 @@
-import os
\ No newline at end of file
+'''
+This module contains functions for operations with the matrices of the transient heat transfer.
+
+Depending on LINEAR_SOLVER, the matrices are stored as dense (node_count x node_count) arrays,
+as banded arrays in the diagonal ordered form used by scipy.linalg.solve_banded,
+or as scipy.sparse matrices (memory linear in node_count) solved by a sparse direct solver.
+The banded form is a (3 x node_count) array with the upper diagonal in the first row (shifted by one to the right),
+the main diagonal in the second row, and the lower diagonal in the third row (shifted by one to the left).
+'''
+
+from src.config import LINEAR_SOLVER
+import numpy as np
+import numpy.typing as npt
+from scipy.linalg import solve_banded, lu_factor, lu_solve
+from scipy.linalg.lapack import dgttrf, dgttrs
+import scipy.sparse as sparse
+from scipy.sparse.linalg import spsolve, splu
+from typing import Callable
+
+
+def init_empty_matrix(node_count: int) -> npt.NDArray[np.float64]:
+    if LINEAR_SOLVER == 0:
+        return np.zeros((node_count, node_count))
+    elif LINEAR_SOLVER == 2:
+        return sparse.lil_matrix((node_count, node_count))
+    else:
+        return np.zeros((3, node_count))
+
+
+def add_element_matrix(global_matrix: npt.NDArray[np.float64], element_matrix: npt.NDArray[np.float64], index: int) -> None:
+    # Element with the given index connects nodes index and index + 1
+    if LINEAR_SOLVER == 0:
+        global_matrix[index:index + 2, index:index + 2] += element_matrix
+    elif LINEAR_SOLVER == 2:
+        global_matrix[index:index + 2, index:index + 2] = global_matrix[index:index + 2, index:index + 2].toarray() + element_matrix
+    else:
+        global_matrix[1, index] += element_matrix[0, 0]
+        global_matrix[0, index + 1] += element_matrix[0, 1]
+        global_matrix[2, index] += element_matrix[1, 0]
+        global_matrix[1, index + 1] += element_matrix[1, 1]
+
+
+def finish_assembly(global_matrix: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    # The sparse matrix is assembled element by element in the LIL format, which is slow for arithmetic and solving,
+    # thus it is converted to the CSC format once the assembly is finished
+    if LINEAR_SOLVER == 2:
+        return sparse.csc_matrix(global_matrix)
+    return global_matrix
+
+
+def assemble_symmetric_matrix(element_diag: npt.NDArray[np.float64], element_off_diag: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    # Element matrices are [[element_diag, element_off_diag], [element_off_diag, element_diag]] for each element
+    main_diag = np.zeros(len(element_diag) + 1)
+    main_diag[:-1] += element_diag
+    main_diag[1:] += element_diag
+    if LINEAR_SOLVER == 0:
+        return np.diag(main_diag) + np.diag(element_off_diag, 1) + np.diag(element_off_diag, -1)
+    elif LINEAR_SOLVER == 2:
+        return sparse.diags([element_off_diag, main_diag, element_off_diag], [-1, 0, 1], format='csc')
+    else:
+        global_matrix = np.zeros((3, len(main_diag)))
+        global_matrix[0, 1:] = element_off_diag
+        global_matrix[1] = main_diag
+        global_matrix[2, :-1] = element_off_diag
+        return global_matrix
+
+
+def add_to_diagonal(matrix: npt.NDArray[np.float64], vect: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    if LINEAR_SOLVER == 0:
+        return matrix + np.diag(vect)
+    elif LINEAR_SOLVER == 2:
+        return sparse.csc_matrix(matrix + sparse.diags(vect))
+    else:
+        matrix_sum = np.copy(matrix)
+        matrix_sum[1] += vect
+        return matrix_sum
+
+
+
+def add_tridiagonal(
+        matrix: npt.NDArray[np.float64],
+        main_diag: npt.NDArray[np.float64],
+        upper_diag: npt.NDArray[np.float64],
+        lower_diag: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    # Adds a (generally non-symmetric) tridiagonal matrix given by its diagonals (upper and lower diagonals are shorter by one)
+    if LINEAR_SOLVER == 0:
+        return matrix + np.diag(main_diag) + np.diag(upper_diag, 1) + np.diag(lower_diag, -1)
+    elif LINEAR_SOLVER == 2:
+        return sparse.csc_matrix(matrix + sparse.diags([lower_diag, main_diag, upper_diag], [-1, 0, 1]))
+    else:
+        matrix_sum = np.copy(matrix)
+        matrix_sum[0, 1:] += upper_diag
+        matrix_sum[1] += main_diag
+        matrix_sum[2, :-1] += lower_diag
+        return matrix_sum
+
+def matrix_dot(matrix: npt.NDArray[np.float64], vect: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    if LINEAR_SOLVER in (0, 2):
+        return matrix.dot(vect)
+    else:
+        product = matrix[1] * vect
+        product[:-1] += matrix[0, 1:] * vect[1:]
+        product[1:] += matrix[2, :-1] * vect[:-1]
+        return product
+
+
+def solve_linear_system(matrix: npt.NDArray[np.float64], vect: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    if LINEAR_SOLVER == 0:
+        return np.linalg.solve(matrix, vect)
+    elif LINEAR_SOLVER == 2:
+        return spsolve(matrix, vect)
+    else:
+        return solve_banded((1, 1), matrix, vect, check_finite=False)
+
+
+def factorize_matrix(matrix: npt.NDArray[np.float64]) -> Callable[[npt.NDArray[np.float64]], npt.NDArray[np.float64]]:
+    # Returns a function solving the linear system with the given matrix, so that the factorization can be reused
+    if LINEAR_SOLVER == 0:
+        lu_and_piv = lu_factor(matrix, check_finite=False)
+        return lambda vect: lu_solve(lu_and_piv, vect, check_finite=False)
+    elif LINEAR_SOLVER == 2:
+        return splu(sparse.csc_matrix(matrix)).solve
+    else:
+        lower_diag, main_diag, upper_diag, upper_diag_2, pivots, info = dgttrf(matrix[2, :-1], matrix[1], matrix[0, 1:])
+        if info > 0:
+            raise ArithmeticError('Jacobian matrix is singular.')
+        return lambda vect: dgttrs(lower_diag, main_diag, upper_diag, upper_diag_2, pivots, vect)[0]
@@ -22,3 +22,45 @@ SOURCE_DATA_FOLDER_PATH = 'source_data/'  # Path to the folder with the source d
 
 TEMP_EVOL_FILE: str = 'temperature_evolution.xlsx'  # Name of the file with the temperature evolution data
 PRES_EVOL_FILE: str = 'pressure_evolution.xlsx'  # Name of the file with the pressure evolution data
+CURVE_CACHE = 1  # Should the parsed evolution files be cached in binary files? 0 no; 1 yes (the cache is renewed whenever the evolution file changes)
+CURVE_CACHE_FOLDER_PATH = 'source_data/cache/'  # Path to the folder with the cached evolution files
+LOAD_BREAKPOINTS = 0  # Should the turning points (peaks) of the load curves be kept in the time axis? 0 no (loads sampled only at the time steps); 1 yes (inserted into the fixed time axis; not stepped over by adaptive time stepping)
+
+LINEAR_SOLVER = 1  # Which solver should be used for the transient heat transfer matrices? 0 dense; 1 banded (tridiagonal); 2 sparse
+
+ASSEMBLY = 1  # How should the transient heat transfer matrices be assembled? 0 element by element; 1 vectorized for all elements at once
+
+TIME_STEPPING = 0  # How should the time steps be chosen? 0 fixed steps given for the LOCA phases; 1 adaptive steps controlled by the estimate of the local error
+ADAPTIVE_TOLERANCE = 0.05  # Maximal local error of temperatures (in Celsius) in one time step of the adaptive time stepping
+ADAPTIVE_STEP_MIN = 0.01  # Minimal time step of the adaptive time stepping in seconds
+ADAPTIVE_STEP_MAX = 3600  # Maximal time step of the adaptive time stepping in seconds
+
+TIME_INTEGRATION = 0  # Which time integration scheme should be used? 0 theta method; 1 BDF2 (second-order backward differentiation formula)
+THETA = 1  # Weight of the future time step in the theta method. 1 backward Euler; 0.5 Crank-Nicolson
+
+NEWTON_METHOD = 0  # Which method should be used for the nonlinear transient heat transfer? 0 full Newton; 1 modified Newton (factorization reused across iterations and steps); 2 chord method (factorization reused within a step)
+NEWTON_MAX_ITERATIONS = 50  # Maximal number of iterations of the nonlinear solver in one time step
+NEWTON_TOLERANCE_ABS = 1e-3  # Absolute tolerance of the maximal residuum of the nonlinear solver
+NEWTON_TOLERANCE_REL = 0  # Tolerance of the maximal residuum relative to the residuum of the first guess (0 means only the absolute tolerance is used)
+
+PREDICTOR = 0  # How should the first guess of the future temperatures be obtained? 0 current temperatures; 1 linear extrapolation; 2 quadratic extrapolation; 3 explicit half step
+ADAPTIVE_ERROR_ESTIMATE = 0  # How should the local error be estimated in the adaptive time stepping? 0 step doubling; 1 difference between the solution and the extrapolated predictor
+
+MATERIAL_PROPERTIES = 0  # How should the material properties be evaluated in the transient heat transfer? 0 exactly for each temperature; 1 interpolated from tables precomputed on a fine temperature grid
+MATERIAL_TABLE_STEP = 0.1  # Temperature step (in Celsius) of the precomputed tables of material properties
+HEAT_COEF_CACHE_SIZE = 4096  # Maximal number of memoized surface heat transfer coefficients (pairs of surface and air temperatures); 0 disables the memoization
+STRESS_PROFILE_CACHE_SIZE = 16  # Maximal number of geometries whose stress profiles for unit loads (internal pressure and prestressing) are kept in memory
+STRESS_STAGE = 1  # How should the stresses be calculated? 0 stage by stage (thermal, internal pressure, prestressing, total) for all time steps at once; 1 all stages fused in blocks of time steps (always used with RESULT_PRECISION = 1)
+STRESS_BLOCK_STEPS = 256  # Number of time steps calculated at once by the fused stress stage (STRESS_STAGE = 1) and by the streamed stress stage (STRESS_STREAMING = 1)
+STRESS_STREAMING = 0  # Should the stresses be calculated concurrently with the transient heat transfer? 0 no (after the transient heat transfer); 1 yes (in a worker thread, block by block as the temperatures are calculated; only for fixed time steps without the compiled kernel, otherwise 0 is used)
+RESULT_PRECISION = 0  # In which precision should the space-time matrices of the strains and stresses be stored? 0 double (float64); 1 single (float32; halves their memory and CSV files, the stresses are still calculated in float64 and the temperatures are kept in float64)
+SUMMARY_ONLY = 0  # Which results should be stored? 0 all (including the space-time matrices of temperatures, strains and stresses); 1 only the summary (time evolutions, extreme steps, and distributions in the extreme steps; requires STRESS_STREAMING = 1 and is not used otherwise; no GIF animation)
+JACOBIAN = 0  # How should the derivation of the residua be formed in the Newton iteration? 0 material properties frozen at the beginning of the time step and surface heat transfer coefficients taken as constant; 1 consistent (material properties evaluated at the iterated temperatures and derivations of all coefficients included; the derivations of the material properties are central differences over MATERIAL_TABLE_STEP, also for MATERIAL_PROPERTIES = 0)
+KERNEL = 0  # How should the transient heat transfer with fixed time steps be calculated? 0 NumPy implementation; 1 compiled kernel (requires Numba, JACOBIAN = 0, NEWTON_METHOD = 0 and PREDICTOR other than 3, otherwise 0 is used)
+# The batched transient heat transfer of several scenarios (run_batch_analysis) always uses fixed time steps, the full Newton method with the formulation of JACOBIAN = 0,
+# the vectorized banded solver and the NumPy implementation, i.e., it ignores LINEAR_SOLVER, ASSEMBLY, JACOBIAN, NEWTON_METHOD, TIME_STEPPING, KERNEL, STRESS_STREAMING and SUMMARY_ONLY (PREDICTOR = 3 falls back to 0)
+
+MESH_GRADING = 0  # How should the spatial mesh be created? 0 uniform elements of length step_space; 1 uniform elements in each layer (steel/concrete interfaces lie on nodes); 2 concrete elements growing geometrically from step_space at the inner surface of concrete (steel/concrete interfaces lie on nodes)
+MESH_GRADING_RATIO = 1.15  # Ratio of lengths of neighbouring concrete elements for MESH_GRADING = 2
+MESH_ELEMENT_MAX = 0.05  # Maximal length (in meters) of concrete elements for MESH_GRADING = 2
+MESH_STEEL_STEP = 0.002  # Maximal length (in meters) of steel elements for MESH_GRADING = 1 and 2
@@ -2,15 +2,20 @@ from src.models import Structure, MeshSpace, MeshTime, Results, Loads
 from src.calculations.temperatures.steadystate_heat_transfer import calc_operating_temperatures
 from src.calculations.temperatures.surface_heat_transfer_coefficient import calc_surface_resistance
 import numpy as np
-from src.calculations.temperatures.transient_heat_transfer import transient_heat_transfer
+from src.calculations.temperatures.transient_heat_transfer import transient_heat_transfer, can_stream_heat_transfer
+from src.calculations.temperatures.batched_heat_transfer import batched_transient_heat_transfer
 from src.general_functions import double_print
+from src.config import TIME_STEPPING, TEMP_EVOL_FILE, PRES_EVOL_FILE, STRESS_STAGE, STRESS_STREAMING, SUMMARY_ONLY, RESULT_PRECISION
 from src.calculations.stresses.thermal_stresses import calc_thermal_stresses
 from src.calculations.stresses.internal_pressure_stresses import calculate_pressure_stresses
 from src.calculations.stresses.prestressing_stresses import calc_circumferential_stress
 from src.calculations.stresses.total_stresses import sum_all_stresses
+from src.calculations.stresses.fused_stresses import calc_all_stresses
+from src.calculations.stresses.streamed_stresses import stream_heat_transfer_and_stresses
 from src.calculations.outputs.data_files import save_results_into_csv
 from src.calculations.outputs.figures.plotting_controller import plot_all_figures
 from src.calculations.outputs.result_processing import process_results
+from typing import Optional
 
 
 # Define the function that will be called from the GUI
@@ -22,13 +27,15 @@ def run_analysis(gui_inputs):
         # Prepare the data for the analysis
         structure = Structure(gui_inputs)
         mesh_space = MeshSpace(structure)
-        mesh_time = MeshTime(structure)
 
-        # Initialize the loads object
+        # Initialize the loads object and evaluate the load histories for the time mesh
         loads = Loads(structure)
+        mesh_time = MeshTime(structure, breakpoints=loads.time_breakpoints)
+        loads.evaluate_histories(mesh_time)
 
-        # Initialize the results object
-        results = Results(mesh_space, mesh_time)
+        # Initialize the results object (only the summary of the results is stored if the stresses are streamed)
+        stream_stresses = STRESS_STREAMING == 1 and can_stream_heat_transfer()
+        results = Results(mesh_space, mesh_time, summary_only=stream_stresses and SUMMARY_ONLY == 1)
 
         results.analysis_identifier = str(int(structure.temp_air_int)) + 'C_' + str(int(structure.duration)) + 's_' + str(int(structure.tendons_stress)) + 'MPa'
 
@@ -41,22 +48,60 @@ def run_analysis(gui_inputs):
         results.temp_oper = calc_operating_temperatures(structure, mesh_space)
 
         # Fill results from time_step = 0 (i.e., operating temperatures)
-        # TODO: Refactor this part (make it a separate function)
-        results.temp_air_int_vect[0] = loads.temp_air_int_0
-        results.pres_air_int_vect[0] = loads.get_current_air_pres(0)
-        results.temp_grad_vect[0] = (float(results.temp_oper[0]) - float(results.temp_oper[-1]))
-        results.heat_coef_int_vect[0] = 1 / calc_surface_resistance(structure, float(results.temp_oper[0]), loads.temp_air_int_0)
-        results.heat_coef_ext_vect[0] = 1 / calc_surface_resistance(structure, float(results.temp_oper[-1]), loads.temp_air_ext_0)
-        results.temp_matrix[0] = results.temp_oper
+        fill_initial_results(structure, loads, results)
         # print(results.temp_matrix[0])
         # print(results.temp_matrix[1])
 
         print(mesh_space.slice_index_steel_out)
         print(np.zeros(mesh_space.slice_index_steel_out))
 
-        double_print('Calculation of transient heat transfer started.')
-        double_print(transient_heat_transfer(structure, mesh_space, mesh_time, loads, results))
+        if stream_stresses:
+            # The stresses are calculated in a worker thread while the transient heat transfer continues
+            double_print('Calculation of transient heat transfer and stresses started.')
+            for result_message in stream_heat_transfer_and_stresses(structure, mesh_space, mesh_time, loads, results):
+                double_print(result_message)
+        else:
+            double_print('Calculation of transient heat transfer started.')
+            double_print(transient_heat_transfer(structure, mesh_space, mesh_time, loads, results))
+
+            # With adaptive time stepping, the time axis is known only after the transient heat transfer is calculated
+            if TIME_STEPPING == 1:
+                mesh_time = MeshTime(structure, results.time_axis)
+                results.resize_time_fields(mesh_space, mesh_time)
+                loads.evaluate_histories(mesh_time)
+
+            calc_stresses(structure, mesh_space, mesh_time, loads, results)
+
+        calc_outputs(structure, mesh_space, mesh_time, results)
+
+        # TODO: Print graphs
+
+        double_print('Python function finished.')
+
+        return 0
+    except (FileNotFoundError, ValueError) as exception:
+        error_message = str(exception)
+        print(error_message)
+        return error_message
+
 
+def fill_initial_results(structure: Structure, loads: Loads, results: Results) -> None:
+    # Fills the results in time_step = 0 (i.e., operating temperatures)
+    results.temp_air_int_vect[0] = loads.temp_air_int_0
+    results.pres_air_int_vect[0] = loads.get_current_air_pres(0)
+    results.temp_grad_vect[0] = (float(results.temp_oper[0]) - float(results.temp_oper[-1]))
+    results.heat_coef_int_vect[0] = 1 / calc_surface_resistance(structure, float(results.temp_oper[0]), loads.temp_air_int_0)
+    results.heat_coef_ext_vect[0] = 1 / calc_surface_resistance(structure, float(results.temp_oper[-1]), loads.temp_air_ext_0)
+    if not results.summary_only:
+        results.temp_matrix[0] = results.temp_oper
+
+
+def calc_stresses(structure: Structure, mesh_space: MeshSpace, mesh_time: MeshTime, loads: Loads, results: Results) -> None:
+    # All stresses for the calculated temperatures (only the fused stage calculates them in double precision if the results are stored in single precision)
+    if STRESS_STAGE == 1 or RESULT_PRECISION == 1:
+        double_print('Calculation of stresses started.')
+        double_print(calc_all_stresses(structure, mesh_space, mesh_time, loads, results))
+    else:
         double_print('Calculation of thermal stresses started.')
         double_print(calc_thermal_stresses(structure, mesh_space, mesh_time, loads, results))
 
@@ -69,22 +114,71 @@ def run_analysis(gui_inputs):
         double_print('Calculation of total stresses started.')
         double_print(sum_all_stresses(results))
 
-        double_print('Processing of results started.')
-        double_print(process_results(structure, mesh_space, results))
 
-        # Save the results into CSV files
-        double_print('Saving results into CSV files...')
-        double_print(save_results_into_csv(results))
+def calc_outputs(structure: Structure, mesh_space: MeshSpace, mesh_time: MeshTime, results: Results) -> None:
+    # Everything that follows the stresses: processing, CSV files and figures
+    double_print('Processing of results started.')
+    double_print(process_results(structure, mesh_space, results))
 
-        # Print the graphs
-        plot_all_figures(structure, results, mesh_space, mesh_time)
+    # Save the results into CSV files
+    double_print('Saving results into CSV files...')
+    double_print(save_results_into_csv(results))
 
-        # TODO: Print graphs
+    # Print the graphs
+    plot_all_figures(structure, results, mesh_space, mesh_time)
 
-        double_print('Python function finished.')
+
+def calc_stresses_and_outputs(structure: Structure, mesh_space: MeshSpace, mesh_time: MeshTime, loads: Loads, results: Results) -> None:
+    # Everything that follows the transient heat transfer: stresses, processing, CSV files and figures
+    calc_stresses(structure, mesh_space, mesh_time, loads, results)
+    calc_outputs(structure, mesh_space, mesh_time, results)
+
+
+def check_batch_structures(structure_list: list[Structure]) -> None:
+    # Scenarios of one batch may differ only in the temperatures (and in the evolution files of the loads)
+    shared_attributes = [attribute for attribute in vars(structure_list[0]) if attribute not in ('temp_init', 'temp_air_int', 'temp_air_ext')]
+    for structure in structure_list[1:]:
+        for attribute in shared_attributes:
+            if getattr(structure, attribute) != getattr(structure_list[0], attribute):
+                raise ValueError('ERROR: Scenarios of one batch must share the wall and the time mesh (they differ in ' + attribute + ').')
+
+
+# Run several scenarios of the same wall with the batched transient heat transfer (the rest of the analysis is run for each scenario)
+def run_batch_analysis(gui_inputs_list: list[dict], evolution_files: Optional[list[tuple[str, str]]] = None):
+    # evolution_files contains a tuple (temperature evolution file, pressure evolution file) for each scenario
+    try:
+        double_print('Batch analysis of ' + str(len(gui_inputs_list)) + ' scenarios started.')
+        if evolution_files is None:
+            evolution_files = [(TEMP_EVOL_FILE, PRES_EVOL_FILE)] * len(gui_inputs_list)
+
+        # Prepare the data for the analysis (the mesh is shared by all scenarios)
+        structure_list = [Structure(gui_inputs) for gui_inputs in gui_inputs_list]
+        check_batch_structures(structure_list)
+        mesh_space = MeshSpace(structure_list[0])
+        loads_list = [Loads(structure, temp_evol_file, pres_evol_file) for structure, (temp_evol_file, pres_evol_file) in zip(structure_list, evolution_files)]
+        mesh_time = MeshTime(structure_list[0], breakpoints=np.unique(np.concatenate([loads.time_breakpoints for loads in loads_list])))
+        for loads in loads_list:
+            loads.evaluate_histories(mesh_time)
+        results_list = []
+        for scenario_index, (structure, loads) in enumerate(zip(structure_list, loads_list)):
+            results = Results(mesh_space, mesh_time)
+            results.analysis_identifier = str(int(structure.temp_air_int)) + 'C_' + str(int(structure.duration)) + 's_' + str(int(structure.tendons_stress)) + 'MPa_scenario_' + str(scenario_index + 1)
+            results.temp_init = np.full(mesh_space.node_count, structure.temp_init, dtype=float)
+            results.temp_oper = calc_operating_temperatures(structure, mesh_space)
+            fill_initial_results(structure, loads, results)
+            results_list.append(results)
+
+        double_print('Calculation of transient heat transfer started.')
+        double_print(batched_transient_heat_transfer(structure_list, mesh_space, mesh_time, loads_list, results_list))
+
+        for scenario_index, (structure, loads, results) in enumerate(zip(structure_list, loads_list, results_list)):
+            double_print('Scenario ' + str(scenario_index + 1) + ' out of ' + str(len(results_list)) + ':')
+            calc_stresses_and_outputs(structure, mesh_space, mesh_time, loads, results)
+
+        double_print('Batch analysis finished.')
 
         return 0
-    except FileNotFoundError as exception:
+    except (FileNotFoundError, ValueError) as exception:
         error_message = str(exception)
         print(error_message)
         return error_message
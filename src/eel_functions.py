@@ -1,5 +1,5 @@
 import eel
-from src.controllers import run_analysis
+from src.controllers import run_analysis, run_batch_analysis
 
 
 @eel.expose
@@ -7,3 +7,10 @@ def get_python_result(gui_inputs):
     eel.print_status('Progress: Python function starting.')()
     analysis_result = run_analysis(gui_inputs)
     return analysis_result
+
+
+@eel.expose
+def get_python_batch_result(gui_inputs_list):
+    eel.print_status('Progress: Python function starting.')()
+    analysis_result = run_batch_analysis(gui_inputs_list)
+    return analysis_result
@@ -0,0 +1,77 @@
+"""
+This module reads the evolution files (load curves) with the time in the first column and the value in the second column.
+Excel files (.xlsx, .xls) are parsed by pandas, which is imported only when such a file needs to be parsed;
+CSV files (.csv, comma-separated) and plain-text files (any other extension, whitespace-separated) are read by NumPy.
+If CURVE_CACHE is 1, the parsed curves are cached in .npz files keyed on the path, size, modification time and content hash of the source file.
+"""
+
+import hashlib
+import os
+import zipfile
+import numpy as np
+import numpy.typing as npt
+from config import CURVE_CACHE, CURVE_CACHE_FOLDER_PATH
+from typing import Optional
+
+
+def get_file_key(file_path: str) -> str:
+    file_stat = os.stat(file_path)
+    with open(file_path, 'rb') as file:
+        content_hash = hashlib.sha256(file.read()).hexdigest()
+    return '|'.join((os.path.abspath(file_path), str(file_stat.st_size), str(file_stat.st_mtime_ns), content_hash))
+
+
+def get_cache_path(file_path: str) -> str:
+    # One cache file per source file (an outdated cache file is overwritten)
+    path_hash = hashlib.sha256(os.path.abspath(file_path).encode()).hexdigest()[:16]
+    return os.path.join(CURVE_CACHE_FOLDER_PATH, os.path.basename(file_path) + '_' + path_hash + '.npz')
+
+
+def parse_evolution_file(file_path: str) -> npt.NDArray[np.float64]:
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension in ('.xlsx', '.xls'):
+        import pandas as pd
+        table = pd.read_excel(file_path, header=None).to_numpy(dtype=float)
+    elif extension == '.csv':
+        table = np.loadtxt(file_path, delimiter=',', ndmin=2)
+    else:
+        table = np.loadtxt(file_path, ndmin=2)
+    return table[:, :2]
+
+
+def load_cached_curve(cache_path: str, file_key: str) -> Optional[npt.NDArray[np.float64]]:
+    # Returns None if the cache file is missing, outdated, or unreadable
+    if not os.path.isfile(cache_path):
+        return None
+    try:
+        with np.load(cache_path) as cache:
+            if str(cache['file_key']) == file_key:
+                return cache['table']
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+        pass
+    return None
+
+
+def save_cached_curve(cache_path: str, file_key: str, table: npt.NDArray[np.float64]) -> None:
+    # The cache file is written under a temporary name and renamed, so that an unfinished file is never read;
+    # failures are ignored because the cache is only an optimization (e.g., the folder may be read-only)
+    temporary_path = cache_path + '.tmp'
+    try:
+        os.makedirs(CURVE_CACHE_FOLDER_PATH, exist_ok=True)
+        with open(temporary_path, 'wb') as file:
+            np.savez(file, table=table, file_key=np.array(file_key))
+        os.replace(temporary_path, cache_path)
+    except OSError:
+        pass
+
+
+def read_evolution_curve(file_path: str) -> npt.NDArray[np.float64]:
+    if CURVE_CACHE == 0:
+        return parse_evolution_file(file_path)
+    file_key = get_file_key(file_path)
+    cache_path = get_cache_path(file_path)
+    table = load_cached_curve(cache_path, file_key)
+    if table is None:
+        table = parse_evolution_file(file_path)
+        save_cached_curve(cache_path, file_key, table)
+    return table
@@ -1,10 +1,11 @@
-from config import PHASE_ENDS_MAX, SOURCE_DATA_FOLDER_PATH, TEMP_EVOL_FILE, PRES_EVOL_FILE
-from scipy.interpolate import interp1d
-import pandas as pd
+from config import PHASE_ENDS_MAX, LOG_PERCENTAGE, SOURCE_DATA_FOLDER_PATH, TEMP_EVOL_FILE, PRES_EVOL_FILE, LOAD_BREAKPOINTS
+from config import MESH_GRADING, MESH_GRADING_RATIO, MESH_ELEMENT_MAX, MESH_STEEL_STEP, RESULT_PRECISION
+from evolution_files import read_evolution_curve
 import os
 import eel
 import numpy as np
 import numpy.typing as npt
+from typing import Optional, Union
 
 
 class Structure:
@@ -110,235 +111,426 @@ class Structure:
         return self.section_characteristics[2]
 
 
-class MeshSpace:
+def freeze_fields(instance: object, fields: dict) -> None:
+    # Sets the attributes of an immutable (slotted) object; the arrays are made read-only so that they cannot be changed in place
+    for name, value in fields.items():
+        if isinstance(value, np.ndarray):
+            value.flags.writeable = False
+        object.__setattr__(instance, name, value)
+
+
+class MaterialField:
     """
-    Class for storing information about the spatial mesh.
+    Class for storing the materials of the nodes and elements of the spatial mesh (built once by MeshSpace; immutable).
+    A node belongs to the inner steel liner if its index is not greater than slice_index_steel_in, i.e., the last node not beyond the thickness
+    of the liner, so that in all mesh modes a node lying on the interface of the inner steel liner belongs to the liner.
+    An element belongs to the inner steel liner if its index is not greater than element_index_steel_in.
+    A node or an element belongs to the outer steel liner if its index is not lower than slice_index_steel_out.
+    The slices (and the concrete mask) used to split the results into the layers count the interface node of the outer steel liner as concrete.
     """
 
+    MATERIAL_CONCRETE: int = 0
+    MATERIAL_STEEL: int = 1
+    LAYER_STEEL_INNER: int = 0
+    LAYER_CONCRETE: int = 1
+    LAYER_STEEL_OUTER: int = 2
+
+    __slots__ = (
+        'node_layer_ids', 'element_layer_ids', 'node_material_ids', 'element_material_ids', 'node_steel_mask', 'element_steel_mask',
+        'node_moduli', 'element_moduli', 'slice_steel_inner', 'slice_concrete', 'slice_steel_outer', 'node_concrete_mask',
+    )
+
     def __init__(
         self,
         structure: Structure,
+        node_count: int,
+        slice_index_steel_in: int,
+        element_index_steel_in: int,
+        slice_index_steel_out: int,
     ) -> None:
-        self.element_length = structure.step_space
-        self.total_length = structure.length
-        self.radius_in = structure.radius_in
-        self.steel_thick = structure.steel_thick_in
-        self.steel_thick_out = structure.steel_thick_out
+        node_layer_ids = self.__layer_ids(node_count, structure, slice_index_steel_in, slice_index_steel_out)
+        element_layer_ids = self.__layer_ids(node_count - 1, structure, element_index_steel_in, slice_index_steel_out)
+        node_steel_mask = node_layer_ids != self.LAYER_CONCRETE
+        element_steel_mask = element_layer_ids != self.LAYER_CONCRETE
+
+        # Slices of the layers for splitting the results (None for a missing steel liner)
+        index_1 = slice_index_steel_in + 1 if structure.has_inner_steel else 0
+        index_2 = slice_index_steel_out + 1 if structure.has_outer_steel else node_count
+        node_concrete_mask = np.zeros(node_count, dtype=bool)
+        node_concrete_mask[index_1:index_2] = True
+
+        freeze_fields(self, {
+            'node_layer_ids': node_layer_ids,
+            'element_layer_ids': element_layer_ids,
+            'node_material_ids': np.where(node_steel_mask, self.MATERIAL_STEEL, self.MATERIAL_CONCRETE),
+            'element_material_ids': np.where(element_steel_mask, self.MATERIAL_STEEL, self.MATERIAL_CONCRETE),
+            'node_steel_mask': node_steel_mask,
+            'element_steel_mask': element_steel_mask,
+            'node_moduli': np.where(node_steel_mask, structure.modulus_steel, structure.modulus_concrete),
+            'element_moduli': np.where(element_steel_mask, structure.modulus_steel, structure.modulus_concrete),
+            'slice_steel_inner': slice(0, index_1) if structure.has_inner_steel else None,
+            'slice_concrete': slice(index_1, index_2),
+            'slice_steel_outer': slice(index_2, node_count) if structure.has_outer_steel else None,
+            'node_concrete_mask': node_concrete_mask,
+        })
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError('MaterialField is immutable (attribute ' + name + ' cannot be set).')
+
+    @classmethod
+    def __layer_ids(cls, count: int, structure: Structure, slice_index_steel_in: int, slice_index_steel_out: int) -> npt.NDArray[np.int64]:
+        # TODO: Rollback to: index < slice_index_steel_in
+        ids = np.arange(count)
+        layer_ids = np.full(count, cls.LAYER_CONCRETE)
+        if structure.has_outer_steel:
+            layer_ids[ids >= slice_index_steel_out] = cls.LAYER_STEEL_OUTER
+        if structure.has_inner_steel:
+            layer_ids[ids <= slice_index_steel_in] = cls.LAYER_STEEL_INNER
+        return layer_ids
 
-    @property
-    def element_count(self) -> int:
-        return int(self.total_length / self.element_length)
-
-    @property
-    def node_count(self) -> int:
-        return int(self.element_count + 1)
 
-    @property
-    def element_ids(self) -> list[int]:
-        return list(range(int(self.element_count)))
-
-    @property
-    def node_ids(self) -> list[int]:
-        return self.element_ids + [int(self.element_count)]
-
-    @property
-    def x_axis_thickness(self) -> npt.NDArray[np.float64]:
-        return np.array([1000 * node_id * self.element_length for node_id in self.node_ids])
-
-    @property
-    def nodes_range(self) -> range:
-        return range(int(self.node_count))
-
-    @property
-    def nodes_positions(self) -> list[float]:
-        return [i * self.element_length for i in self.nodes_range]
-
-    @property
-    def element_range(self) -> range:
-        return range(int(self.element_count))
-
-    @property
-    def element_centers(self) -> list[float]:
-        return [i * self.element_length + self.element_length / 2 for i in self.element_range]
+class MeshSpace:
+    """
+    Class for storing information about the spatial mesh.
+    The mesh is given by the positions of the nodes (measured from the inner surface), which are either uniform (step_space)
+    or graded according to MESH_GRADING; in graded meshes, the steel/concrete interfaces lie on nodes.
+    All node and element quantities are computed once as read-only arrays (the materials are stored in material_field);
+    the mesh is immutable.
+    """
 
-    @property
-    def element_centers_from_zero(self) -> list[float]:
-        return [element_center + self.radius_in for element_center in self.element_centers]
+    __slots__ = (
+        'element_length', 'total_length', 'radius_in', 'steel_thick', 'steel_thick_out', 'concrete_thick',
+        'element_count', 'node_count', 'element_ids', 'node_ids', 'element_range', 'nodes_range',
+        'nodes_positions', 'element_lengths', 'element_centers', 'element_centers_from_zero', 'node_centers_from_zero', 'x_axis_thickness',
+        'slice_index_steel_in', 'slice_index_steel_out', 'material_field',
+    )
 
-    @property
-    def node_centers_from_zero(self) -> list[float]:
-        return [node_center + self.radius_in for node_center in self.nodes_positions]
+    def __init__(
+        self,
+        structure: Structure,
+    ) -> None:
+        element_length = structure.step_space  # Nominal element length (the length of all elements in the uniform mesh)
+        total_length = structure.length
+        if MESH_GRADING == 0:
+            element_count = int(total_length / element_length)
+            nodes_positions = np.arange(element_count + 1) * element_length
+            element_lengths = np.full(element_count, element_length)
+            slice_index_steel_in = int(structure.steel_thick_in / element_length)
+            element_index_steel_in = slice_index_steel_in
+            slice_index_steel_out = int((total_length - structure.steel_thick_out) / element_length)  # Element where the outer steel liner starts (the total number of elements if there is none)
+        else:
+            steel_lengths = self.__layer_element_lengths(structure.steel_thick_in, MESH_STEEL_STEP)
+            steel_out_lengths = self.__layer_element_lengths(structure.steel_thick_out, MESH_STEEL_STEP)
+            if MESH_GRADING == 2:
+                concrete_lengths = self.__graded_element_lengths(structure.concrete_thick, element_length)
+            else:
+                concrete_lengths = self.__layer_element_lengths(structure.concrete_thick, element_length)
+            element_lengths = np.concatenate((steel_lengths, concrete_lengths, steel_out_lengths))
+            nodes_positions = np.concatenate(([0.0], np.cumsum(element_lengths)))
+            slice_index_steel_in = len(steel_lengths)  # Interface node of the inner steel liner (it belongs to the liner, like in the uniform mesh)
+            element_index_steel_in = len(steel_lengths) - 1  # Last element of the inner steel liner
+            slice_index_steel_out = len(steel_lengths) + len(concrete_lengths)  # First element of the outer steel liner
+        element_count = len(element_lengths)
+        element_centers = nodes_positions[:-1] + element_lengths / 2
+
+        freeze_fields(self, {
+            'element_length': element_length,
+            'total_length': total_length,
+            'radius_in': structure.radius_in,
+            'steel_thick': structure.steel_thick_in,
+            'steel_thick_out': structure.steel_thick_out,
+            'concrete_thick': structure.concrete_thick,
+            'element_count': int(element_count),
+            'node_count': int(element_count + 1),
+            'element_ids': np.arange(element_count),
+            'node_ids': np.arange(element_count + 1),
+            'element_range': range(element_count),
+            'nodes_range': range(element_count + 1),
+            'nodes_positions': nodes_positions,
+            'element_lengths': element_lengths,
+            'element_centers': element_centers,
+            'element_centers_from_zero': element_centers + structure.radius_in,  # Element centers measured from the axis
+            'node_centers_from_zero': nodes_positions + structure.radius_in,
+            'x_axis_thickness': 1000 * nodes_positions,
+            'slice_index_steel_in': int(slice_index_steel_in),
+            'slice_index_steel_out': int(slice_index_steel_out),
+            'material_field': MaterialField(structure, element_count + 1, int(slice_index_steel_in), int(element_index_steel_in), int(slice_index_steel_out)),
+        })
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError('MeshSpace is immutable (attribute ' + name + ' cannot be set).')
 
-    @property
-    def slice_index_steel_in(self) -> int:
-        return int(self.steel_thick / self.element_length)
+    @staticmethod
+    def __layer_element_lengths(layer_thick: float, max_length: float) -> npt.NDArray[np.float64]:
+        # Equal elements not longer than max_length (so that the layer ends on a node)
+        if layer_thick <= 0:
+            return np.array([])
+        element_count = max(1, int(np.ceil(layer_thick / max_length - 1e-9)))
+        return np.full(element_count, layer_thick / element_count)
 
-    @property
-    def slice_index_steel_out(self) -> int:
-        '''
-        Returns the index of the element where the outer steel liner ends.
-        If there is no outer steel liner, returns the total number of elements.
-        :return:
-        '''
-        return int((self.total_length - self.steel_thick_out) / self.element_length)
+    @staticmethod
+    def __graded_element_lengths(layer_thick: float, first_length: float) -> npt.NDArray[np.float64]:
+        # Elements growing geometrically from first_length (up to MESH_ELEMENT_MAX), scaled so that the layer ends on a node
+        lengths = [first_length]
+        while sum(lengths) < layer_thick:
+            lengths.append(min(lengths[-1] * MESH_GRADING_RATIO, max(MESH_ELEMENT_MAX, first_length)))
+        element_lengths = np.array(lengths)
+        return element_lengths * layer_thick / np.sum(element_lengths)
 
 
 
 class MeshTime:
     """
     Class for storing information about the temporal mesh.
+    The time axis (and the lengths of the time steps) is computed once; the mesh is immutable.
+    If LOAD_BREAKPOINTS is 1, the given breakpoints (turning points of the load curves) are inserted into the fixed time axis.
     """
 
+    __slots__ = (
+        'duration', 'step_time_1', 'step_time_2', 'step_time_3', 'step_time_4', 'step_time_5', 'realised_time_axis',
+        'time_axis', 'time_jumps', 'time_steps_count', 'time_steps_range', 'log_steps_mask',
+    )
+
     def __init__(
         self,
         structure: Structure,
+        realised_time_axis: Optional[npt.NDArray[np.float64]] = None,
+        breakpoints: Optional[npt.NDArray[np.float64]] = None,
     ) -> None:
-        self.duration = structure.duration
-        self.step_time_1 = structure.step_time_1
-        self.step_time_2 = structure.step_time_2
-        self.step_time_3 = structure.step_time_3
-        self.step_time_4 = structure.step_time_4
-        self.step_time_5 = structure.step_time_5
-
-    @property
-    def time_axis(self) -> npt.NDArray[np.float64]:
         # Note that the time axis contains the initial time (0) and the final time (duration)
-        phase_1_end = min(PHASE_ENDS_MAX[0], self.duration)
-        phase_2_end = min(PHASE_ENDS_MAX[1], self.duration)
-        phase_3_end = min(PHASE_ENDS_MAX[2], self.duration)
-        phase_4_end = min(PHASE_ENDS_MAX[3], self.duration)
+        if realised_time_axis is not None:
+            realised_time_axis = np.array(realised_time_axis, dtype=float)  # Time axis obtained by adaptive time stepping (None for fixed steps)
+            time_axis = realised_time_axis
+        else:
+            time_axis = self.__fixed_time_axis(structure)
+            if LOAD_BREAKPOINTS == 1 and breakpoints is not None:
+                time_axis = self.__insert_breakpoints(time_axis, breakpoints)
+
+        # Note that time steps are -1 compared to the time axis because step 0 is the already known initial state.
+        # Moreover, in transient heat transfer, each time step we calculate the temperatures in the next step. Therefore, temperatures at time=duration are calculated in next-to-last step.
+        # Thus, stresses (thermal, ipi, and cpi) need to be calculated for time_steps_count+1
+        time_steps_count = int(len(time_axis) - 1)
+
+        # The progress is logged in the steps where it reaches the next multiple of LOG_PERCENTAGE (and in the first step)
+        progress_levels = np.floor(100 * np.arange(time_steps_count + 1) / max(time_steps_count, 1) / LOG_PERCENTAGE)
+        log_steps_mask = np.zeros(time_steps_count + 1, dtype=bool)
+        log_steps_mask[1:] = progress_levels[1:] > progress_levels[:-1]
+        log_steps_mask[1:2] = True
+
+        freeze_fields(self, {
+            'duration': structure.duration,
+            'step_time_1': structure.step_time_1,
+            'step_time_2': structure.step_time_2,
+            'step_time_3': structure.step_time_3,
+            'step_time_4': structure.step_time_4,
+            'step_time_5': structure.step_time_5,
+            'realised_time_axis': realised_time_axis,
+            'time_axis': time_axis,
+            'time_jumps': np.diff(time_axis),
+            'time_steps_count': time_steps_count,
+            'time_steps_range': range(time_steps_count),
+            'log_steps_mask': log_steps_mask,
+        })
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError('MeshTime is immutable (attribute ' + name + ' cannot be set).')
+
+    @staticmethod
+    def __fixed_time_axis(structure: Structure) -> npt.NDArray[np.float64]:
+        duration = structure.duration
+        phase_1_end = min(PHASE_ENDS_MAX[0], duration)
+        phase_2_end = min(PHASE_ENDS_MAX[1], duration)
+        phase_3_end = min(PHASE_ENDS_MAX[2], duration)
+        phase_4_end = min(PHASE_ENDS_MAX[3], duration)
         time = 0
         time_axis = []
-        while time <= self.duration:
+        while time <= duration:
             time_axis.append(time)
             if time < phase_1_end:
-                time += self.step_time_1
+                time += structure.step_time_1
             elif time < phase_2_end:
-                time += self.step_time_2
+                time += structure.step_time_2
             elif time < phase_3_end:
-                time += self.step_time_3
+                time += structure.step_time_3
             elif time < phase_4_end:
-                time += self.step_time_4
+                time += structure.step_time_4
             else:
-                time += self.step_time_5
+                time += structure.step_time_5
         return np.array(time_axis)
 
-    @property
-    def time_steps_count(self) -> int:
-        # Note that time steps are -1 compared to the time axis because step 0 is the already known initial state.
-        # Moreover, in transient heat transfer, each time step we calculate the temperatures in the next step. Therefore, temperatures at time=duration are calculated in next-to-last step.
-        # Thus, stresses (thermal, ipi, and cpi) need to be calculated for time_steps_count+1
-        return int(len(self.time_axis)-1)
-
-    @property
-    def time_steps_range(self) -> range:
-        return range(int(self.time_steps_count))
+    @staticmethod
+    def __insert_breakpoints(time_axis: npt.NDArray[np.float64], breakpoints: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+        # Breakpoints closer than 10 % of the time step to an existing time are not inserted (they would create too short steps)
+        breakpoints = breakpoints[(breakpoints > time_axis[0]) & (breakpoints < time_axis[-1])]
+        indices = np.searchsorted(time_axis, breakpoints)
+        step_lengths = time_axis[indices] - time_axis[indices - 1]
+        distances = np.minimum(breakpoints - time_axis[indices - 1], time_axis[indices] - breakpoints)
+        return np.union1d(time_axis, breakpoints[distances > 0.1 * step_lengths])
 
     def time_to_next_step(self, current_step: int) -> float:
-        time_axis = self.time_axis
-        return time_axis[current_step + 1] - time_axis[current_step]
-
-
-
-
-
-
+        return float(self.time_jumps[current_step])
 
+    def is_log_step(self, step: int) -> bool:
+        return bool(self.log_steps_mask[step])
 
 class Loads:
     """
     Class for storing information about the loads.
+    The load histories (inner air temperature and pressure) are evaluated for the whole time axis at once by evaluate_histories.
     """
 
     def __init__(
         self,
         structure: Structure,
+        temp_evol_file: str = TEMP_EVOL_FILE,
+        pres_evol_file: str = PRES_EVOL_FILE,
     ) -> None:
+        # The evolution files are given relative to SOURCE_DATA_FOLDER_PATH (e.g., 'complex/temperature_evolution.xlsx'); .csv and .txt files can be used as well
         self.temp_init = structure.temp_init
         self.temp_air_int_0 = structure.temp_air_int
         self.temp_air_ext_0 = structure.temp_air_ext
-        self.evol_air_temp_int: interp1d = self.__internal_air_evolution(TEMP_EVOL_FILE)
-        self.evol_air_pres_int: interp1d = self.__internal_air_evolution(PRES_EVOL_FILE)
+        self.pressure_coeff = structure.pressure_coeff
+        self.evol_air_temp_int: tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]] = self.__internal_air_evolution(temp_evol_file)
+        self.evol_air_pres_int: tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]] = self.__internal_air_evolution(pres_evol_file)
+        self.time_breakpoints: npt.NDArray[np.float64] = np.union1d(self.__turning_points(self.evol_air_temp_int), self.__turning_points(self.evol_air_pres_int))
+        self.air_temp_history: npt.NDArray[np.float64] = np.array([])  # Inner air temperature in each time step
+        self.air_pres_history: npt.NDArray[np.float64] = np.array([])  # Inner air pressure in each time step
+        self.air_pres_coeff_history: npt.NDArray[np.float64] = np.array([])  # Inner air pressure multiplied by the pressure coefficient (except the first time step, i.e., normal operations)
 
     @staticmethod
-    def __internal_air_evolution(evolution_file: str) -> interp1d:
+    def __internal_air_evolution(evolution_file: str) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
         file_path: str = SOURCE_DATA_FOLDER_PATH + evolution_file
         if not os.path.isfile(file_path):
             error_message: str = 'ERROR: File ' + evolution_file + ' is missing in folder ' + SOURCE_DATA_FOLDER_PATH
             raise FileNotFoundError(error_message)
         else:
-            excel_table = pd.read_excel(file_path, header=None)
-            x_axis = excel_table.iloc[:, 0].to_numpy()
-            y_axis = excel_table.iloc[:, 1].to_numpy()
-            return interp1d(x_axis, y_axis)
+            evolution_table = read_evolution_curve(file_path)
+            x_axis = evolution_table[:, 0]
+            y_axis = evolution_table[:, 1]
+            order = np.argsort(x_axis)
+            return x_axis[order], y_axis[order]
+
+    @staticmethod
+    def __turning_points(evolution: tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]) -> npt.NDArray[np.float64]:
+        # Times of the local maxima and minima (peaks) of the curve
+        times, values = evolution
+        slopes = np.sign(np.diff(values))
+        return times[np.nonzero(slopes[1:] * slopes[:-1] < 0)[0] + 1]
+
+    @staticmethod
+    def __interpolate(evolution: tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]], time: Union[npt.NDArray[np.float64], float]) -> npt.NDArray[np.float64]:
+        times, values = evolution
+        if np.amin(time) < times[0] or np.amax(time) > times[-1]:
+            raise ValueError('ERROR: Time ' + str(np.amax(time)) + ' s is outside the time range of the load evolution (' + str(times[0]) + ' to ' + str(times[-1]) + ' s).')
+        return np.interp(time, times, values)
+
+    def evaluate_histories(self, mesh_time: MeshTime) -> None:
+        # Evaluates the loads in all time steps of the given time mesh at once
+        self.air_temp_history = self.__interpolate(self.evol_air_temp_int, mesh_time.time_axis)
+        self.air_pres_history = self.__interpolate(self.evol_air_pres_int, mesh_time.time_axis)
+        self.air_pres_coeff_history = self.get_pres_coeff_history(self.pressure_coeff)
+
+    def get_pres_coeff_history(self, pressure_coeff: float) -> npt.NDArray[np.float64]:
+        # Pressure history multiplied by the given pressure coefficient (e.g., to re-evaluate the stresses for another coefficient)
+        pres_coeff_history = pressure_coeff * self.air_pres_history
+        pres_coeff_history[0] = self.air_pres_history[0]  # During normal operations (first time step), the pressure coefficient should not be used.
+        return pres_coeff_history
 
     def get_current_air_temp(self, time: float) -> float:
-        return float(self.evol_air_temp_int(time))
+        return float(self.__interpolate(self.evol_air_temp_int, time))
 
     def get_current_air_pres(self, time: float) -> float:
-        return float(self.evol_air_pres_int(time))
+        return float(self.__interpolate(self.evol_air_pres_int, time))
+
+    def get_next_breakpoint(self, time: float) -> float:
+        # Returns the first breakpoint after the given time (infinity if there is none); the time may differ from a breakpoint by a rounding error
+        index = np.searchsorted(self.time_breakpoints, time + 1e-9, side='right')
+        return float(self.time_breakpoints[index]) if index < len(self.time_breakpoints) else np.inf
+
+RESULT_MATRIX_DTYPE = np.float32 if RESULT_PRECISION == 1 else np.float64  # Storage precision of the space-time matrices of the results
+
 
 class Results:
     """
     Class for storing results.
+    The fields whose size depends on the number of time steps are registered in FIELDS (with the kind of their shape and their dtype)
+    and are allocated (filled with zeros) when they are accessed for the first time; the stages write into these buffers.
+    In summary-only mode, the space-time matrices have no rows; only the time evolutions, the extreme steps,
+    and the rows of the extreme steps (extreme_rows, see result_processing.get_result_row) are stored.
+    The attributes in NON_EXPORTED_ATTRIBUTES describe how the results are stored and are not saved into CSV files.
     """
 
+    NON_EXPORTED_ATTRIBUTES: tuple[str, ...] = ('summary_only', 'field_shapes', 'extreme_rows')
+
+    # Registry of the fields allocated on the first access: name -> (kind of shape, dtype);
+    # 'time' fields have one value for each time step, 'space_time' fields have one row (of node values) for each time step
+    # and (except the temperature matrix, which is the input of the stress stage) are stored in the precision given by RESULT_PRECISION
+    FIELDS: dict[str, tuple[str, type]] = {
+        'temp_air_int_vect': ('time', float),
+        'temp_grad_vect': ('time', float),
+        'pres_air_int_vect': ('time', float),
+        'heat_coef_int_vect': ('time', float),
+        'heat_coef_ext_vect': ('time', float),
+        'temp_matrix': ('space_time', float),
+        'strains_thermal_theoretical': ('space_time', RESULT_MATRIX_DTYPE),
+        'stress_temp_fixed': ('space_time', RESULT_MATRIX_DTYPE),
+        'stress_temp_clamped': ('space_time', RESULT_MATRIX_DTYPE),
+        'stress_temp_free': ('space_time', RESULT_MATRIX_DTYPE),
+        'stress_internal_pressure': ('space_time', RESULT_MATRIX_DTYPE),
+        'strain_internal_pressure': ('space_time', RESULT_MATRIX_DTYPE),
+        'stress_prestressing': ('space_time', RESULT_MATRIX_DTYPE),
+        'strain_prestressing': ('space_time', RESULT_MATRIX_DTYPE),
+        'strains_real_fixed': ('space_time', RESULT_MATRIX_DTYPE),
+        'stress_total_fixed': ('space_time', RESULT_MATRIX_DTYPE),
+        'strains_real_clamped': ('space_time', RESULT_MATRIX_DTYPE),
+        'stress_total_clamped': ('space_time', RESULT_MATRIX_DTYPE),
+        'strains_real_free': ('space_time', RESULT_MATRIX_DTYPE),
+        'stress_total_free': ('space_time', RESULT_MATRIX_DTYPE),
+        'stress_evolution_concrete_tension_fixed': ('time', float),
+        'stress_evolution_concrete_tension_clamped': ('time', float),
+        'stress_evolution_concrete_tension_free': ('time', float),
+        'stress_evolution_steel_tension_fixed': ('time', float),
+        'stress_evolution_steel_tension_clamped': ('time', float),
+        'stress_evolution_steel_tension_free': ('time', float),
+        'stress_evolution_concrete_compression_fixed': ('time', float),
+        'stress_evolution_concrete_compression_clamped': ('time', float),
+        'stress_evolution_concrete_compression_free': ('time', float),
+        'stress_evolution_steel_compression_fixed': ('time', float),
+        'stress_evolution_steel_compression_clamped': ('time', float),
+        'stress_evolution_steel_compression_free': ('time', float),
+        'stress_evolution_steel_merged_fixed': ('time', float),
+        'stress_evolution_steel_merged_clamped': ('time', float),
+        'stress_evolution_steel_merged_free': ('time', float),
+        'newton_iterations_vect': ('time', int),
+        'newton_factorizations_vect': ('time', int),
+        'newton_residuum_vect': ('time', float),
+    }
+
     def __init__(
         self,
         mesh_space: MeshSpace,
         mesh_time: MeshTime,
+        summary_only: bool = False,
     ) -> None:
         self.analysis_identifier: str = ''
+        self.summary_only: bool = summary_only
         self.duration: float = mesh_time.duration
         self.temp_init: npt.NDArray[np.float64] = np.zeros(mesh_space.node_count, dtype=float)
         self.temp_oper: npt.NDArray[np.float64] = np.zeros(mesh_space.node_count, dtype=float)
-        self.temp_air_int_vect: npt.NDArray[np.float64] = np.zeros(mesh_time.time_steps_count + 1, dtype=float)
-        self.temp_grad_vect: npt.NDArray[np.float64] = np.zeros(mesh_time.time_steps_count + 1, dtype=float)
-        self.pres_air_int_vect: npt.NDArray[np.float64] = np.zeros(mesh_time.time_steps_count + 1, dtype=float)
-        self.heat_coef_int_vect: npt.NDArray[np.float64] = np.zeros(mesh_time.time_steps_count + 1, dtype=float)
-        self.heat_coef_ext_vect: npt.NDArray[np.float64] = np.zeros(mesh_time.time_steps_count + 1, dtype=float)
-        self.temp_matrix: npt.NDArray[np.float64] = np.zeros((mesh_time.time_steps_count + 1, mesh_space.node_count), dtype=float)
         self.temp_matrix_steel_inner: npt.NDArray[np.float64] = np.array([])
         self.temp_matrix_concrete: npt.NDArray[np.float64] = np.array([])
         self.temp_matrix_steel_outer: npt.NDArray[np.float64] = np.array([])
-        self.strains_thermal_theoretical: npt.NDArray[np.float64] = np.zeros((mesh_time.time_steps_count + 1, mesh_space.node_count), dtype=float)
-        self.stress_temp_fixed: npt.NDArray[np.float64] = np.zeros((mesh_time.time_steps_count + 1, mesh_space.node_count), dtype=float)
-        self.stress_temp_clamped: npt.NDArray[np.float64] = np.zeros((mesh_time.time_steps_count + 1, mesh_space.node_count), dtype=float)
-        self.stress_temp_free: npt.NDArray[np.float64] = np.zeros((mesh_time.time_steps_count + 1, mesh_space.node_count), dtype=float)
-        self.stress_internal_pressure: npt.NDArray[np.float64] = np.zeros((mesh_time.time_steps_count + 1, mesh_space.node_count), dtype=float)
-        self.strain_internal_pressure: npt.NDArray[np.float64] = np.zeros((mesh_time.time_steps_count + 1, mesh_space.node_count), dtype=float)
-        self.stress_prestressing: npt.NDArray[np.float64] = np.zeros((mesh_time.time_steps_count + 1, mesh_space.node_count), dtype=float)
-        self.strain_prestressing: npt.NDArray[np.float64] = np.zeros((mesh_time.time_steps_count + 1, mesh_space.node_count), dtype=float)
-        self.strains_real_fixed: npt.NDArray[np.float64] = np.zeros((mesh_time.time_steps_count + 1, mesh_space.node_count), dtype=float)
-        self.stress_total_fixed: npt.NDArray[np.float64] = np.zeros((mesh_time.time_steps_count + 1, mesh_space.node_count), dtype=float)
         self.stress_fixed_steel_inner: npt.NDArray[np.float64] = np.array([])
         self.stress_fixed_concrete: npt.NDArray[np.float64] = np.array([])
         self.stress_fixed_steel_outer: npt.NDArray[np.float64] = np.array([])
-        self.strains_real_clamped: npt.NDArray[np.float64] = np.zeros((mesh_time.time_steps_count + 1, mesh_space.node_count), dtype=float)
-        self.stress_total_clamped: npt.NDArray[np.float64] = np.zeros((mesh_time.time_steps_count + 1, mesh_space.node_count), dtype=float)
         self.stress_clamped_steel_inner: npt.NDArray[np.float64] = np.array([])
         self.stress_clamped_concrete: npt.NDArray[np.float64] = np.array([])
         self.stress_clamped_steel_outer: npt.NDArray[np.float64] = np.array([])
-        self.strains_real_free: npt.NDArray[np.float64] = np.zeros((mesh_time.time_steps_count + 1, mesh_space.node_count), dtype=float)
-        self.stress_total_free: npt.NDArray[np.float64] = np.zeros((mesh_time.time_steps_count + 1, mesh_space.node_count), dtype=float)
         self.stress_free_steel_inner: npt.NDArray[np.float64] = np.array([])
         self.stress_free_concrete: npt.NDArray[np.float64] = np.array([])
         self.stress_free_steel_outer: npt.NDArray[np.float64] = np.array([])
-        self.stress_evolution_concrete_tension_fixed: npt.NDArray[np.float64] = np.zeros(mesh_time.time_steps_count + 1, dtype=float)
-        self.stress_evolution_concrete_tension_clamped: npt.NDArray[np.float64] = np.zeros(mesh_time.time_steps_count + 1, dtype=float)
-        self.stress_evolution_concrete_tension_free: npt.NDArray[np.float64] = np.zeros(mesh_time.time_steps_count + 1, dtype=float)
-        self.stress_evolution_steel_tension_fixed: npt.NDArray[np.float64] = np.zeros(mesh_time.time_steps_count + 1, dtype=float)
-        self.stress_evolution_steel_tension_clamped: npt.NDArray[np.float64] = np.zeros(mesh_time.time_steps_count + 1, dtype=float)
-        self.stress_evolution_steel_tension_free: npt.NDArray[np.float64] = np.zeros(mesh_time.time_steps_count + 1, dtype=float)
-        self.stress_evolution_concrete_compression_fixed: npt.NDArray[np.float64] = np.zeros(mesh_time.time_steps_count + 1, dtype=float)
-        self.stress_evolution_concrete_compression_clamped: npt.NDArray[np.float64] = np.zeros(mesh_time.time_steps_count + 1, dtype=float)
-        self.stress_evolution_concrete_compression_free: npt.NDArray[np.float64] = np.zeros(mesh_time.time_steps_count + 1, dtype=float)
-        self.stress_evolution_steel_compression_fixed: npt.NDArray[np.float64] = np.zeros(mesh_time.time_steps_count + 1, dtype=float)
-        self.stress_evolution_steel_compression_clamped: npt.NDArray[np.float64] = np.zeros(mesh_time.time_steps_count + 1, dtype=float)
-        self.stress_evolution_steel_compression_free: npt.NDArray[np.float64] = np.zeros(mesh_time.time_steps_count + 1, dtype=float)
-        self.stress_evolution_steel_merged_fixed: npt.NDArray[np.float64] = np.zeros(mesh_time.time_steps_count + 1, dtype=float)
-        self.stress_evolution_steel_merged_clamped: npt.NDArray[np.float64] = np.zeros(mesh_time.time_steps_count + 1, dtype=float)
-        self.stress_evolution_steel_merged_free: npt.NDArray[np.float64] = np.zeros(mesh_time.time_steps_count + 1, dtype=float)
+        self.time_axis: npt.NDArray[np.float64] = mesh_time.time_axis
+        self.set_field_shapes(mesh_space, mesh_time)
         self.extreme_steps: dict[str, int] = {
             'max_internal_pressure': 0,
             'max_temp_air': 0,
@@ -357,9 +549,75 @@ class Results:
             'min_stress_clamped_steel_inner': 0,
             'min_stress_free_steel_inner': 0,
         }
+        self.extreme_rows: dict[str, npt.NDArray[np.float64]] = {}
+
+    def __getattr__(self, name: str) -> npt.NDArray:
+        # Called only for missing attributes: a registered field is allocated on its first access
+        if name not in Results.FIELDS or 'field_shapes' not in self.__dict__:
+            raise AttributeError("'Results' object has no attribute '" + name + "'")
+        shape_kind, dtype = Results.FIELDS[name]
+        value = np.zeros(self.field_shapes[shape_kind], dtype=dtype)
+        setattr(self, name, value)
+        return value
+
+    def set_field_shapes(
+        self,
+        mesh_space: MeshSpace,
+        mesh_time: MeshTime,
+    ) -> None:
+        # Sets the shapes of the fields whose size depends on the number of time steps (in summary-only mode, the space-time matrices have no rows)
+        matrix_rows = 0 if self.summary_only else mesh_time.time_steps_count + 1
+        self.field_shapes: dict[str, tuple[int, ...]] = {
+            'time': (mesh_time.time_steps_count + 1,),
+            'space_time': (matrix_rows, mesh_space.node_count),
+        }
+
+    def resize_time_fields(
+        self,
+        mesh_space: MeshSpace,
+        mesh_time: MeshTime,
+    ) -> None:
+        # Resizes the time-dependent fields after the time axis has been changed (e.g., by adaptive time stepping).
+        # Fields already calculated for the new time axis are kept (in the registered dtype); for the other allocated fields, only the initial time step is kept.
+        self.set_field_shapes(mesh_space, mesh_time)
+        for field_name, (shape_kind, dtype) in Results.FIELDS.items():
+            if field_name not in self.__dict__:
+                continue
+            previous_value = self.__dict__.pop(field_name)
+            if np.shape(previous_value) == self.field_shapes[shape_kind]:
+                setattr(self, field_name, previous_value.astype(dtype, copy=False))
+            else:
+                getattr(self, field_name)[0] = previous_value[0]
 
     @property
     def label_time(self) -> str:
         if self.duration <= 60 * 60:
             return str(int(self.duration / 60)) + 'm'
-        return str(int(self.duration / (60 * 60))) + 'h'
\ No newline at end of file
+        return str(int(self.duration / (60 * 60))) + 'h'
+
+
+class StressBlock:
+    """
+    Class for storing the space-time fields of the stress stage for one block of time steps
+    (the same fields as in Results, with rows for block_steps time steps, always in float64).
+    It is used in summary-only mode, and as the double-precision buffer of the stress stage if the results are stored in single precision.
+    """
+
+    # Fields calculated by the stress stage from the temperatures of the block
+    FIELDS: tuple[str, ...] = (
+        'strains_thermal_theoretical', 'stress_temp_fixed', 'stress_temp_clamped', 'stress_temp_free',
+        'strains_real_fixed', 'strains_real_clamped', 'strains_real_free',
+        'stress_internal_pressure', 'strain_internal_pressure', 'stress_prestressing', 'strain_prestressing',
+        'stress_total_fixed', 'stress_total_clamped', 'stress_total_free',
+    )
+
+    def __init__(
+        self,
+        mesh_space: MeshSpace,
+        block_steps: int,
+        temp_init: npt.NDArray[np.float64],
+    ) -> None:
+        self.temp_init: npt.NDArray[np.float64] = temp_init
+        self.temp_matrix: npt.NDArray[np.float64] = np.zeros((block_steps, mesh_space.node_count), dtype=float)
+        for field_name in StressBlock.FIELDS:
+            setattr(self, field_name, np.zeros((block_steps, mesh_space.node_count), dtype=float))
@@ -0,0 +1,66 @@
+import os
+import sys
+import eel
+import numpy as np
+import pytest
+
+# The modules import each other both as src.<module> and (inside src) as top-level modules
+ROOT_FOLDER_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_FOLDER_PATH = os.path.join(ROOT_FOLDER_PATH, 'src')
+sys.path[:0] = [ROOT_FOLDER_PATH, SOURCE_FOLDER_PATH]
+
+GUI_INPUTS = {
+    't_init': 20, 't_in': 41, 't_out': 20, 'duration': 3600, 'pressure_coeff': 1.5, 'concrete_thick': 1.2, 'steel_thick': 0.006,
+    'radius_in': 9.5, 'tendons_stress': 1280, 'tendons_area': 0.01425, 'density': 2500, 'water_cont': 1.5,
+    'therm_expan_coeff': 0.000012, 'modulus_concrete': 35000, 'modulus_steel': 210000, 'emissivity': 0.7, 'char_len': 0.05,
+    'pressure_ext': 0.1, 'step_space': 0.01, 'step_time_1': 1, 'step_time_2': 15, 'step_time_3': 60, 'step_time_4': 300,
+    'step_time_5': 1800, 'poisson': 0.2,
+}
+
+
+@pytest.fixture(autouse=True)
+def gui_status(monkeypatch):
+    # The status messages are sent to the web GUI by double_print, which is not started in the tests
+    monkeypatch.setattr(eel, 'print_status', lambda message: lambda: None, raising=False)
+
+
+@pytest.fixture
+def gui_inputs(monkeypatch):
+    # The input files of the loads are read relative to the src folder
+    monkeypatch.chdir(SOURCE_FOLDER_PATH)
+    return dict(GUI_INPUTS)
+
+
+@pytest.fixture
+def prepare_analysis():
+    # Returns a function which prepares the objects of an analysis in the same way as run_analysis (up to the transient heat transfer)
+    from src.models import Structure, MeshSpace, MeshTime, Loads, Results
+    from src.calculations.temperatures.steadystate_heat_transfer import calc_operating_temperatures
+    from src.controllers import fill_initial_results
+
+    def prepare(gui_inputs, time_axis=None, air_temp_evolution=None):
+        # time_axis replaces the fixed time axis, air_temp_evolution (times, temperatures) replaces the evolution file of the inner air temperature
+        structure = Structure(gui_inputs)
+        mesh_space = MeshSpace(structure)
+        loads = Loads(structure)
+        if air_temp_evolution is not None:
+            loads.evol_air_temp_int = air_temp_evolution
+        mesh_time = MeshTime(structure, time_axis, breakpoints=loads.time_breakpoints)
+        loads.evaluate_histories(mesh_time)
+        results = Results(mesh_space, mesh_time)
+        results.temp_init = np.full(mesh_space.node_count, structure.temp_init, dtype=float)
+        results.temp_oper = calc_operating_temperatures(structure, mesh_space)
+        fill_initial_results(structure, loads, results)
+        return structure, mesh_space, mesh_time, loads, results
+
+    return prepare
+
+
+@pytest.fixture
+def material_property_mode(request, monkeypatch):
+    # The tables are created according to MATERIAL_PROPERTIES, thus the cached tables are dropped before and after the test
+    import src.calculations.temperatures.material_properties as material_properties
+    monkeypatch.setattr(material_properties, 'MATERIAL_PROPERTIES', request.param)
+    material_properties.get_material_property_tables.cache_clear()
+    yield request.param
+    material_properties.get_material_property_tables.cache_clear()
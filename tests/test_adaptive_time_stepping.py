@@ -0,0 +1,47 @@
+'''
+Tests of the adaptive time stepping of the transient heat transfer.
+'''
+
+import numpy as np
+import pytest
+from src.calculations.temperatures.transient_heat_transfer import adaptive_steps_heat_transfer, fixed_steps_heat_transfer
+from src.config import ADAPTIVE_TOLERANCE
+from src.models import MeshTime, Results
+
+
+def get_smooth_ramp(duration: float) -> tuple[np.ndarray, np.ndarray]:
+    # Inner air temperature rising smoothly from 41 to 121 Celsius over the whole duration
+    times = np.linspace(0, duration, 2001)
+    return times, 41 + 80 * (1 - np.cos(np.pi * times / duration)) / 2
+
+
+def test_adaptive_steps_match_fine_fixed_steps(gui_inputs, prepare_analysis):
+    # The step size is controlled by the local error, thus each accepted step is compared with fine fixed steps started from the same temperatures
+    gui_inputs['duration'] = 600
+    structure, mesh_space, mesh_time, loads, results = prepare_analysis(gui_inputs, air_temp_evolution=get_smooth_ramp(gui_inputs['duration']))
+    adaptive_steps_heat_transfer(structure, mesh_space, mesh_time, loads, results)
+    time_axis = results.time_axis
+    assert len(time_axis) > 2
+
+    local_errors = []
+    for step in range(len(time_axis) - 1):
+        fine_mesh_time = MeshTime(structure, np.linspace(time_axis[step], time_axis[step + 1], 21))
+        loads.evaluate_histories(fine_mesh_time)
+        fine_results = Results(mesh_space, fine_mesh_time)
+        fine_results.temp_oper = results.temp_matrix[step]
+        fixed_steps_heat_transfer(structure, mesh_space, fine_mesh_time, loads, fine_results)
+        local_errors.append(np.amax(np.absolute(results.temp_matrix[step + 1] - fine_results.temp_matrix[-1])))
+    assert max(local_errors) <= ADAPTIVE_TOLERANCE
+
+
+@pytest.mark.parametrize('duration', [600, 577.3, 0.7])
+def test_adaptive_time_axis_ends_at_duration(gui_inputs, prepare_analysis, duration):
+    gui_inputs['duration'] = duration
+    gui_inputs['step_time_1'] = 0.1
+    analysis = prepare_analysis(gui_inputs, air_temp_evolution=get_smooth_ramp(duration))
+    adaptive_steps_heat_transfer(*analysis)
+    time_axis = analysis[-1].time_axis
+    assert time_axis[0] == 0
+    assert time_axis[-1] == duration
+    assert np.all(np.diff(time_axis) > 0)
+    assert len(analysis[-1].temp_matrix) == len(time_axis)
@@ -0,0 +1,27 @@
+'''
+Comparison of the batched transient heat transfer of several scenarios with the analyses of the single scenarios.
+'''
+
+import numpy as np
+import src.controllers as controllers
+
+
+def test_batch_matches_single_analyses(gui_inputs, monkeypatch):
+    # Processing, CSV files and figures are skipped, only the results are collected
+    collected_results = []
+    monkeypatch.setattr(controllers, 'calc_outputs', lambda structure, mesh_space, mesh_time, results: collected_results.append(results))
+    gui_inputs['duration'] = 600
+    gui_inputs_list = [dict(gui_inputs, t_init=t_init, t_in=t_in, t_out=t_out) for t_init, t_in, t_out in ((20, 41, 20), (35, 60, 10), (5, 25, -5))]
+
+    assert controllers.run_batch_analysis(gui_inputs_list) == 0
+    batch_results = list(collected_results)
+    collected_results.clear()
+    for scenario_inputs in gui_inputs_list:
+        assert controllers.run_analysis(scenario_inputs) == 0
+    single_results = list(collected_results)
+
+    assert len(batch_results) == len(single_results) == len(gui_inputs_list)
+    for batch, single in zip(batch_results, single_results):
+        np.testing.assert_array_equal(batch.time_axis, single.time_axis)
+        np.testing.assert_allclose(batch.temp_matrix, single.temp_matrix, rtol=0, atol=1e-9)
+        np.testing.assert_array_equal(batch.newton_iterations_vect, single.newton_iterations_vect)
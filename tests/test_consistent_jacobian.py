@@ -0,0 +1,49 @@
+'''
+Finite-difference test of the consistent derivation of the residua (JACOBIAN = 1) of the transient heat transfer.
+'''
+
+import numpy as np
+import pytest
+import src.calculations.temperatures.transient_heat_transfer as transient_heat_transfer
+import src.calculations.temperatures.transient_matrices as transient_matrices
+from src.calculations.temperatures.transient_heat_transfer import create_global_matrices, get_flux_vect_and_deriv, get_residuum, get_residuum_deriv, add_material_residuum_deriv
+from src.calculations.temperatures.transient_matrices import matrix_dot
+
+TIME_JUMP = 15.0
+TEMP_GAS = 80.0
+
+
+def to_dense(matrix, node_count: int) -> np.ndarray:
+    # The columns are obtained by multiplying the unit vectors (works for all storage formats of LINEAR_SOLVER)
+    return np.column_stack([matrix_dot(matrix, unit_vect) for unit_vect in np.eye(node_count)])
+
+
+@pytest.mark.parametrize('material_property_mode', [0], indirect=True)
+@pytest.mark.parametrize('linear_solver', [0, 1, 2])
+@pytest.mark.parametrize('theta', [1, 0.5])
+def test_residuum_deriv_matches_finite_differences(material_property_mode, gui_inputs, prepare_analysis, monkeypatch, linear_solver, theta):
+    monkeypatch.setattr(transient_heat_transfer, 'JACOBIAN', 1)
+    monkeypatch.setattr(transient_matrices, 'LINEAR_SOLVER', linear_solver)
+    structure, mesh_space, mesh_time, loads, results = prepare_analysis(gui_inputs)
+
+    # Temperatures between 20 and 90 Celsius (away from the breakpoints of the material properties)
+    curr_temp_distr = results.temp_oper
+    ftr_temp_distr = curr_temp_distr + 40 * np.linspace(1, 0, mesh_space.node_count) ** 2 + 5
+    hist_temp_distr = -curr_temp_distr
+    curr_conduc_mat = create_global_matrices(curr_temp_distr, mesh_space, structure)[0]
+    explicit_vect = (1 - theta) * (matrix_dot(curr_conduc_mat, curr_temp_distr) + get_flux_vect_and_deriv(curr_temp_distr, TEMP_GAS, structure, mesh_space)[0])
+
+    def calc_residuum(temp_distr):
+        conduc_mat, capac_mat = create_global_matrices(temp_distr, mesh_space, structure)
+        flux_vect = get_flux_vect_and_deriv(temp_distr, TEMP_GAS, structure, mesh_space)[0]
+        return get_residuum(conduc_mat, capac_mat, flux_vect, temp_distr, hist_temp_distr, explicit_vect, TIME_JUMP, theta, 1)
+
+    conduc_mat, capac_mat = create_global_matrices(ftr_temp_distr, mesh_space, structure)
+    flux_vect_deriv = get_flux_vect_and_deriv(ftr_temp_distr, TEMP_GAS, structure, mesh_space)[1]
+    residuum_deriv = get_residuum_deriv(conduc_mat, capac_mat, flux_vect_deriv, TIME_JUMP, theta, 1)
+    residuum_deriv = to_dense(add_material_residuum_deriv(residuum_deriv, ftr_temp_distr, hist_temp_distr, TIME_JUMP, theta, 1, structure, mesh_space), mesh_space.node_count)
+
+    diff_step = 1e-3
+    residuum_deriv_fd = np.column_stack([(calc_residuum(ftr_temp_distr + diff_step * unit_vect) - calc_residuum(ftr_temp_distr - diff_step * unit_vect)) / (2 * diff_step)
+                                         for unit_vect in np.eye(mesh_space.node_count)])
+    np.testing.assert_allclose(residuum_deriv, residuum_deriv_fd, rtol=1e-5, atol=1e-7 * np.amax(np.absolute(residuum_deriv_fd)))
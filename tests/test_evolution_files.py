@@ -0,0 +1,76 @@
+'''
+Tests of reading the evolution files (parsing of the formats and caching of the parsed curves).
+'''
+
+import os
+import numpy as np
+import pytest
+import evolution_files
+from evolution_files import read_evolution_curve
+
+CURVE = np.array([[0.0, 20.0], [10.0, 35.5], [60.0, 120.25], [3600.0, 41.0]])
+
+
+@pytest.fixture
+def curve_cache(tmp_path, monkeypatch):
+    # The cache files are written into the temporary folder
+    cache_folder_path = tmp_path / 'cache'
+    monkeypatch.setattr(evolution_files, 'CURVE_CACHE', 1)
+    monkeypatch.setattr(evolution_files, 'CURVE_CACHE_FOLDER_PATH', str(cache_folder_path))
+    return cache_folder_path
+
+
+def write_curve(file_path, table: np.ndarray, delimiter: str) -> None:
+    # A third column is added, only the first two columns are read
+    table = np.column_stack((table, np.arange(len(table))))
+    np.savetxt(file_path, table, delimiter=delimiter, fmt='%.6f')
+
+
+@pytest.mark.parametrize('curve_cache_mode', [0, 1])
+def test_csv_and_txt_files_are_parsed_equally(tmp_path, curve_cache, monkeypatch, curve_cache_mode):
+    monkeypatch.setattr(evolution_files, 'CURVE_CACHE', curve_cache_mode)
+    write_curve(tmp_path / 'curve.csv', CURVE, ',')
+    write_curve(tmp_path / 'curve.txt', CURVE, ' ')
+    write_curve(tmp_path / 'curve.dat', CURVE, '\t')
+    for file_name in ('curve.csv', 'curve.txt', 'curve.dat'):
+        for _ in range(2):  # The second reading uses the cache (if enabled)
+            np.testing.assert_array_equal(read_evolution_curve(str(tmp_path / file_name)), CURVE)
+    assert os.path.isdir(curve_cache) == (curve_cache_mode == 1)
+
+
+def test_excel_files_are_parsed_like_csv_files(tmp_path, curve_cache):
+    pd = pytest.importorskip('pandas')
+    pytest.importorskip('openpyxl')
+    pd.DataFrame(CURVE).to_excel(tmp_path / 'curve.xlsx', header=False, index=False)
+    write_curve(tmp_path / 'curve.csv', CURVE, ',')
+    np.testing.assert_array_equal(read_evolution_curve(str(tmp_path / 'curve.xlsx')), read_evolution_curve(str(tmp_path / 'curve.csv')))
+
+
+def test_cache_is_used_until_the_file_changes(tmp_path, curve_cache, monkeypatch):
+    file_path = tmp_path / 'curve.csv'
+    write_curve(file_path, CURVE, ',')
+    np.testing.assert_array_equal(read_evolution_curve(str(file_path)), CURVE)
+    assert len(os.listdir(curve_cache)) == 1
+
+    # An unchanged file is read from the cache without parsing
+    parse_evolution_file = evolution_files.parse_evolution_file
+    monkeypatch.setattr(evolution_files, 'parse_evolution_file', lambda path: pytest.fail('The cached curve was not used.'))
+    np.testing.assert_array_equal(read_evolution_curve(str(file_path)), CURVE)
+    monkeypatch.setattr(evolution_files, 'parse_evolution_file', parse_evolution_file)
+
+    # A change of the content is detected even if the size and the modification time stay the same
+    file_stat = os.stat(file_path)
+    changed_curve = CURVE.copy()
+    changed_curve[2, 1] = 130.25
+    write_curve(file_path, changed_curve, ',')
+    os.utime(file_path, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns))
+    assert os.stat(file_path).st_size == file_stat.st_size
+    np.testing.assert_array_equal(read_evolution_curve(str(file_path)), changed_curve)
+
+    # The outdated cache file is replaced and a corrupted cache file is ignored
+    assert len(os.listdir(curve_cache)) == 1
+    cache_path = evolution_files.get_cache_path(str(file_path))
+    with open(cache_path, 'wb') as cache_file:
+        cache_file.write(b'corrupted')
+    np.testing.assert_array_equal(read_evolution_curve(str(file_path)), changed_curve)
+    np.testing.assert_array_equal(evolution_files.load_cached_curve(cache_path, evolution_files.get_file_key(str(file_path))), changed_curve)
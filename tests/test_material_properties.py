@@ -0,0 +1,56 @@
+'''
+Tests of the evaluation of the material properties by MaterialPropertyTables (interpolated tables and exact reference mode).
+'''
+
+import numpy as np
+import pytest
+from src.calculations.temperatures.material_properties import MaterialPropertyTables
+from src.calculations.temperatures.material_properties import steel_conductivity, concrete_conductivity, steel_volumetric_heat_capacity, concrete_volumetric_heat_capacity
+
+DENSITY, WATER_CONTENT = 2500.0, 1.5
+EXACT_FUNCTIONS = {
+    'steel_conductivity': steel_conductivity,
+    'concrete_conductivity': concrete_conductivity,
+    'steel_volumetric_heat_capacity': steel_volumetric_heat_capacity,
+    'concrete_volumetric_heat_capacity': lambda temp: concrete_volumetric_heat_capacity(temp, DENSITY, WATER_CONTENT),
+}
+
+
+def evaluate_exactly(property_name: str, temps: np.ndarray) -> np.ndarray:
+    return np.array([EXACT_FUNCTIONS[property_name](float(temp)) for temp in temps])
+
+
+@pytest.mark.parametrize('material_property_mode', [1], indirect=True)
+@pytest.mark.parametrize('property_name', list(EXACT_FUNCTIONS))
+def test_table_interpolation_error_is_bounded(material_property_mode, property_name):
+    # The error of the linear interpolation on the interval (a, b) is at most (b - a) ** 2 / 8 * max|f''|,
+    # the second derivation is estimated by central differences of the exact function at both ends and in the middle of the interval
+    tables = MaterialPropertyTables(DENSITY, WATER_CONTENT)
+    temps = np.random.default_rng(0).uniform(tables.temp_min, tables.temp_max, 5000)
+    temps = np.concatenate((temps, np.repeat(tables.breakpoints, 4) + np.tile([-0.05, -0.01, 0.01, 0.05], len(tables.breakpoints))))
+    errors = np.absolute(getattr(tables, property_name)(temps) - evaluate_exactly(property_name, temps))
+
+    interval_ends = np.searchsorted(tables.temp_grid, temps)
+    temps_a, temps_b = tables.temp_grid[interval_ends - 1], tables.temp_grid[interval_ends]
+    diff_step = 1e-3
+    second_derivs = [(evaluate_exactly(property_name, points + diff_step) - 2 * evaluate_exactly(property_name, points) + evaluate_exactly(property_name, points - diff_step)) / diff_step ** 2
+                     for points in (temps_a, (temps_a + temps_b) / 2, temps_b)]
+    error_bounds = (temps_b - temps_a) ** 2 / 8 * np.amax(np.absolute(second_derivs), axis=0)
+    assert np.all(errors <= 1.1 * error_bounds + 1e-9 * np.absolute(evaluate_exactly(property_name, temps)))
+
+
+@pytest.mark.parametrize('material_property_mode', [1], indirect=True)
+@pytest.mark.parametrize('property_name', list(EXACT_FUNCTIONS))
+def test_tables_are_exact_on_the_grid_and_outside(material_property_mode, property_name):
+    tables = MaterialPropertyTables(DENSITY, WATER_CONTENT)
+    temps = np.concatenate((tables.temp_grid[::97], [-273.15, -100.5, 1500.5, 2000.0]))
+    np.testing.assert_allclose(getattr(tables, property_name)(temps), evaluate_exactly(property_name, temps), rtol=1e-12)
+
+
+@pytest.mark.parametrize('material_property_mode', [0], indirect=True)
+@pytest.mark.parametrize('property_name', list(EXACT_FUNCTIONS))
+def test_reference_mode_is_exact(material_property_mode, property_name):
+    tables = MaterialPropertyTables(DENSITY, WATER_CONTENT)
+    assert not tables.tabulated and not hasattr(tables, 'temp_grid')
+    temps = np.linspace(-150, 1600, 1751) + 0.05
+    np.testing.assert_array_equal(getattr(tables, property_name)(temps), evaluate_exactly(property_name, temps))
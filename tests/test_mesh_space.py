@@ -0,0 +1,90 @@
+'''
+Tests of the spatial mesh and its material field in all modes of MESH_GRADING.
+'''
+
+import numpy as np
+import pytest
+import src.models as models
+from src.config import MESH_GRADING_RATIO, MESH_ELEMENT_MAX, MESH_STEEL_STEP
+from src.models import Structure, MeshSpace
+
+
+@pytest.fixture(params=[0, 1, 2])
+def mesh_grading(request, monkeypatch):
+    monkeypatch.setattr(models, 'MESH_GRADING', request.param)
+    return request.param
+
+
+def create_mesh_space(gui_inputs, steel_thick_out: float) -> tuple[Structure, MeshSpace]:
+    # The outer steel liner is not an input of the software, it is set directly to cover the slices of both liners
+    structure = Structure(gui_inputs)
+    structure.steel_thick_out = steel_thick_out
+    return structure, MeshSpace(structure)
+
+
+@pytest.mark.parametrize('steel_thick_out', [0.0, 0.004])
+def test_material_masks_and_slices(mesh_grading, gui_inputs, steel_thick_out):
+    structure, mesh_space = create_mesh_space(gui_inputs, steel_thick_out)
+    material_field = mesh_space.material_field
+    node_ids, element_ids = mesh_space.node_ids, mesh_space.element_ids
+    index_steel_in, index_steel_out = mesh_space.slice_index_steel_in, mesh_space.slice_index_steel_out
+    concrete_end = structure.length - steel_thick_out
+
+    if mesh_grading == 0:
+        assert index_steel_in == int(structure.steel_thick_in / structure.step_space)
+        assert index_steel_out == int(concrete_end / structure.step_space)
+        expected_element_steel_in = element_ids <= index_steel_in
+    else:
+        # The interfaces lie on nodes, the elements belong to the layer which contains them
+        assert mesh_space.nodes_positions[index_steel_in] == pytest.approx(structure.steel_thick_in, abs=1e-12)
+        assert mesh_space.nodes_positions[index_steel_out] == pytest.approx(concrete_end, abs=1e-12)
+        expected_element_steel_in = element_ids < index_steel_in
+        np.testing.assert_array_equal(material_field.element_steel_mask, (mesh_space.element_centers < structure.steel_thick_in) | (mesh_space.element_centers > concrete_end))
+    if steel_thick_out == 0:
+        assert index_steel_out == mesh_space.element_count
+
+    # The interface node of the inner steel liner belongs to the liner in all modes
+    expected_node_steel = (node_ids <= index_steel_in) | ((node_ids >= index_steel_out) if steel_thick_out > 0 else False)
+    expected_element_steel = expected_element_steel_in | ((element_ids >= index_steel_out) if steel_thick_out > 0 else False)
+    np.testing.assert_array_equal(material_field.node_steel_mask, expected_node_steel)
+    np.testing.assert_array_equal(material_field.element_steel_mask, expected_element_steel)
+    np.testing.assert_array_equal(material_field.node_material_ids, np.where(expected_node_steel, material_field.MATERIAL_STEEL, material_field.MATERIAL_CONCRETE))
+    np.testing.assert_array_equal(material_field.element_material_ids, np.where(expected_element_steel, material_field.MATERIAL_STEEL, material_field.MATERIAL_CONCRETE))
+    np.testing.assert_array_equal(material_field.node_moduli, np.where(expected_node_steel, structure.modulus_steel, structure.modulus_concrete))
+
+    # The slices of the layers cover all nodes once (the interface node of the outer steel liner is counted as concrete)
+    assert material_field.slice_steel_inner == slice(0, index_steel_in + 1)
+    concrete_stop = index_steel_out + 1 if steel_thick_out > 0 else mesh_space.node_count
+    assert material_field.slice_concrete == slice(index_steel_in + 1, concrete_stop)
+    assert material_field.slice_steel_outer == (slice(concrete_stop, mesh_space.node_count) if steel_thick_out > 0 else None)
+    np.testing.assert_array_equal(np.flatnonzero(material_field.node_concrete_mask), node_ids[material_field.slice_concrete])
+
+
+def test_node_spacing(mesh_grading, gui_inputs):
+    structure, mesh_space = create_mesh_space(gui_inputs, 0.0)
+    element_lengths = mesh_space.element_lengths
+    np.testing.assert_allclose(np.diff(mesh_space.nodes_positions), element_lengths, rtol=1e-12)
+    assert mesh_space.nodes_positions[0] == 0
+    assert mesh_space.node_count == mesh_space.element_count + 1 == len(element_lengths) + 1
+    np.testing.assert_allclose(mesh_space.node_centers_from_zero, mesh_space.nodes_positions + structure.radius_in)
+
+    if mesh_grading == 0:
+        np.testing.assert_array_equal(element_lengths, structure.step_space)
+        assert mesh_space.nodes_positions[-1] <= structure.length
+        return
+
+    assert mesh_space.nodes_positions[-1] == pytest.approx(structure.length, abs=1e-12)
+    steel_lengths = element_lengths[:mesh_space.slice_index_steel_in]
+    concrete_lengths = element_lengths[mesh_space.slice_index_steel_in:]
+    np.testing.assert_allclose(steel_lengths, steel_lengths[0], rtol=1e-12)
+    assert np.amax(steel_lengths) <= MESH_STEEL_STEP + 1e-12
+    if mesh_grading == 1:
+        np.testing.assert_allclose(concrete_lengths, concrete_lengths[0], rtol=1e-12)
+        assert np.amax(concrete_lengths) <= structure.step_space + 1e-12
+    else:
+        # The concrete elements grow from step_space (scaled down so that the layer ends on a node) up to MESH_ELEMENT_MAX
+        growth_ratios = concrete_lengths[1:] / concrete_lengths[:-1]
+        assert concrete_lengths[0] <= structure.step_space + 1e-12
+        assert np.all(growth_ratios >= 1 - 1e-12) and np.all(growth_ratios <= MESH_GRADING_RATIO + 1e-12)
+        assert np.amax(concrete_lengths) <= MESH_ELEMENT_MAX + 1e-12
+        assert concrete_lengths[-1] > 2 * concrete_lengths[0]
@@ -0,0 +1,64 @@
+'''
+Tests of the nonlinear solvers of the transient heat transfer (full Newton, modified Newton and chord method) and of their statistics.
+'''
+
+import numpy as np
+import pytest
+import src.calculations.temperatures.transient_heat_transfer as transient_heat_transfer
+from src.calculations.temperatures.transient_heat_transfer import fixed_steps_heat_transfer
+from src.config import NEWTON_TOLERANCE_ABS, NEWTON_MAX_ITERATIONS
+
+
+@pytest.fixture
+def calc_newton_results(gui_inputs, prepare_analysis, monkeypatch):
+    # Returns a function which calculates the temperatures with the given NEWTON_METHOD
+    gui_inputs['duration'] = 600
+
+    def calc(newton_method):
+        monkeypatch.setattr(transient_heat_transfer, 'NEWTON_METHOD', newton_method)
+        analysis = prepare_analysis(gui_inputs)
+        fixed_steps_heat_transfer(*analysis)
+        return analysis[-1]
+
+    return calc
+
+
+def check_newton_statistics(results) -> None:
+    # Step 0 contains the operating temperatures, all other steps are converged within the tolerance and the iteration cap
+    iterations = results.newton_iterations_vect
+    factorizations = results.newton_factorizations_vect
+    assert iterations[0] == factorizations[0] == 0 and results.newton_residuum_vect[0] == 0
+    assert np.all(results.newton_residuum_vect[1:] <= NEWTON_TOLERANCE_ABS)
+    assert np.all(iterations <= NEWTON_MAX_ITERATIONS)
+    assert np.all(factorizations <= iterations)
+    assert np.sum(iterations) > 0
+
+
+def test_full_newton_statistics(calc_newton_results):
+    results = calc_newton_results(0)
+    check_newton_statistics(results)
+    np.testing.assert_array_equal(results.newton_factorizations_vect, results.newton_iterations_vect)
+
+
+@pytest.mark.parametrize('newton_method', [1, 2])
+def test_newton_variants_match_full_newton(calc_newton_results, newton_method):
+    full_results = calc_newton_results(0)
+    results = calc_newton_results(newton_method)
+    np.testing.assert_allclose(results.temp_matrix, full_results.temp_matrix, rtol=0, atol=1e-4)
+    check_newton_statistics(results)
+    iterations = results.newton_iterations_vect
+    factorizations = results.newton_factorizations_vect
+    if newton_method == 1:
+        # The factorizations are reused across the time steps of the same length
+        assert np.sum(factorizations) < np.sum(full_results.newton_factorizations_vect)
+    else:
+        # The chord method factorizes once in each time step which needs an iteration (again only if the factorization stops reducing the residua)
+        assert np.all(factorizations[iterations > 0] >= 1)
+        assert np.sum(factorizations) < np.sum(iterations)
+
+
+@pytest.mark.parametrize('newton_method', [0, 1, 2])
+def test_iteration_cap_raises(calc_newton_results, monkeypatch, newton_method):
+    monkeypatch.setattr(transient_heat_transfer, 'NEWTON_MAX_ITERATIONS', 1)
+    with pytest.raises(ArithmeticError, match='did not converge in 1 iterations'):
+        calc_newton_results(newton_method)
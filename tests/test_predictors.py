@@ -0,0 +1,41 @@
+'''
+Tests of the extrapolated predictors of the first guess of the Newton iteration.
+'''
+
+import numpy as np
+import pytest
+import src.calculations.temperatures.transient_heat_transfer as transient_heat_transfer
+from src.calculations.temperatures.transient_heat_transfer import predict_ftr_temp_distr
+
+NODE_POSITIONS = np.linspace(0, 1.2, 7)
+
+
+def get_polynomial_temps(time: float, order: int) -> np.ndarray:
+    # Temperature distribution whose history in each node is a polynomial of the given order in time
+    coefs = [20 + 10 * NODE_POSITIONS, 0.3 - 0.1 * NODE_POSITIONS, 2e-3 * (1 + NODE_POSITIONS)]
+    return sum(coefs[power] * time ** power for power in range(order + 1))
+
+
+@pytest.mark.parametrize('predictor', [1, 2])
+@pytest.mark.parametrize('time_points', [[0.0, 1.0, 2.0], [10.0, 25.0, 32.5], [300.0, 315.0, 375.0]])
+def test_predictor_is_exact_for_polynomials_of_its_order(monkeypatch, predictor, time_points):
+    monkeypatch.setattr(transient_heat_transfer, 'PREDICTOR', predictor)
+    ftr_time = time_points[-1] + 1.7 * (time_points[-1] - time_points[-2])
+    temp_rows = [get_polynomial_temps(time, predictor) for time in time_points]
+    first_guess = predict_ftr_temp_distr(temp_rows, time_points, ftr_time)
+    np.testing.assert_allclose(first_guess, get_polynomial_temps(ftr_time, predictor), rtol=1e-12)
+
+
+def test_linear_predictor_is_not_exact_for_quadratic_histories(monkeypatch):
+    monkeypatch.setattr(transient_heat_transfer, 'PREDICTOR', 1)
+    time_points = [0.0, 1.0, 2.0]
+    first_guess = predict_ftr_temp_distr([get_polynomial_temps(time, 2) for time in time_points], time_points, 3.0)
+    assert not np.allclose(first_guess, get_polynomial_temps(3.0, 2), rtol=1e-12)
+
+
+@pytest.mark.parametrize('predictor, history_length', [(0, 3), (3, 3), (1, 1), (2, 2)])
+def test_predictor_without_extrapolation_returns_none(monkeypatch, predictor, history_length):
+    # The current temperatures (or the explicit half step) are used instead, also while the history is too short for the extrapolation
+    monkeypatch.setattr(transient_heat_transfer, 'PREDICTOR', predictor)
+    time_points = [0.0, 1.0, 2.0][:history_length]
+    assert predict_ftr_temp_distr([get_polynomial_temps(time, 2) for time in time_points], time_points, 3.0) is None
@@ -0,0 +1,55 @@
+'''
+Tests of the fields of the results allocated on the first access (compared with the fields allocated when the results are created).
+'''
+
+import os
+import numpy as np
+import pytest
+import src.controllers as controllers
+from src.controllers import run_analysis
+from src.models import Results
+from conftest import SOURCE_FOLDER_PATH
+
+
+class EagerResults(Results):
+    # Results whose registered fields are all allocated when they are created
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for field_name in Results.FIELDS:
+            getattr(self, field_name)
+
+
+def run_analysis_in_folder(gui_inputs, folder_path, monkeypatch):
+    # The analysis is run in its own folder (with the source data of src), the figures are not plotted; returns the results
+    folder_path.mkdir()
+    os.symlink(os.path.join(SOURCE_FOLDER_PATH, 'source_data'), folder_path / 'source_data')
+    monkeypatch.chdir(folder_path)
+    plotted_results = []
+    monkeypatch.setattr(controllers, 'plot_all_figures', lambda structure, results, mesh_space, mesh_time: plotted_results.append(results))
+    assert run_analysis(gui_inputs) == 0
+    return plotted_results[0]
+
+
+def read_csv_files(folder_path):
+    csv_folder_path = folder_path / 'analysis_results'
+    return {str(file_path.relative_to(csv_folder_path)): file_path.read_text() for file_path in csv_folder_path.rglob('*.csv')}
+
+
+@pytest.mark.parametrize('time_stepping, stress_stage, stress_streaming', [(0, 0, 0), (0, 1, 0), (1, 1, 0), (0, 1, 1)])
+def test_lazy_fields_match_eager_fields(gui_inputs, monkeypatch, tmp_path, time_stepping, stress_stage, stress_streaming):
+    monkeypatch.setattr(controllers, 'TIME_STEPPING', time_stepping)
+    monkeypatch.setattr(controllers, 'STRESS_STAGE', stress_stage)
+    monkeypatch.setattr(controllers, 'STRESS_STREAMING', stress_streaming)
+    gui_inputs['duration'] = 600
+    gui_inputs['step_space'] = 0.05
+    lazy_results = run_analysis_in_folder(gui_inputs, tmp_path / 'lazy', monkeypatch)
+    monkeypatch.setattr(controllers, 'Results', EagerResults)
+    eager_results = run_analysis_in_folder(gui_inputs, tmp_path / 'eager', monkeypatch)
+
+    for field_name in Results.FIELDS:
+        lazy_field, eager_field = getattr(lazy_results, field_name), getattr(eager_results, field_name)
+        assert lazy_field.dtype == eager_field.dtype, field_name
+        np.testing.assert_array_equal(lazy_field, eager_field, err_msg=field_name)
+    lazy_files, eager_files = read_csv_files(tmp_path / 'lazy'), read_csv_files(tmp_path / 'eager')
+    assert sorted(lazy_files) == sorted(eager_files)
+    assert lazy_files == eager_files
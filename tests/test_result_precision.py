@@ -0,0 +1,66 @@
+'''
+Tests of the space-time matrices of the strains and stresses stored in single precision (RESULT_PRECISION = 1).
+'''
+
+import numpy as np
+import pytest
+import src.controllers as controllers
+import src.calculations.stresses.fused_stresses as fused_stresses
+from src.calculations.stresses.streamed_stresses import stream_heat_transfer_and_stresses
+from src.calculations.temperatures.transient_heat_transfer import fixed_steps_heat_transfer
+from src.models import Results, StressBlock
+
+STRESS_TOTAL_FIELDS = ('stress_total_fixed', 'stress_total_clamped', 'stress_total_free')
+
+
+@pytest.fixture
+def small_analysis(gui_inputs, prepare_analysis, monkeypatch):
+    # Returns a function which prepares an analysis of a small mesh; the blocks of time steps do not divide the number of time steps
+    monkeypatch.setattr(fused_stresses, 'STRESS_BLOCK_STEPS', 64)
+    monkeypatch.setattr(controllers, 'double_print', lambda message: None)
+    gui_inputs['duration'] = 600
+    gui_inputs['step_space'] = 0.05
+    return lambda: prepare_analysis(gui_inputs)
+
+
+def set_single_precision(monkeypatch):
+    # RESULT_MATRIX_DTYPE is given by RESULT_PRECISION when the models are imported, thus the registered dtypes are replaced
+    monkeypatch.setattr(controllers, 'RESULT_PRECISION', 1)
+    monkeypatch.setattr(fused_stresses, 'RESULT_MATRIX_DTYPE', np.float32)
+    for field_name in StressBlock.FIELDS:
+        monkeypatch.setitem(Results.FIELDS, field_name, (Results.FIELDS[field_name][0], np.float32))
+
+
+@pytest.mark.parametrize('stress_stage', [0, 1])
+def test_single_precision_stresses_match_rounded_double_precision(small_analysis, monkeypatch, stress_stage):
+    # With RESULT_PRECISION = 1, the fused stress stage is used for both stress stages
+    double_analysis = small_analysis()
+    fixed_steps_heat_transfer(*double_analysis)
+    controllers.calc_stresses(*double_analysis)
+
+    monkeypatch.setattr(controllers, 'STRESS_STAGE', stress_stage)
+    set_single_precision(monkeypatch)
+    single_analysis = small_analysis()
+    fixed_steps_heat_transfer(*single_analysis)
+    controllers.calc_stresses(*single_analysis)
+
+    double_results, single_results = double_analysis[-1], single_analysis[-1]
+    assert single_results.temp_matrix.dtype == np.float64
+    np.testing.assert_array_equal(single_results.temp_matrix, double_results.temp_matrix)
+    for field_name in STRESS_TOTAL_FIELDS:
+        assert getattr(single_results, field_name).dtype == np.float32
+        np.testing.assert_array_equal(getattr(single_results, field_name), getattr(double_results, field_name).astype(np.float32), err_msg=field_name)
+
+
+def test_streamed_single_precision_stresses_match_rounded_double_precision(small_analysis, monkeypatch):
+    double_analysis = small_analysis()
+    assert 'successfully' in stream_heat_transfer_and_stresses(*double_analysis)[1]
+
+    set_single_precision(monkeypatch)
+    single_analysis = small_analysis()
+    assert 'successfully' in stream_heat_transfer_and_stresses(*single_analysis)[1]
+
+    double_results, single_results = double_analysis[-1], single_analysis[-1]
+    for field_name in STRESS_TOTAL_FIELDS:
+        assert getattr(single_results, field_name).dtype == np.float32
+        np.testing.assert_array_equal(getattr(single_results, field_name), getattr(double_results, field_name).astype(np.float32), err_msg=field_name)
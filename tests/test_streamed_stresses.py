@@ -0,0 +1,95 @@
+'''
+Tests of the streamed stress stage (stresses calculated in a worker thread concurrently with the transient heat transfer).
+'''
+
+import queue
+import time
+import numpy as np
+import pytest
+import src.calculations.stresses.fused_stresses as fused_stresses
+import src.calculations.stresses.streamed_stresses as streamed_stresses
+import src.calculations.temperatures.transient_heat_transfer as transient_heat_transfer
+from src.calculations.stresses.fused_stresses import calc_all_stresses
+from src.calculations.stresses.streamed_stresses import stream_heat_transfer_and_stresses
+from src.calculations.temperatures.transient_heat_transfer import fixed_steps_heat_transfer
+from src.models import StressBlock
+
+BLOCK_STEPS = 7
+
+
+@pytest.fixture
+def small_analysis(gui_inputs, prepare_analysis, monkeypatch):
+    # Returns a function which prepares an analysis of a small mesh; blocks of 7 time steps do not divide the number of time steps
+    monkeypatch.setattr(fused_stresses, 'STRESS_BLOCK_STEPS', BLOCK_STEPS)
+    monkeypatch.setattr(streamed_stresses, 'STRESS_BLOCK_STEPS', BLOCK_STEPS)
+    gui_inputs['duration'] = 600
+    gui_inputs['step_space'] = 0.05
+    return lambda: prepare_analysis(gui_inputs)
+
+
+class RecordingQueue(queue.Queue):
+    # Queue which records the largest number of waiting items
+    max_waiting: int = 0
+
+    def put(self, item, block=True, timeout=None):
+        super().put(item, block, timeout)
+        RecordingQueue.max_waiting = max(RecordingQueue.max_waiting, self.qsize())
+
+
+def test_streamed_stresses_match_sequential_stresses(small_analysis):
+    sequential_analysis = small_analysis()
+    fixed_steps_heat_transfer(*sequential_analysis)
+    assert 'successfully' in calc_all_stresses(*sequential_analysis)
+    streamed_analysis = small_analysis()
+    heat_transfer_message, stress_message = stream_heat_transfer_and_stresses(*streamed_analysis)
+    assert 'successfully' in heat_transfer_message and 'successfully' in stress_message
+
+    sequential_results, streamed_results = sequential_analysis[-1], streamed_analysis[-1]
+    np.testing.assert_array_equal(streamed_results.temp_matrix, sequential_results.temp_matrix)
+    np.testing.assert_array_equal(streamed_results.pres_air_int_vect, sequential_results.pres_air_int_vect)
+    for field_name in StressBlock.FIELDS:
+        np.testing.assert_allclose(getattr(streamed_results, field_name), getattr(sequential_results, field_name), rtol=1e-12, atol=1e-12, err_msg=field_name)
+
+
+def test_queue_holds_at_most_two_blocks(small_analysis, monkeypatch):
+    # The worker thread is slowed down, thus the transient heat transfer has to wait for it
+    monkeypatch.setattr(queue, 'Queue', RecordingQueue)
+    RecordingQueue.max_waiting = 0
+    calc_stresses_of_steps = streamed_stresses.calc_stresses_of_steps
+
+    def calc_stresses_slowly(*args):
+        time.sleep(0.01)
+        calc_stresses_of_steps(*args)
+
+    monkeypatch.setattr(streamed_stresses, 'calc_stresses_of_steps', calc_stresses_slowly)
+    heat_transfer_message, stress_message = stream_heat_transfer_and_stresses(*small_analysis())
+    assert 'successfully' in heat_transfer_message and 'successfully' in stress_message
+    assert 0 < RecordingQueue.max_waiting <= 2 * BLOCK_STEPS
+
+
+def test_stress_failure_is_reported(small_analysis, monkeypatch):
+    calc_stresses_of_steps = streamed_stresses.calc_stresses_of_steps
+
+    def fail_in_second_block(structure, mesh_space, loads, results, steps, *args):
+        if steps.start >= BLOCK_STEPS:
+            raise ValueError('Stress failure in step ' + str(steps.start))
+        calc_stresses_of_steps(structure, mesh_space, loads, results, steps, *args)
+
+    monkeypatch.setattr(streamed_stresses, 'calc_stresses_of_steps', fail_in_second_block)
+    analysis = small_analysis()
+    heat_transfer_message, stress_message = stream_heat_transfer_and_stresses(*analysis)
+
+    # The transient heat transfer is finished, the stresses are calculated only in the first block
+    results = analysis[-1]
+    assert 'successfully' in heat_transfer_message
+    assert stress_message == 'Stresses calculation FAILED: Stress failure in step ' + str(BLOCK_STEPS)
+    assert np.all(results.temp_matrix[-1] != 0)
+    assert np.any(results.stress_total_fixed[BLOCK_STEPS - 1] != 0)
+    assert np.all(results.stress_total_fixed[BLOCK_STEPS:] == 0)
+
+
+def test_heat_transfer_failure_is_reported(small_analysis, monkeypatch):
+    monkeypatch.setattr(transient_heat_transfer, 'NEWTON_MAX_ITERATIONS', 1)
+    heat_transfer_message, stress_message = stream_heat_transfer_and_stresses(*small_analysis())
+    assert heat_transfer_message.startswith('Transient heat transfer calculation FAILED: Newton iteration did not converge')
+    assert stress_message.startswith('Stresses calculation FAILED: the stresses were calculated only for the time steps with calculated temperatures')
@@ -0,0 +1,41 @@
+'''
+Comparison of the stresses obtained by scaling the cached unit-load profiles with the node-by-node formulas for non-unit loads.
+'''
+
+import numpy as np
+import pytest
+from src.calculations.stresses.general_functions import calc_stress_from_strain
+from src.calculations.stresses.internal_pressure_stresses import get_lame_stress, calc_pressure_stresses_block
+from src.calculations.stresses.prestressing_stresses import calc_distr_factor, calc_node_stress, calc_prestressing_stresses_block
+from src.models import Structure, MeshSpace, StressBlock
+
+
+def test_scaled_pressure_profiles_match_lame_stresses(gui_inputs):
+    structure = Structure(gui_inputs)
+    mesh_space = MeshSpace(structure)
+    gas_pressures = np.array([0.1, 0.2375, 0.45, 0.6])
+    block = StressBlock(mesh_space, len(gas_pressures), np.zeros(mesh_space.node_count))
+    calc_pressure_stresses_block(gas_pressures, structure, mesh_space, block, slice(0, len(gas_pressures)))
+
+    for step, gas_pressure in enumerate(gas_pressures):
+        strains = np.array([get_lame_stress(gas_pressure, radius, structure) / structure.modulus_total for radius in mesh_space.node_centers_from_zero])
+        stresses = np.array([calc_stress_from_strain(strain, node, mesh_space, structure) for node, strain in enumerate(strains)])
+        np.testing.assert_allclose(block.strain_internal_pressure[step], strains, rtol=1e-12, atol=1e-20)
+        np.testing.assert_allclose(block.stress_internal_pressure[step], stresses, rtol=1e-12, atol=1e-14)
+
+
+@pytest.mark.parametrize('tendons_stress', [1280, 900, 1537.5])
+def test_scaled_prestressing_profiles_match_node_stresses(gui_inputs, tendons_stress):
+    structure = Structure(dict(gui_inputs, tendons_stress=tendons_stress))
+    mesh_space = MeshSpace(structure)
+    block = StressBlock(mesh_space, 2, np.zeros(mesh_space.node_count))
+    calc_prestressing_stresses_block(structure, mesh_space, block, slice(0, 2))
+
+    rt = structure.radius_tendons
+    p_e = structure.tendons_stress * structure.tendons_area / rt
+    distr_fact = calc_distr_factor(structure)
+    strains = np.array([calc_node_stress(distr_fact, p_e, rt, structure.radius_in, structure.radius_out, radius) / structure.modulus_total for radius in mesh_space.node_centers_from_zero])
+    stresses = np.array([calc_stress_from_strain(strain, node, mesh_space, structure) for node, strain in enumerate(strains)])
+    for step in range(2):
+        np.testing.assert_allclose(block.strain_prestressing[step], strains, rtol=1e-12, atol=1e-20)
+        np.testing.assert_allclose(block.stress_prestressing[step], stresses, rtol=1e-12, atol=1e-14)
@@ -0,0 +1,42 @@
+'''
+Comparison of the stress stages calculated stage by stage (STRESS_STAGE = 0) and fused in blocks of time steps (STRESS_STAGE = 1).
+'''
+
+import numpy as np
+import pytest
+import src.controllers as controllers
+import src.calculations.stresses.fused_stresses as fused_stresses
+from src.calculations.temperatures.transient_heat_transfer import fixed_steps_heat_transfer
+from src.models import StressBlock
+
+
+@pytest.fixture
+def calc_stress_results(gui_inputs, prepare_analysis, monkeypatch):
+    # Returns a function which calculates the temperatures and the stresses of a small mesh with the given STRESS_STAGE
+    gui_inputs['duration'] = 600
+    gui_inputs['step_space'] = 0.05
+    messages = []
+    monkeypatch.setattr(controllers, 'double_print', messages.append)
+
+    def calc(stress_stage):
+        monkeypatch.setattr(controllers, 'STRESS_STAGE', stress_stage)
+        structure, mesh_space, mesh_time, loads, results = prepare_analysis(gui_inputs)
+        fixed_steps_heat_transfer(structure, mesh_space, mesh_time, loads, results)
+        messages.clear()
+        controllers.calc_stresses(structure, mesh_space, mesh_time, loads, results)
+        assert messages and not any('FAILED' in message for message in messages), messages
+        return results
+
+    return calc
+
+
+@pytest.mark.parametrize('block_steps', [7, 256])
+def test_fused_stage_matches_stage_by_stage(calc_stress_results, monkeypatch, block_steps):
+    # Blocks of 7 time steps do not divide the number of time steps, thus the last block is shorter
+    monkeypatch.setattr(fused_stresses, 'STRESS_BLOCK_STEPS', block_steps)
+    staged_results = calc_stress_results(0)
+    fused_results = calc_stress_results(1)
+    assert np.amax(np.absolute(staged_results.stress_total_fixed)) > 0
+    for field_name in StressBlock.FIELDS:
+        np.testing.assert_allclose(getattr(fused_results, field_name), getattr(staged_results, field_name), rtol=1e-12, atol=1e-12, err_msg=field_name)
+    np.testing.assert_array_equal(fused_results.pres_air_int_vect, staged_results.pres_air_int_vect)
@@ -0,0 +1,87 @@
+'''
+Tests of the summary-only mode (only the evolutions, the extreme steps and the rows in the extreme steps are stored).
+'''
+
+import numpy as np
+import pytest
+import src.calculations.stresses.streamed_stresses as streamed_stresses
+from src.calculations.outputs.result_processing import SUMMARY_EXTREME_STEPS, update_summary_with_block, process_results
+from src.calculations.stresses.streamed_stresses import stream_heat_transfer_and_stresses
+from src.controllers import fill_initial_results
+from src.models import Results, StressBlock
+
+BLOCK_STEPS = 7
+SUMMARY_FIELDS = ('temp_matrix', 'stress_total_fixed', 'stress_total_clamped', 'stress_total_free')
+
+
+def assert_summary_matches_full_results(summary_results, full_results):
+    for field_name in Results.FIELDS:
+        if field_name.startswith('stress_evolution_'):
+            np.testing.assert_array_equal(getattr(summary_results, field_name), getattr(full_results, field_name), err_msg=field_name)
+    assert summary_results.extreme_steps == full_results.extreme_steps
+    for step_name, (field_name, layer_index) in SUMMARY_EXTREME_STEPS.items():
+        if step_name in summary_results.extreme_rows:
+            step = full_results.extreme_steps[step_name]
+            np.testing.assert_array_equal(summary_results.extreme_rows[step_name], getattr(full_results, field_name)[step], err_msg=step_name)
+
+
+@pytest.mark.parametrize('steel_thick', [0.006, 0.0])
+def test_streamed_summary_matches_full_results(gui_inputs, prepare_analysis, monkeypatch, steel_thick):
+    # The rows of the blocks are also stored in full results, which are processed from the same rows as the summary
+    # (without the inner steel liner, the evolutions of stresses in steel are zero and the extreme temperature in steel is not found)
+    monkeypatch.setattr(streamed_stresses, 'STRESS_BLOCK_STEPS', BLOCK_STEPS)
+    gui_inputs['duration'] = 600
+    gui_inputs['step_space'] = 0.05
+    gui_inputs['steel_thick'] = steel_thick
+    structure, mesh_space, mesh_time, loads, full_results = prepare_analysis(gui_inputs)
+    summary_results = Results(mesh_space, mesh_time, summary_only=True)
+    summary_results.temp_init, summary_results.temp_oper = full_results.temp_init, full_results.temp_oper
+    fill_initial_results(structure, loads, summary_results)
+
+    def update_summary_and_full_results(structure, mesh_space, results, block, steps):
+        for field_name in SUMMARY_FIELDS:
+            getattr(full_results, field_name)[steps] = getattr(block, field_name)[:steps.stop - steps.start]
+        update_summary_with_block(structure, mesh_space, results, block, steps)
+
+    monkeypatch.setattr(streamed_stresses, 'update_summary_with_block', update_summary_and_full_results)
+    heat_transfer_message, stress_message = stream_heat_transfer_and_stresses(structure, mesh_space, mesh_time, loads, summary_results)
+    assert 'successfully' in heat_transfer_message and 'successfully' in stress_message
+    full_results.pres_air_int_vect[:] = summary_results.pres_air_int_vect
+    full_results.temp_air_int_vect[:] = summary_results.temp_air_int_vect
+    assert 'successfully' in process_results(structure, mesh_space, summary_results)
+    assert 'successfully' in process_results(structure, mesh_space, full_results)
+
+    assert_summary_matches_full_results(summary_results, full_results)
+    assert ('max_temp_steel' in full_results.extreme_steps) == (steel_thick > 0)
+    assert np.any(summary_results.stress_evolution_steel_merged_fixed) == (steel_thick > 0)
+
+
+@pytest.mark.parametrize('steel_thick', [0.006, 0.0])
+def test_summary_keeps_first_of_equal_maxima_across_blocks(gui_inputs, prepare_analysis, steel_thick):
+    # Equal maxima are placed in the second and in the last block of the fields, thus the step in the second block is kept
+    gui_inputs['duration'] = 600
+    gui_inputs['step_space'] = 0.05
+    gui_inputs['steel_thick'] = steel_thick
+    structure, mesh_space, mesh_time, loads, full_results = prepare_analysis(gui_inputs)
+    steps_count = mesh_time.time_steps_count + 1
+    generator = np.random.default_rng(0)
+    for field_name in SUMMARY_FIELDS:
+        field = generator.uniform(-1.0, 1.0, size=(steps_count, mesh_space.node_count))
+        field[[BLOCK_STEPS + 2, steps_count - 1]] = 2.0
+        getattr(full_results, field_name)[:] = field
+    assert 'successfully' in process_results(structure, mesh_space, full_results)
+
+    summary_results = Results(mesh_space, mesh_time, summary_only=True)
+    summary_results.pres_air_int_vect[:] = full_results.pres_air_int_vect
+    summary_results.temp_air_int_vect[:] = full_results.temp_air_int_vect
+    block = StressBlock(mesh_space, BLOCK_STEPS, full_results.temp_init)
+    for start in range(0, steps_count, BLOCK_STEPS):
+        steps = slice(start, min(start + BLOCK_STEPS, steps_count))
+        for field_name in SUMMARY_FIELDS:
+            getattr(block, field_name)[:steps.stop - steps.start] = getattr(full_results, field_name)[steps]
+        update_summary_with_block(structure, mesh_space, summary_results, block, steps)
+    assert 'successfully' in process_results(structure, mesh_space, summary_results)
+
+    assert_summary_matches_full_results(summary_results, full_results)
+    assert full_results.extreme_steps['max_stress_fixed_concrete'] == BLOCK_STEPS + 2
+    assert summary_results.extreme_steps['max_temp_concrete'] == BLOCK_STEPS + 2
@@ -0,0 +1,41 @@
+'''
+Tests of the derivation of the surface heat flux with respect to the surface temperature.
+'''
+
+import numpy as np
+import pytest
+import src.calculations.temperatures.surface_heat_transfer_coefficient as surface_heat_transfer_coefficient
+from src.calculations.temperatures.surface_heat_transfer_coefficient import calc_surface_heat_transfer_coef, calc_surface_heat_flux_deriv, calc_surface_heat_flux_deriv_memoized
+from src.models import Structure
+
+TEMPS_SURF = np.array([-20.0, 18.5, 35.0, 41.0, 120.0, 350.0])
+TEMP_AIR = 20.0
+
+
+@pytest.fixture(params=[0, 1])
+def air_flow(request, monkeypatch):
+    # The memoized values do not depend on AIR_FLOW, thus they are dropped before and after the test
+    monkeypatch.setattr(surface_heat_transfer_coefficient, 'AIR_FLOW', request.param)
+    surface_heat_transfer_coefficient._calc_memoized_coef.cache_clear()
+    surface_heat_transfer_coefficient._calc_memoized_flux_deriv.cache_clear()
+    yield request.param
+    surface_heat_transfer_coefficient._calc_memoized_coef.cache_clear()
+    surface_heat_transfer_coefficient._calc_memoized_flux_deriv.cache_clear()
+
+
+def test_flux_deriv_matches_finite_differences(air_flow, gui_inputs):
+    structure = Structure(gui_inputs)
+    diff_step = 1e-4
+
+    def calc_flux(temps_surf):
+        return calc_surface_heat_transfer_coef(structure, temps_surf, TEMP_AIR) * (temps_surf - TEMP_AIR)
+
+    flux_deriv_fd = (calc_flux(TEMPS_SURF + diff_step) - calc_flux(TEMPS_SURF - diff_step)) / (2 * diff_step)
+    np.testing.assert_allclose(calc_surface_heat_flux_deriv(structure, TEMPS_SURF, TEMP_AIR), flux_deriv_fd, rtol=1e-6)
+
+
+def test_memoized_flux_deriv_matches_vectorized(air_flow, gui_inputs):
+    structure = Structure(gui_inputs)
+    flux_derivs = calc_surface_heat_flux_deriv(structure, TEMPS_SURF, TEMP_AIR)
+    for temp_surf, flux_deriv in zip(TEMPS_SURF, flux_derivs):
+        assert calc_surface_heat_flux_deriv_memoized(structure, temp_surf, TEMP_AIR) == pytest.approx(flux_deriv, rel=1e-15)
@@ -0,0 +1,87 @@
+'''
+Tests of the time integration schemes on a linear case (constant material properties and surface heat transfer coefficients).
+'''
+
+import numpy as np
+import pytest
+from scipy.integrate import solve_ivp
+import src.calculations.temperatures.transient_heat_transfer as transient_heat_transfer
+from src.calculations.temperatures.transient_heat_transfer import fixed_steps_heat_transfer
+
+CONDUCTIVITIES = (50.0, 1.5)  # Steel, concrete
+CAPACITIES = (3.6e6, 2.2e6)  # Steel, concrete
+HEAT_TRANSFER_COEFS = (8.0, 4.0)  # Inner surface, outer surface
+RAMP_DURATION = 200.0
+
+
+@pytest.fixture
+def linear_analysis(gui_inputs, prepare_analysis, monkeypatch):
+    # The inner air temperature rises linearly, the initial temperatures are the steady state of the linear case
+    monkeypatch.setattr(transient_heat_transfer, 'get_material_properties',
+                        lambda elem_temps, steel_mask, structure: (np.where(steel_mask, *CONDUCTIVITIES), np.where(steel_mask, *CAPACITIES)))
+    monkeypatch.setattr(transient_heat_transfer, 'get_surface_heat_transfer_coefs', lambda temp_distr, temp_gas_in, structure: HEAT_TRANSFER_COEFS)
+    gui_inputs['duration'] = RAMP_DURATION
+    air_temp_evolution = (np.array([0, RAMP_DURATION]), np.array([41, 141]))
+
+    def prepare(step_count):
+        analysis = prepare_analysis(gui_inputs, time_axis=np.linspace(0, RAMP_DURATION, step_count + 1), air_temp_evolution=air_temp_evolution)
+        structure, mesh_space, mesh_time, loads, results = analysis
+        capac_mat, stiff_mat, get_load_vect = create_linear_system(structure, mesh_space, loads)
+        results.temp_oper = np.linalg.solve(stiff_mat, get_load_vect(0))
+        results.temp_matrix[0] = results.temp_oper
+        return analysis, capac_mat, stiff_mat, get_load_vect
+
+    return prepare
+
+
+def create_linear_system(structure, mesh_space, loads):
+    # Dense matrices of the linear case: capac_mat * dT/dt + stiff_mat * T = load_vect(t)
+    steel_mask = mesh_space.material_field.element_steel_mask
+    elem_from_zero = mesh_space.element_centers_from_zero
+    elem_conduc = elem_from_zero * np.where(steel_mask, *CONDUCTIVITIES) / mesh_space.element_lengths
+    elem_capac = elem_from_zero * np.where(steel_mask, *CAPACITIES) * mesh_space.element_lengths
+    stiff_mat = np.zeros((mesh_space.node_count, mesh_space.node_count))
+    capac_mat = np.zeros((mesh_space.node_count, mesh_space.node_count))
+    for i in range(mesh_space.element_count):
+        stiff_mat[i:i + 2, i:i + 2] += elem_conduc[i] * np.array([[1, -1], [-1, 1]])
+        capac_mat[i:i + 2, i:i + 2] += elem_capac[i] * np.array([[1 / 3, 1 / 6], [1 / 6, 1 / 3]])
+    surface_coef_in = HEAT_TRANSFER_COEFS[0] * elem_from_zero[0]
+    surface_coef_out = HEAT_TRANSFER_COEFS[1] * elem_from_zero[-1]
+    stiff_mat[0, 0] += surface_coef_in
+    stiff_mat[-1, -1] += surface_coef_out
+
+    def get_load_vect(time):
+        load_vect = np.zeros(mesh_space.node_count)
+        load_vect[0] = surface_coef_in * loads.get_current_air_temp(time)
+        load_vect[-1] = surface_coef_out * structure.temp_air_ext
+        return load_vect
+
+    return capac_mat, stiff_mat, get_load_vect
+
+
+def test_theta_one_matches_backward_euler(linear_analysis):
+    analysis, capac_mat, stiff_mat, get_load_vect = linear_analysis(20)
+    fixed_steps_heat_transfer(*analysis)
+    mesh_time, results = analysis[2], analysis[-1]
+
+    temp_distr = results.temp_oper
+    for step in mesh_time.time_steps_range:
+        time_jump = mesh_time.time_jumps[step]
+        temp_distr = np.linalg.solve(capac_mat / time_jump + stiff_mat, capac_mat @ temp_distr / time_jump + get_load_vect(mesh_time.time_axis[step + 1]))
+        np.testing.assert_allclose(results.temp_matrix[step + 1], temp_distr, rtol=0, atol=1e-8)
+
+
+@pytest.mark.parametrize('time_integration, theta', [(0, 0.5), (1, 1)])
+def test_second_order_schemes_converge_at_second_order(linear_analysis, monkeypatch, time_integration, theta):
+    monkeypatch.setattr(transient_heat_transfer, 'TIME_INTEGRATION', time_integration)
+    monkeypatch.setattr(transient_heat_transfer, 'THETA', theta)
+    errors = []
+    for step_count in (10, 20, 40, 80):
+        analysis, capac_mat, stiff_mat, get_load_vect = linear_analysis(step_count)
+        fixed_steps_heat_transfer(*analysis)
+        if not errors:
+            reference = solve_ivp(lambda time, temps: np.linalg.solve(capac_mat, get_load_vect(time) - stiff_mat @ temps), (0, RAMP_DURATION), analysis[-1].temp_oper,
+                                  method='Radau', jac=-np.linalg.solve(capac_mat, stiff_mat), rtol=1e-12, atol=1e-12).y[:, -1]
+        errors.append(np.amax(np.absolute(analysis[-1].temp_matrix[-1] - reference)))
+    orders = np.log2(np.array(errors[:-1]) / np.array(errors[1:]))
+    assert np.all(orders > 1.8), orders
@@ -0,0 +1,44 @@
+'''
+Comparison of the compiled kernel of the transient heat transfer with the NumPy implementation (skipped if Numba is not installed).
+'''
+
+import numpy as np
+import pytest
+
+pytest.importorskip('numba')
+
+from src.calculations.temperatures.material_properties import MaterialPropertyTables
+from src.calculations.temperatures.transient_heat_transfer import fixed_steps_heat_transfer, compiled_fixed_steps_heat_transfer
+from src.calculations.temperatures.transient_kernel import kernel_material_properties
+
+
+@pytest.mark.parametrize('material_property_mode', [0, 1], indirect=True)
+def test_kernel_matches_numpy_implementation(material_property_mode, gui_inputs, prepare_analysis):
+    numpy_analysis = prepare_analysis(gui_inputs)
+    fixed_steps_heat_transfer(*numpy_analysis)
+    kernel_analysis = prepare_analysis(gui_inputs)
+    compiled_fixed_steps_heat_transfer(*kernel_analysis)
+    numpy_results, kernel_results = numpy_analysis[-1], kernel_analysis[-1]
+    np.testing.assert_allclose(kernel_results.temp_matrix, numpy_results.temp_matrix, rtol=0, atol=1e-9)
+    np.testing.assert_array_equal(kernel_results.newton_iterations_vect, numpy_results.newton_iterations_vect)
+
+
+@pytest.mark.parametrize('material_property_mode', [0, 1], indirect=True)
+@pytest.mark.parametrize('temp', [-150.0, -100.0, 20.0, 114.99, 735.5, 1500.0, 1600.0])
+def test_kernel_material_properties_match_tables(material_property_mode, temp):
+    density, water_content = 2500.0, 1.5
+    tables = MaterialPropertyTables(density, water_content)
+    if tables.tabulated:
+        temp_grid = tables.temp_grid
+        material_tables = np.array([tables.table_steel_conductivity, tables.table_concrete_conductivity, tables.table_steel_capacity, tables.table_concrete_capacity])
+        table_temp_min, table_temp_max = tables.temp_min, tables.temp_max
+    else:
+        temp_grid, material_tables, table_temp_min, table_temp_max = np.zeros(1), np.zeros((4, 1)), np.inf, -np.inf
+    temps = np.array([temp])
+    expected = {
+        True: (tables.steel_conductivity(temps)[0], tables.steel_volumetric_heat_capacity(temps)[0]),
+        False: (tables.concrete_conductivity(temps)[0], tables.concrete_volumetric_heat_capacity(temps)[0]),
+    }
+    for is_steel in (True, False):
+        properties = kernel_material_properties(temp, is_steel, temp_grid, material_tables, table_temp_min, table_temp_max, density, water_content)
+        np.testing.assert_allclose(properties, expected[is_steel], rtol=1e-12)